@@ -0,0 +1,346 @@
+"""Replay a message corpus through the automod pipeline.
+
+    python -m benchmarks.automod [corpus.jsonl]
+
+Without a corpus, a synthetic one is generated. A corpus holds one JSON object
+per line, either a message::
+
+    {"time": 12.5, "guild": 1, "channel": 10, "author": 100, "roles": [5],
+     "bot": false, "content": "hello", "everyone": false}
+
+or the settings of a guild, which apply to the messages that follow it::
+
+    {"guild": 1, "config": {"caps": {"limit": 70, "window": 0,
+     "action": "delete", "timeout": 0}}, "filters": [["badword", false]],
+     "domains": [["example.com", true]], "overrides": [[10, "links", false]]}
+
+Settings omitted from a guild's ``config`` fall back to ``DEFAULT_CONFIG``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator, Optional
+
+import sys
+import json
+import random
+import asyncio
+import logging
+import itertools
+
+from cogs.automod import AutoMod
+from utils.replay import replay
+
+DEFAULT_CONFIG = {
+    "enabled": True,
+    "link_send_roles": [],
+    "link_embed_roles": [],
+    "flood_member": {"limit": 5, "window": 5, "action": "timeout", "timeout": 10},
+    "flood_channel": {"limit": 30, "window": 10, "action": "delete", "timeout": 0},
+    "raid_text": {"limit": 3, "window": 60, "action": "timeout", "timeout": 10},
+    "mentions": {"limit": 5, "window": 0, "action": "delete", "timeout": 0},
+    "caps": {"limit": 70, "window": 0, "action": "delete", "timeout": 0},
+    "emoji": {"limit": 10, "window": 0, "action": "delete", "timeout": 0},
+    "blocked_extensions": ["exe", "scr"],
+    "max_attachment_size": None,
+}
+
+WORDS = (
+    "the a an and or but so we you they it is was are be have do say get make "
+    "go know take see come think look want give use find tell ask work seem "
+    "feel try leave call good new first last long great little own other old "
+    "right big high different small large next early young important few "
+    "public bad same able game server channel role voice stream match patch"
+).split()
+
+
+class FakeRole:
+    __slots__ = ("id",)
+
+    def __init__(self, id: int):
+        self.id = id
+
+
+class FakeMember:
+    __slots__ = ("id", "roles", "bot")
+
+    def __init__(self, id: int, roles: list[FakeRole], bot: bool = False):
+        self.id = id
+        self.roles = roles
+        self.bot = bot
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def is_timed_out(self) -> bool:
+        return False
+
+
+class FakeChannel:
+    __slots__ = ("id",)
+
+    def __init__(self, id: int):
+        self.id = id
+
+
+class FakeGuild:
+    def __init__(self, id: int):
+        self.id = id
+
+        self._roles: dict[int, FakeRole] = {}
+        self._members: dict[int, FakeMember] = {}
+        self._channels: dict[int, FakeChannel] = {}
+
+    @property
+    def channels(self) -> list[FakeChannel]:
+        return list(self._channels.values())
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self._roles.get(role_id)
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+    def get_channel_or_thread(self, channel_id: int) -> Optional[FakeChannel]:
+        return self._channels.get(channel_id)
+
+    def role(self, role_id: int) -> FakeRole:
+        role = self._roles.get(role_id)
+
+        if role is None:
+            role = self._roles[role_id] = FakeRole(role_id)
+
+        return role
+
+    def member(self, user_id: int, role_ids: list[int], bot: bool) -> FakeMember:
+        member = self._members.get(user_id)
+
+        if member is None:
+            member = self._members[user_id] = FakeMember(
+                user_id, [self.role(role_id) for role_id in role_ids], bot
+            )
+
+        return member
+
+    def channel(self, channel_id: int) -> FakeChannel:
+        channel = self._channels.get(channel_id)
+
+        if channel is None:
+            channel = self._channels[channel_id] = FakeChannel(channel_id)
+
+        return channel
+
+
+class FakeMessage:
+    __slots__ = (
+        "id",
+        "guild",
+        "channel",
+        "author",
+        "content",
+        "mention_everyone",
+        "attachments",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        guild: FakeGuild,
+        channel: FakeChannel,
+        author: FakeMember,
+        content: str,
+        mention_everyone: bool = False,
+    ):
+        self.id = id
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.mention_everyone = mention_everyone
+        self.attachments = []
+
+
+class FakeBot:
+    pool = None
+    log = logging.getLogger(__name__)
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(3, 16))).capitalize()
+
+
+def generate(
+    messages: int = 50_000, guilds: int = 20, seed: int = 0
+) -> Iterator[dict]:
+    """Yield a synthetic corpus: mostly ordinary chat across ``guilds`` guilds,
+    interleaved with floods, copy-paste raids, shouting, mass mentions, emoji
+    spam, blocked words and bad links."""
+    rng = random.Random(seed)
+
+    for guild_id in range(1, guilds + 1):
+        yield {
+            "guild": guild_id,
+            "config": {"link_embed_roles": ["5"]},
+            "filters": [["badword", False], ["free\\s+nitro", True]],
+            "domains": [["discord.com", True], ["grabify.link", False]],
+            # Links are fine in the guild's first channel.
+            "overrides": [[guild_id * 100, "links", False]],
+        }
+
+    now = 0.0
+    sent = 0
+
+    while sent < messages:
+        guild_id = rng.randint(1, guilds)
+        channel_id = guild_id * 100 + rng.randint(0, 9)
+        author_id = guild_id * 10_000 + rng.randint(0, 499)
+        pick = rng.random()
+
+        if pick < 0.005:
+            # One member flooding a channel.
+            burst = [(author_id, _sentence(rng)) for _ in range(10)]
+
+        elif pick < 0.008:
+            # Several members pasting the same message with small changes.
+            text = "join my server for free stuff " + _sentence(rng)
+            burst = [
+                (guild_id * 10_000 + rng.randint(500, 999), f"{text} {i}")
+                for i in range(6)
+            ]
+
+        elif pick < 0.02:
+            burst = [(author_id, _sentence(rng).upper() + "!!!")]
+
+        elif pick < 0.025:
+            mentions = " ".join(
+                f"<@{guild_id * 10_000 + rng.randint(0, 499)}>" for _ in range(8)
+            )
+            burst = [(author_id, f"{mentions} look")]
+
+        elif pick < 0.03:
+            burst = [(author_id, "lol " + "\U0001f602" * 15)]
+
+        elif pick < 0.035:
+            burst = [(author_id, f"{_sentence(rng)} badword")]
+
+        elif pick < 0.05:
+            host = rng.choice(
+                ("discord.com", "grabify.link", "youtube.com", "example.org")
+            )
+            burst = [(author_id, f"{_sentence(rng)} https://{host}/watch?v=1")]
+
+        else:
+            burst = [(author_id, _sentence(rng))]
+
+        for author_id, content in burst:
+            now += rng.expovariate(50)
+            sent += 1
+
+            yield {
+                "time": now,
+                "guild": guild_id,
+                "channel": channel_id,
+                "author": author_id,
+                "roles": [5] if author_id % 10 == 0 else [],
+                "bot": False,
+                "content": content,
+                "everyone": False,
+            }
+
+
+def load(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _messages(
+    automod: AutoMod, records: Iterator[dict]
+) -> Iterator[tuple[Any, float]]:
+    guilds: dict[int, FakeGuild] = {}
+    ids = itertools.count(1)
+
+    for record in records:
+        guild_id = record["guild"]
+        guild = guilds.get(guild_id)
+
+        if guild is None:
+            guild = guilds[guild_id] = FakeGuild(guild_id)
+            automod._configs[guild_id] = dict(DEFAULT_CONFIG)
+            automod._filter_entries[guild_id] = []
+            automod._overrides[guild_id] = []
+
+        if "time" not in record:
+            automod._configs[guild_id] = DEFAULT_CONFIG | record.get("config", {})
+            automod._filter_entries[guild_id] = [
+                (pattern, is_regex)
+                for pattern, is_regex in record.get("filters", [])
+            ]
+            automod._overrides[guild_id] = [
+                (target_id, rule, enabled)
+                for target_id, rule, enabled in record.get("overrides", [])
+            ]
+            automod._policies.pop(guild_id, None)
+            automod._word_filters.pop(guild_id, None)
+
+            for domain, allowed in record.get("domains", []):
+                automod._domains.set(guild_id, domain, allowed)
+
+            continue
+
+        author = guild.member(
+            record["author"], record.get("roles", []), record.get("bot", False)
+        )
+
+        # The pipeline only sees what on_message lets through.
+        if author.bot:
+            continue
+
+        # Channels appear as they are first seen, as if just created.
+        if guild.get_channel_or_thread(record["channel"]) is None:
+            automod._policies.pop(guild_id, None)
+
+        message = FakeMessage(
+            record.get("id") or next(ids),
+            guild,
+            guild.channel(record["channel"]),
+            author,
+            record["content"],
+            record.get("everyone", False),
+        )
+
+        yield message, record["time"]
+
+
+async def run(path: Optional[str] = None) -> None:
+    automod = AutoMod(FakeBot()).dry_run()
+    records = load(path) if path else generate()
+
+    report = await replay(automod, _messages(automod, records))
+
+    print(f"messages:       {report.messages:>12,}")
+    print(f"elapsed:        {report.elapsed * 1000:>12.1f} ms")
+    print(f"throughput:     {report.throughput:>12,.0f} msg/s")
+    print()
+    print(f"{'stage':<14}{'calls':>10}{'mean µs':>10}{'p95 µs':>10}{'max µs':>10}")
+
+    for stage, calls, mean, p95, peak in report.stage_stats():
+        print(f"{stage:<14}{calls:>10,}{mean:>10.1f}{p95:>10.1f}{peak:>10.1f}")
+
+    print()
+
+    for stage, hits in sorted(report.hits.items()):
+        print(f"{'acted, ' + stage + ':':<24}{hits:>10,}")
+
+    for action, count in sorted(report.actions.items()):
+        print(f"{action + ':':<24}{count:>10,}")
+
+
+def main(path: Optional[str] = None):
+    asyncio.run(run(path))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import time
+import random
+import string
+import tracemalloc
+
+from utils.domains import DomainMatcher
+
+TLDS = ["com", "net", "org", "gg", "io", "ru", "xyz", "co.uk", "app", "dev"]
+
+
+def _random_domain(rng: random.Random) -> str:
+    label = "".join(rng.choices(string.ascii_lowercase + string.digits, k=10))
+    return f"{label}.{rng.choice(TLDS)}"
+
+
+def main(domains: int = 150_000, guilds: int = 1_000, lookups: int = 200_000):
+    rng = random.Random(0)
+
+    phishing = [_random_domain(rng) for _ in range(domains)]
+    listed = [
+        (rng.randrange(guilds), _random_domain(rng), rng.random() < 0.5)
+        for _ in range(domains // 10)
+    ]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    matcher = DomainMatcher()
+    matcher.replace_phishing(phishing)
+
+    for guild_id, domain, allowed in listed:
+        matcher.set(guild_id, domain, allowed)
+
+    built = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    hosts = []
+
+    for _ in range(lookups):
+        pick = rng.random()
+
+        if pick < 0.1:
+            host = f"cdn.{rng.choice(phishing)}"
+
+        elif pick < 0.2:
+            host = f"www.{rng.choice(listed)[1]}"
+
+        else:
+            host = f"media.{_random_domain(rng)}"
+
+        hosts.append((host, rng.randrange(guilds)))
+
+    started = time.perf_counter()
+    hits = sum(1 for host, guild_id in hosts if matcher.match(host, guild_id))
+    elapsed = time.perf_counter() - started
+
+    print(f"entries:        {len(matcher):>12,}")
+    print(f"build:          {built * 1000:>12.1f} ms")
+    print(f"memory:         {memory / 1024 / 1024:>12.1f} MiB")
+    print(f"lookups:        {lookups:>12,} ({hits:,} matched)")
+    print(f"per lookup:     {elapsed / lookups * 1e9:>12.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,16 +18,36 @@ from discord.app_commands import CommandTree
 from utils.db import (
     add_guild,
     guild_exists,
+    get_premium_users,
     is_blacklisted_guild,
     get_blacklisted_users,
     get_blacklisted_guilds,
 )
+from utils.ack import AckTracker
+from utils.raid import RaidGuard
+from utils.cases import CaseStore
+from utils.warns import WarningStore
 from utils.config import Config
-from utils.logger import log_member, welcome_member
+from utils.timers import TimerScheduler
+from utils.welcome import Greeter
+from utils.delivery import LogDelivery
+from utils.logqueue import LogQueue
+from utils.memberlog import MemberLogWriter
+from utils.messagelog import MessageLogWriter
 
 
 class FumeTree(CommandTree):
+    def _from_interaction(self, interaction: discord.Interaction) -> None:
+        # Runs in the gateway handler itself, before the command's task is
+        # created, so the acknowledgement budget starts on receipt.
+        if interaction.type is discord.InteractionType.application_command:
+            self.client.ack_tracker.arm(interaction)
+
+        super()._from_interaction(interaction)
+
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Everything before a command acknowledges its interaction must stay
+        # in memory; a busy pool here turns into "interaction failed" errors.
         if (
             interaction.guild
             and interaction.guild.id in self.client.blacklisted_guilds
@@ -72,6 +92,15 @@ class FumeGuard(commands.AutoShardedBot):
     topggpy: topgg.DBLClient
     ipc: Server
     log: logging.Logger
+    cases: CaseStore
+    warns: WarningStore
+    timers: TimerScheduler
+    raids: RaidGuard
+    member_log: MemberLogWriter
+    message_log: MessageLogWriter
+    greeter: Greeter
+    log_delivery: LogDelivery
+    log_queue: LogQueue
 
     def __init__(self):
         description = (
@@ -81,6 +110,9 @@ class FumeGuard(commands.AutoShardedBot):
 
         intents = discord.Intents.default()
         intents.members = True
+        # Privileged: the message log, word filter and link checks need the
+        # text of messages, which Discord otherwise leaves empty.
+        intents.message_content = True
 
         super().__init__(
             command_prefix=commands.when_mentioned,
@@ -96,12 +128,30 @@ class FumeGuard(commands.AutoShardedBot):
 
         self.blacklisted_users: set[int] = set()
         self.blacklisted_guilds: set[int] = set()
+        self.premium_users: set[int] = set()
+
+        self.ack_tracker: AckTracker = AckTracker()
 
     async def setup_hook(self) -> None:
         self.session = aiohttp.ClientSession()
         self.bot_app_info = await self.application_info()
 
         await self._refresh_blacklists()
+        await self._refresh_premium_users()
+
+        self.cases = CaseStore(self.pool)
+        self.cases.start()
+        self.warns = WarningStore(self.pool)
+        self.timers = TimerScheduler(self)
+        self.timers.start()
+        self.log_delivery = LogDelivery(self)
+        self.log_queue = LogQueue(self)
+        self.member_log = MemberLogWriter(self)
+        self.message_log = MessageLogWriter(self)
+        self.message_log.start()
+        self.greeter = Greeter(self)
+        self.raids = RaidGuard(self)
+        self.raids.start()
 
         self.topggpy = topgg.DBLClient(bot=self, token=self.config.TOPGG_TOKEN)
         # noinspection PyTypeChecker
@@ -149,6 +199,17 @@ class FumeGuard(commands.AutoShardedBot):
         except Exception as e:
             self.log.error("Failed to refresh blacklists.", exc_info=e)
 
+    async def _refresh_premium_users(self) -> None:
+        self.premium_users = await get_premium_users(self.pool)
+
+    @tasks.loop(minutes=5)
+    async def _refresh_premium_users_loop(self) -> None:
+        try:
+            await self._refresh_premium_users()
+
+        except Exception as e:
+            self.log.error("Failed to refresh premium users.", exc_info=e)
+
     async def on_ready(self) -> None:
         self._launch_time = datetime.now()
 
@@ -156,11 +217,13 @@ class FumeGuard(commands.AutoShardedBot):
             self._update_status_items.start()
             self._change_status.start()
             self._refresh_blacklists_loop.start()
+            self._refresh_premium_users_loop.start()
 
         except RuntimeError:
             self._update_status_items.restart()
             self._change_status.restart()
             self._refresh_blacklists_loop.restart()
+            self._refresh_premium_users_loop.restart()
 
         self.log.info("FumeGuard is ready.")
 
@@ -186,6 +249,8 @@ class FumeGuard(commands.AutoShardedBot):
 
             return await message.guild.leave()
 
+        await self.message_log.add(message)
+
         if message.author.id in self.blacklisted_users:
             await message.reply(
                 content="You are currently blacklisted from using the FumeStop service. "
@@ -202,6 +267,17 @@ class FumeGuard(commands.AutoShardedBot):
         if message.guild and message.guild.me in message.mentions:
             await message.reply(content="Hello there! Use `/help` to get started.")
 
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        await self.message_log.on_delete(payload)
+
+    async def on_raw_bulk_message_delete(
+        self, payload: discord.RawBulkMessageDeleteEvent
+    ):
+        await self.message_log.on_bulk_delete(payload)
+
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        await self.message_log.on_edit(payload)
+
     async def on_guild_join(self, guild) -> None:
         if await is_blacklisted_guild(self.pool, guild.id):
             try:
@@ -225,25 +301,40 @@ class FumeGuard(commands.AutoShardedBot):
             return await add_guild(self.pool, guild_id=guild.id)
 
     async def on_member_join(self, member: discord.Member):
-        await log_member(self.pool, member)
-        await welcome_member(self.pool, member)
+        # During a raid the guard posts one summary instead of a log per join.
+        if await self.raids.on_join(member):
+            return
+
+        self.member_log.add(member)
+        await self.greeter.greet(member)
 
     async def on_member_remove(self, member: discord.Member):
-        await log_member(self.pool, member, join=False)
+        self.member_log.add(member, join=False)
 
     async def start(self, **kwargs) -> None:
         await super().start(Config.TOKEN, reconnect=True)
 
     async def close(self) -> None:
+        # Queued logs go out while the connection is still open.
+        await self.log_queue.close()
+
         await super().close()
         await self.session.close()
 
+        self.timers.close()
+        self.raids.close()
+        self.message_log.close()
+
+        # Buffered cases go out before the pool they are written through.
+        await self.cases.close()
+
         self.pool.close()
         await self.pool.wait_closed()
 
         self._update_status_items.stop()
         self._change_status.stop()
         self._refresh_blacklists_loop.stop()
+        self._refresh_premium_users_loop.stop()
 
     @property
     def config(self):
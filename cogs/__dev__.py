@@ -126,6 +126,93 @@ class Dev(commands.Cog):
 
         await ctx.edit_original_response(content="Synced.")
 
+    @app_commands.command(name="acks")
+    @app_commands.guilds(Config.COMMUNITY_GUILD_ID)
+    async def _acks(self, ctx: discord.Interaction):
+        """Show the time taken to acknowledge interactions per command."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if self.bot.owner != ctx.user:
+            return await ctx.edit_original_response(
+                content="Sorry, this is an owner only command!"
+            )
+
+        rows = self.bot.ack_tracker.stats()
+
+        if not rows:
+            return await ctx.edit_original_response(
+                content="No interactions have been recorded yet."
+            )
+
+        lines = [f"{'command':<24}{'n':>6}{'p50':>8}{'p95':>8}{'max':>8}{'auto':>6}"]
+
+        for name, count, p50, p95, worst, auto in rows:
+            lines.append(
+                f"{name[:23]:<24}{count:>6}{p50 * 1000:>6.0f}ms"
+                f"{p95 * 1000:>6.0f}ms{worst * 1000:>6.0f}ms{auto:>6}"
+            )
+
+        await ctx.edit_original_response(
+            content="```\n" + "\n".join(lines)[:1980] + "\n```"
+        )
+
+    @app_commands.command(name="logqueue")
+    @app_commands.guilds(Config.COMMUNITY_GUILD_ID)
+    async def _logqueue(self, ctx: discord.Interaction):
+        """Show the depth and latency of the outbound log queue."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if self.bot.owner != ctx.user:
+            return await ctx.edit_original_response(
+                content="Sorry, this is an owner only command!"
+            )
+
+        stats = self.bot.log_queue.stats()
+
+        lines = [
+            f"{'queued':<10}{stats['depth']:>8} in {stats['guilds']} guilds",
+            f"{'sent':<10}{stats['sent']:>8}",
+            f"{'retried':<10}{stats['retried']:>8}",
+            f"{'dropped':<10}{stats['dropped']:>8}",
+            f"{'failed':<10}{stats['failed']:>8}",
+            f"{'latency':<10}{stats['p50'] * 1000:>6.0f}ms p50"
+            f"{stats['p95'] * 1000:>6.0f}ms p95{stats['max'] * 1000:>6.0f}ms max",
+        ]
+
+        await ctx.edit_original_response(
+            content="```\n" + "\n".join(lines) + "\n```"
+        )
+
+    @app_commands.command(name="msgcache")
+    @app_commands.guilds(Config.COMMUNITY_GUILD_ID)
+    async def _msgcache(self, ctx: discord.Interaction):
+        """Show the size and hit rate of the message log cache."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if self.bot.owner != ctx.user:
+            return await ctx.edit_original_response(
+                content="Sorry, this is an owner only command!"
+            )
+
+        cache = self.bot.message_log.cache
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+
+        lines = [
+            f"{'records':<10}{stats['records']:>10} in {stats['guilds']} guilds",
+            f"{'size':<10}{stats['bytes'] / 1024 / 1024:>8.1f}MB"
+            f" of {cache.max_bytes / 1024 / 1024:.0f}MB",
+            f"{'hit rate':<10}{stats['hits'] / lookups if lookups else 0:>10.1%}",
+            f"{'evicted':<10}{stats['evicted']:>10}",
+        ]
+
+        await ctx.edit_original_response(
+            content="```\n" + "\n".join(lines) + "\n```"
+        )
+
 
 async def setup(bot: FumeGuard):
     await bot.add_cog(Dev(bot))
@@ -25,7 +25,7 @@ class Evaluate(commands.Cog):
         self.bot: FumeGuard = bot
 
     # noinspection PyBroadException
-    @app_commands.command(name="eval")
+    @app_commands.command(name="eval", extras={"auto_defer": False})
     @app_commands.guilds(Config.COMMUNITY_GUILD_ID)
     async def _eval(self, ctx: discord.Interaction):
         """Evaluate a block of Python code."""
@@ -154,7 +154,7 @@ class Evaluate(commands.Cog):
                             content=f"```py\n{page}\n```"
                         )
 
-    @app_commands.command(name="exec")
+    @app_commands.command(name="exec", extras={"auto_defer": False})
     @app_commands.guilds(Config.COMMUNITY_GUILD_ID)
     async def _exec(self, ctx: discord.Interaction):
         """Execute a shell command."""
@@ -16,9 +16,9 @@ from utils.db import (
     get_welcome_message,
     get_member_log_channel,
     update_mod_log_channel,
-    update_welcome_message,
     update_member_log_channel,
 )
+from utils.welcome import TemplateError
 
 if TYPE_CHECKING:
     from bot import FumeGuard
@@ -119,6 +119,7 @@ class IPC(commands.Cog):
             return {"error": {"code": 404, "message": "Guild not found."}}
 
         await update_mod_log_channel(self.bot.pool, guild.id, data.channel_id)
+        self.bot.log_queue.invalidate(guild.id)
 
         return {"status": 200, "message": "Success."}
 
@@ -146,6 +147,7 @@ class IPC(commands.Cog):
             return {"error": {"code": 404, "message": "Guild not found."}}
 
         await update_member_log_channel(self.bot.pool, guild.id, data.channel_id)
+        self.bot.member_log.invalidate(guild.id)
 
         return {"status": 200, "message": "Success."}
 
@@ -167,7 +169,11 @@ class IPC(commands.Cog):
         if not guild:
             return {"error": {"code": 404, "message": "Guild not found."}}
 
-        await update_welcome_message(self.bot.pool, guild.id, data.message)
+        try:
+            await self.bot.greeter.set_message(guild.id, data.message)
+
+        except TemplateError as e:
+            return {"error": {"code": 400, "message": str(e)}}
 
         return {"status": 200, "message": "Success."}
 
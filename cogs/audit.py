@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import time
+from collections import OrderedDict
+
+import discord
+from discord.ext import commands
+
+from utils.logger import log_audit_action
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+
+# Entry ids are remembered this long, so an entry the gateway delivers again,
+# as it may after a resume, does not open a second case.
+SEEN_TTL = 600.0
+
+AuditAction = discord.AuditLogAction
+
+
+class AuditLog(commands.Cog):
+    """Opens cases for moderation done in Discord itself rather than through
+    the bot, read from audit log entries as the gateway sends them."""
+
+    def __init__(self, bot: FumeGuard):
+        self.bot: FumeGuard = bot
+
+        self._seen: OrderedDict[int, float] = OrderedDict()
+
+    def _first_seen(self, entry_id: int) -> bool:
+        now = time.monotonic()
+
+        while self._seen and next(iter(self._seen.values())) < now - SEEN_TTL:
+            self._seen.popitem(last=False)
+
+        if entry_id in self._seen:
+            return False
+
+        self._seen[entry_id] = now
+        return True
+
+    @staticmethod
+    def _describe(
+        entry: discord.AuditLogEntry,
+    ) -> Optional[tuple[str, Optional[str], str]]:
+        if entry.action is AuditAction.ban:
+            return "Member Banned", None, "red"
+
+        if entry.action is AuditAction.unban:
+            return "Member Unbanned", None, "green"
+
+        if entry.action is AuditAction.kick:
+            return "Member Kicked", None, "red"
+
+        if entry.action is AuditAction.member_update:
+            if not hasattr(entry.after, "timed_out_until"):
+                return None
+
+            until = entry.after.timed_out_until
+
+            if until:
+                return (
+                    "Member Muted",
+                    f"Timed out until {discord.utils.format_dt(until, 'f')}.",
+                    "red",
+                )
+
+            return "Member Unmuted", None, "green"
+
+        if entry.action is AuditAction.member_role_update:
+            added = getattr(entry.after, "roles", [])
+            removed = getattr(entry.before, "roles", [])
+
+            lines = []
+
+            if added:
+                lines.append(
+                    "**Added:** " + ", ".join(f"<@&{role.id}>" for role in added)
+                )
+
+            if removed:
+                lines.append(
+                    "**Removed:** " + ", ".join(f"<@&{role.id}>" for role in removed)
+                )
+
+            if not lines:
+                return None
+
+            if added and removed:
+                return "Roles Updated", "\n".join(lines), "blurple"
+
+            return (
+                ("Role Added", lines[0], "green")
+                if added
+                else ("Role Removed", lines[0], "red")
+            )
+
+        return None
+
+    @commands.Cog.listener()
+    async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry):
+        # Everything the bot does itself is logged by the command doing it,
+        # and other bots usually keep logs of their own.
+        if entry.user_id == self.bot.user.id or (entry.user and entry.user.bot):
+            return
+
+        described = self._describe(entry)
+
+        if described is None or not self._first_seen(entry.id):
+            return
+
+        action, description, color = described
+
+        await log_audit_action(self.bot, entry, action, description, color)
+
+
+async def setup(bot: FumeGuard):
+    await bot.add_cog(AuditLog(bot))
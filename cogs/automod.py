@@ -1,32 +1,94 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
-import re
+import time
+import asyncio
+import datetime
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import tasks, commands
 
-from utils.cd import cooldown_level_0
+from utils.cd import cooldown_level_0, cooldown_level_1
 from utils.db import (
     automod_enable,
     automod_status,
     automod_disable,
+    automod_add_filter,
+    automod_get_config,
+    automod_set_domain,
+    automod_get_domains,
+    automod_get_filters,
+    automod_update_rule,
+    automod_set_override,
+    automod_get_overrides,
+    automod_remove_domain,
+    automod_remove_filter,
+    automod_remove_overrides,
     automod_get_allowed_link_roles,
     automod_get_allowed_embed_roles,
     automod_update_allowed_link_roles,
+    automod_update_blocked_extensions,
     automod_update_allowed_embed_roles,
+    automod_update_max_attachment_size,
 )
+from utils.flood import MAX_WINDOW, FloodTracker
 from utils.checks import automod_perms_check
+from utils.hashes import BAD_HASHES_PATH, MAX_HASHED_SIZE, HashSet, sha256
+from utils.policy import PolicyMap
+from utils.replay import replay
+from utils.actions import ActionExecutor, DryRunExecutor
+from utils.domains import (
+    PHISHING_DOMAINS_PATH,
+    Verdict,
+    DomainMatcher,
+    load_domain_file,
+    normalize_domain,
+)
+from utils.features import MessageFeatures
+from utils.wordfilter import (
+    MAX_WORDS,
+    MAX_PATTERNS,
+    WordFilter,
+    validate_pattern,
+)
+from utils.fingerprint import FingerprintIndex, fingerprint
 
 if TYPE_CHECKING:
-    import aiomysql
-
     from bot import FumeGuard
 
 
-URL_REGEX = r"\b((?:https?|ftp):\/\/|www\.|[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})(?:[^\s]*)\b"
+RAID_TEXT_MAX_WINDOW = 300
+
+# Caps are only judged on messages with enough letters to mean shouting.
+CAPS_MIN_LETTERS = 10
+
+SIMULATE_MAX_MINUTES = 180
+SIMULATE_MAX_MESSAGES = 5000
+
+OVERRIDE_CHOICES = [
+    app_commands.Choice(name="Member flood", value="flood_member"),
+    app_commands.Choice(name="Channel flood", value="flood_channel"),
+    app_commands.Choice(name="Copy-paste raids", value="raid_text"),
+    app_commands.Choice(name="Mentions", value="mentions"),
+    app_commands.Choice(name="Capitals", value="caps"),
+    app_commands.Choice(name="Emoji", value="emoji"),
+    app_commands.Choice(name="Links", value="links"),
+    app_commands.Choice(name="Attachments", value="attachments"),
+    app_commands.Choice(name="Blocked words", value="word_filter"),
+]
+
+MAX_BLOCKED_EXTENSIONS = 50
+
+STAGE_NAMES = {
+    "flood": "Message flood",
+    "spam": "Mentions, capitals and emoji",
+    "raid_text": "Copy-paste raids",
+    "word_filter": "Blocked words",
+    "attachments": "Attachments",
+    "links": "Links",
+}
 
 
 @app_commands.guild_only()
@@ -35,42 +97,517 @@ class AutoMod(
     group_name="automod",
     group_description="Various automatic moderation configuration commands.",
 ):
+    domains = app_commands.Group(
+        name="domains", description="Allow or block links to domains."
+    )
+    channel = app_commands.Group(
+        name="channel", description="Override automod rules in channels."
+    )
+    attachments = app_commands.Group(
+        name="attachments", description="Block attachments by type and size."
+    )
+
     def __init__(self, bot: FumeGuard):
         self.bot: FumeGuard = bot
 
-    @staticmethod
-    async def _process_message(pool: aiomysql.Pool, message: discord.Message):
-        if await automod_get_allowed_link_roles(pool, message.guild.id):
-            for role_id in await automod_get_allowed_link_roles(
-                pool, message.guild.id
-            ):
+        self._configs: dict[int, dict] = {}
+        self._overrides: dict[int, list[tuple[int, str, bool]]] = {}
+        self._policies: dict[int, PolicyMap] = {}
+        self._actions = ActionExecutor()
+        # Set on copies from dry_run, which must not download attachments.
+        self._dry_run = False
+        self._member_flood = FloodTracker()
+        self._channel_flood = FloodTracker()
+        self._raid_text: dict[int, FingerprintIndex] = {}
+
+        self._domains = DomainMatcher()
+        self._phishing_mtime: Optional[float] = None
+
+        self._bad_hashes = HashSet()
+        self._bad_hashes_mtime: Optional[float] = None
+        self._downloads = asyncio.Semaphore(4)
+
+        self._filter_entries: dict[int, list[tuple[str, bool]]] = {}
+        self._word_filters: dict[int, asyncio.Task[Optional[WordFilter]]] = {}
+
+    async def cog_load(self):
+        for guild_id, domain, allowed in await automod_get_domains(self.bot.pool):
+            self._domains.set(guild_id, domain, allowed)
+
+        await self._reload_phishing_domains()
+        await self._reload_bad_hashes()
+
+        self._sweep_raid_text.start()
+        self._watch_data_files.start()
+
+    async def cog_unload(self):
+        self._actions.close()
+        self._sweep_raid_text.cancel()
+        self._watch_data_files.cancel()
+        self._bad_hashes.close()
+
+    def dry_run(self) -> AutoMod:
+        """Return a detached copy of the cog for replaying messages.
+
+        The copy shares this cog's settings caches but keeps its own flood and
+        raid state, and its actions are only counted, never carried out.
+        """
+        automod = AutoMod(self.bot)
+
+        automod._configs = self._configs
+        automod._overrides = self._overrides
+        automod._policies = self._policies
+        automod._domains = self._domains
+        automod._bad_hashes = self._bad_hashes
+        automod._filter_entries = self._filter_entries
+        automod._word_filters = self._word_filters
+        automod._actions = DryRunExecutor()
+        automod._dry_run = True
+
+        return automod
+
+    async def _reload_phishing_domains(self) -> None:
+        try:
+            mtime = PHISHING_DOMAINS_PATH.stat().st_mtime
+
+        except FileNotFoundError:
+            mtime = None
+
+        if mtime == self._phishing_mtime:
+            return
+
+        domains = await asyncio.to_thread(load_domain_file) if mtime else []
+
+        self._domains.replace_phishing(domains)
+        self._phishing_mtime = mtime
+
+        self.bot.log.info(f"Loaded {len(domains)} phishing domains.")
+
+    async def _reload_bad_hashes(self) -> None:
+        try:
+            mtime = BAD_HASHES_PATH.stat().st_mtime
+
+        except FileNotFoundError:
+            mtime = None
+
+        if mtime == self._bad_hashes_mtime:
+            return
+
+        hashes = (
+            await asyncio.to_thread(HashSet, BAD_HASHES_PATH) if mtime else HashSet()
+        )
+
+        # Lookups run on the event loop, so none is using the old map here.
+        self._bad_hashes, old = hashes, self._bad_hashes
+        self._bad_hashes_mtime = mtime
+        old.close()
+
+        self.bot.log.info(f"Loaded {len(hashes)} known-bad file hashes.")
+
+    @tasks.loop(minutes=1)
+    async def _watch_data_files(self):
+        try:
+            await self._reload_phishing_domains()
+
+        except Exception as e:
+            self.bot.log.error("Failed to reload phishing domains.", exc_info=e)
+
+        try:
+            await self._reload_bad_hashes()
+
+        except Exception as e:
+            self.bot.log.error("Failed to reload known-bad file hashes.", exc_info=e)
+
+    @tasks.loop(minutes=5)
+    async def _sweep_raid_text(self):
+        cutoff = time.monotonic() - RAID_TEXT_MAX_WINDOW
+
+        for guild_id, index in list(self._raid_text.items()):
+            index.expire(cutoff)
+
+            if not len(index):
+                del self._raid_text[guild_id]
+
+    async def _get_config(self, guild_id: int) -> dict:
+        config = self._configs.get(guild_id)
+
+        if config is None:
+            config = await automod_get_config(self.bot.pool, guild_id)
+            self._configs[guild_id] = config
+
+        return config
+
+    def _invalidate_config(self, guild_id: int) -> None:
+        self._configs.pop(guild_id, None)
+        self._policies.pop(guild_id, None)
+
+    async def _get_overrides(self, guild_id: int) -> list[tuple[int, str, bool]]:
+        overrides = self._overrides.get(guild_id)
+
+        if overrides is None:
+            overrides = await automod_get_overrides(self.bot.pool, guild_id)
+            self._overrides[guild_id] = overrides
+
+        return overrides
+
+    def _invalidate_overrides(self, guild_id: int) -> None:
+        self._overrides.pop(guild_id, None)
+        self._policies.pop(guild_id, None)
+
+    async def _get_policies(self, guild: discord.Guild) -> PolicyMap:
+        policies = self._policies.get(guild.id)
+
+        if policies is None:
+            policies = PolicyMap(
+                await self._get_config(guild.id),
+                await self._get_overrides(guild.id),
+                guild.channels,
+            )
+            self._policies[guild.id] = policies
+
+        return policies
+
+    async def _get_filter_entries(self, guild_id: int) -> list[tuple[str, bool]]:
+        entries = self._filter_entries.get(guild_id)
+
+        if entries is None:
+            entries = await automod_get_filters(self.bot.pool, guild_id)
+            self._filter_entries[guild_id] = entries
+
+        return entries
+
+    async def _build_word_filter(self, guild_id: int) -> Optional[WordFilter]:
+        entries = await self._get_filter_entries(guild_id)
+
+        if not entries:
+            return None
+
+        # Large lists take a while to compile; keep that off the event loop.
+        return await asyncio.to_thread(
+            WordFilter,
+            [pattern for pattern, is_regex in entries if not is_regex],
+            [pattern for pattern, is_regex in entries if is_regex],
+        )
+
+    async def _get_word_filter(self, guild_id: int) -> Optional[WordFilter]:
+        task = self._word_filters.get(guild_id)
+
+        # Messages arriving while the filter compiles share the one build.
+        if task is None:
+            task = asyncio.create_task(self._build_word_filter(guild_id))
+            self._word_filters[guild_id] = task
+
+        try:
+            return await task
+
+        except Exception:
+            self._word_filters.pop(guild_id, None)
+            raise
+
+    def _invalidate_word_filter(self, guild_id: int) -> None:
+        self._filter_entries.pop(guild_id, None)
+        self._word_filters.pop(guild_id, None)
+
+    async def _act(
+        self,
+        message: discord.Message,
+        rule: Optional[dict],
+        reason: str,
+        notice: str,
+    ) -> None:
+        self._actions.delete(message.channel, message.id)
+        self._actions.notify(message.channel, message.author, notice)
+
+        if rule and rule["action"] == "timeout":
+            await self._actions.timeout(message.author, rule["timeout"], reason)
+
+    async def _process_message(
+        self, message: discord.Message, config: dict, features: MessageFeatures
+    ) -> bool:
+        verdicts = {
+            self._domains.match(host, message.guild.id) for host in features.hosts
+        }
+
+        if Verdict.PHISHING in verdicts or Verdict.DENY in verdicts:
+            await self._act(
+                message,
+                None,
+                "blocked link",
+                "that link is not allowed in this server.",
+            )
+            return True
+
+        # Links to allowlisted domains only are fine for everyone.
+        if verdicts == {Verdict.ALLOW}:
+            return False
+
+        if config["link_send_roles"]:
+            for role_id in config["link_send_roles"]:
                 role = message.guild.get_role(int(role_id))
                 if role in message.author.roles:
-                    return
+                    return False
 
             else:
-                await message.delete()
-                await message.channel.send(
-                    f"{message.author.mention}, you are not allowed to send links in this server."
+                await self._act(
+                    message,
+                    None,
+                    "link",
+                    "you are not allowed to send links in this server.",
                 )
+                return True
 
-        if await automod_get_allowed_embed_roles(pool, message.guild.id):
-            for role_id in await automod_get_allowed_embed_roles(
-                pool, message.guild.id
-            ):
+        if config["link_embed_roles"]:
+            for role_id in config["link_embed_roles"]:
                 role = message.guild.get_role(int(role_id))
                 if role in message.author.roles:
-                    return
+                    return False
 
             else:
-                await message.edit(suppress=True)
+                await self._actions.suppress(message)
+                return True
+
+        return False
+
+    async def _process_flood(
+        self, message: discord.Message, config: dict, now: float
+    ) -> bool:
+        tripped = None
+
+        member_rule = config["flood_member"]
+        channel_rule = config["flood_channel"]
+
+        if member_rule and self._member_flood.hit(
+            (message.guild.id, message.author.id),
+            member_rule["limit"],
+            member_rule["window"],
+            now,
+        ):
+            tripped = member_rule
+
+        if channel_rule and self._channel_flood.hit(
+            message.channel.id, channel_rule["limit"], channel_rule["window"], now
+        ):
+            tripped = tripped or channel_rule
+
+        if not tripped:
+            return False
+
+        await self._act(
+            message,
+            tripped,
+            "message flood",
+            "you are sending messages too quickly.",
+        )
+
+        return True
+
+    async def _process_spam(
+        self, message: discord.Message, config: dict, features: MessageFeatures
+    ) -> bool:
+        rule = config["mentions"]
+
+        if rule and features.mentions + features.role_mentions >= rule["limit"]:
+            await self._act(
+                message, rule, "mass mentions", "please do not mass mention."
+            )
+            return True
+
+        rule = config["caps"]
+
+        if (
+            rule
+            and features.upper + features.lower >= CAPS_MIN_LETTERS
+            and features.caps_ratio * 100 >= rule["limit"]
+        ):
+            await self._act(
+                message, rule, "excessive capitals", "please do not shout."
+            )
+            return True
+
+        rule = config["emoji"]
+
+        if rule and features.emoji >= rule["limit"]:
+            await self._act(
+                message, rule, "emoji flood", "please do not spam emoji."
+            )
+            return True
+
+        return False
+
+    async def _process_raid_text(
+        self, message: discord.Message, config: dict, now: float
+    ) -> bool:
+        rule = config["raid_text"]
+
+        if not rule:
+            return False
+
+        keys = fingerprint(message.content)
+
+        if not keys:
+            return False
+
+        index = self._raid_text.get(message.guild.id)
+
+        if index is None:
+            index = self._raid_text[message.guild.id] = FingerprintIndex()
+
+        matches = index.add(
+            keys,
+            message.author.id,
+            message.channel.id,
+            message.id,
+            now,
+            rule["window"],
+            rule["limit"],
+        )
+
+        if not matches:
+            return False
+
+        for author_id, channel_id, message_id in matches:
+            channel = message.guild.get_channel_or_thread(channel_id)
+            member = message.guild.get_member(author_id)
+
+            if channel:
+                self._actions.delete(channel, message_id)
+
+            if member:
+                self._actions.notify(
+                    message.channel, member, "please do not post copy-pasted spam."
+                )
+
+                if rule["action"] == "timeout":
+                    await self._actions.timeout(
+                        member, rule["timeout"], "copy-paste raid"
+                    )
+
+        return True
+
+    async def _process_word_filter(self, message: discord.Message) -> bool:
+        word_filter = await self._get_word_filter(message.guild.id)
+
+        if not word_filter or not await word_filter.find(message.content):
+            return False
+
+        await self._act(
+            message, None, "blocked word", "your message contained a blocked word."
+        )
+
+        return True
+
+    async def process(
+        self, message: discord.Message, config: dict, now: float
+    ) -> Optional[str]:
+        """Run a message through every automod stage.
+
+        Returns the name of the stage that acted on the message, if any.
+        """
+        if await self._process_flood(message, config, now):
+            return "flood"
+
+        features = MessageFeatures.from_message(message)
+
+        if await self._process_spam(message, config, features):
+            return "spam"
+
+        if await self._process_raid_text(message, config, now):
+            return "raid_text"
+
+        if config["word_filter"] and await self._process_word_filter(message):
+            return "word_filter"
+
+        if message.attachments and await self._process_attachments(message, config):
+            return "attachments"
+
+        if features.hosts and await self._process_message(message, config, features):
+            return "links"
+
+        return None
+
+    async def _process_attachments(
+        self, message: discord.Message, config: dict
+    ) -> bool:
+        extensions = config["blocked_extensions"]
+        max_size = config["max_attachment_size"]
+
+        for attachment in message.attachments:
+            _, dot, extension = attachment.filename.rpartition(".")
+
+            if dot and extension.lower() in extensions:
+                await self._act(
+                    message,
+                    None,
+                    "blocked file type",
+                    "that file type is not allowed in this server.",
+                )
+                return True
+
+            if max_size and attachment.size > max_size * 1024 * 1024:
+                await self._act(
+                    message,
+                    None,
+                    "file too large",
+                    f"files can be at most {max_size} MB in this server.",
+                )
+                return True
+
+        if self._dry_run or not len(self._bad_hashes):
+            return False
+
+        for attachment in message.attachments:
+            if attachment.size > MAX_HASHED_SIZE:
+                continue
+
+            async with self._downloads:
+                try:
+                    data = await attachment.read()
+
+                except discord.HTTPException:
+                    continue
+
+            if await sha256(data) in self._bad_hashes:
+                await self._act(
+                    message,
+                    None,
+                    "known malicious file",
+                    "that file is known to be malicious.",
+                )
+                return True
+
+        return False
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        if await automod_status(self.bot.pool, message.guild.id) and re.search(
-            URL_REGEX, message.content
-        ):
-            await self._process_message(self.bot.pool, message)
+        # Webhook and system messages carry a plain user as their author.
+        if not message.guild or isinstance(message.author, discord.User):
+            return
+
+        if message.author.bot:
+            return
+
+        policies = await self._get_policies(message.guild)
+
+        if not policies.default["enabled"]:
+            return
+
+        await self.process(message, policies.get(message.channel), time.monotonic())
+
+    # Channel policies depend on where channels sit, so any change to the
+    # channel list rebuilds them on the next message.
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self._policies.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ):
+        self._policies.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._policies.pop(channel.guild.id, None)
 
     @app_commands.command(name="enable")
     @app_commands.check(automod_perms_check)
@@ -82,6 +619,7 @@ class AutoMod(
 
         if not await automod_status(self.bot.pool, ctx.guild.id):
             await automod_enable(self.bot.pool, ctx.guild.id)
+            self._invalidate_config(ctx.guild.id)
             await ctx.edit_original_response(
                 content="Automatic moderation system has been enabled."
             )
@@ -101,6 +639,7 @@ class AutoMod(
 
         if await automod_status(self.bot.pool, ctx.guild.id):
             await automod_disable(self.bot.pool, ctx.guild.id)
+            self._invalidate_config(ctx.guild.id)
             await ctx.edit_original_response(
                 content="Automatic moderation system has been disabled."
             )
@@ -159,6 +698,7 @@ class AutoMod(
             await automod_update_allowed_link_roles(
                 self.bot.pool, ctx.guild.id, str(role.id)
             )
+            self._invalidate_config(ctx.guild.id)
             await ctx.edit_original_response(
                 content=f"Role {role.mention} is now allowed to send links in the server."
             )
@@ -191,6 +731,7 @@ class AutoMod(
             await automod_update_allowed_link_roles(
                 self.bot.pool, ctx.guild.id, str(role.id)
             )
+            self._invalidate_config(ctx.guild.id)
             await ctx.edit_original_response(
                 content=f"Role {role.mention} is now disallowed to send links in the server."
             )
@@ -249,6 +790,7 @@ class AutoMod(
             await automod_update_allowed_embed_roles(
                 self.bot.pool, ctx.guild.id, str(role.id)
             )
+            self._invalidate_config(ctx.guild.id)
             await ctx.edit_original_response(
                 content=f"Role {role.mention} is now allowed to send embeds in the server."
             )
@@ -281,6 +823,7 @@ class AutoMod(
             await automod_update_allowed_embed_roles(
                 self.bot.pool, ctx.guild.id, str(role.id)
             )
+            self._invalidate_config(ctx.guild.id)
             await ctx.edit_original_response(
                 content=f"Role {role.mention} is now disallowed to send embeds in the server."
             )
@@ -290,6 +833,920 @@ class AutoMod(
                 content=f"Role {role.mention} is already disallowed to send embeds in the server."
             )
 
+    @app_commands.command(name="flood")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        scope=[
+            app_commands.Choice(name="Member", value="member"),
+            app_commands.Choice(name="Channel", value="channel"),
+        ],
+        action=[
+            app_commands.Choice(name="Delete", value="delete"),
+            app_commands.Choice(name="Timeout", value="timeout"),
+        ],
+    )
+    async def _automod_flood(
+        self,
+        ctx: discord.Interaction,
+        scope: app_commands.Choice[str],
+        messages: int,
+        seconds: int,
+        action: app_commands.Choice[str],
+        timeout_minutes: Optional[int] = 5,
+    ):
+        """Set the message flood limit for members or channels.
+
+        Parameters
+        ----------
+        scope : app_commands.Choice[str]
+            Whether the limit applies to each member or to each channel.
+        messages : int
+            The number of messages allowed within the window (between 2 and 50).
+        seconds : int
+            The length of the window in seconds (between 1 and 60).
+        action : app_commands.Choice[str]
+            What to do with messages over the limit.
+        timeout_minutes : Optional[int]
+            How long to timeout the author for, if the action is a timeout.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not 2 <= messages <= 50:
+            return await ctx.edit_original_response(
+                content="The number of messages can be between 2 and 50 only."
+            )
+
+        if not 1 <= seconds <= MAX_WINDOW:
+            return await ctx.edit_original_response(
+                content=f"The window can be between 1 and {int(MAX_WINDOW)} seconds only."
+            )
+
+        if not 1 <= timeout_minutes <= 40320:
+            return await ctx.edit_original_response(
+                content="The timeout can be between 1 minute and 28 days only."
+            )
+
+        await automod_update_rule(
+            self.bot.pool,
+            ctx.guild.id,
+            f"flood_{scope.value}",
+            limit=messages,
+            window=seconds,
+            action=action.value,
+            timeout=timeout_minutes,
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"Each {scope.value} may now send up to **{messages}** messages "
+            f"every **{seconds}** seconds; further messages will be "
+            f"{'deleted and the author timed out' if action.value == 'timeout' else 'deleted'}."
+        )
+
+    @app_commands.command(name="disable_flood")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        scope=[
+            app_commands.Choice(name="Member", value="member"),
+            app_commands.Choice(name="Channel", value="channel"),
+        ]
+    )
+    async def _automod_disable_flood(
+        self, ctx: discord.Interaction, scope: app_commands.Choice[str]
+    ):
+        """Remove the message flood limit for members or channels.
+
+        Parameters
+        ----------
+        scope : app_commands.Choice[str]
+            Whether to remove the member or the channel limit.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        config = await self._get_config(ctx.guild.id)
+
+        if not config[f"flood_{scope.value}"]:
+            return await ctx.edit_original_response(
+                content=f"No {scope.value} flood limit is set in the server."
+            )
+
+        await automod_update_rule(
+            self.bot.pool, ctx.guild.id, f"flood_{scope.value}"
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"The {scope.value} flood limit has been removed."
+        )
+
+    @app_commands.command(name="show_flood")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_show_flood(self, ctx: discord.Interaction):
+        """Show the message flood limits set in the server."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        config = await self._get_config(ctx.guild.id)
+        lines = []
+
+        for scope in ("member", "channel"):
+            rule = config[f"flood_{scope}"]
+
+            if not rule:
+                lines.append(f"**{scope.title()}:** No limit.")
+                continue
+
+            action = (
+                f"timeout for {rule['timeout']} minutes"
+                if rule["action"] == "timeout"
+                else "delete"
+            )
+            lines.append(
+                f"**{scope.title()}:** {rule['limit']} messages every "
+                f"{rule['window']} seconds, then {action}."
+            )
+
+        await ctx.edit_original_response(content="\n".join(lines))
+
+    @app_commands.command(name="raid_text")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="Delete", value="delete"),
+            app_commands.Choice(name="Timeout", value="timeout"),
+        ]
+    )
+    async def _automod_raid_text(
+        self,
+        ctx: discord.Interaction,
+        members: int,
+        seconds: int,
+        action: app_commands.Choice[str],
+        timeout_minutes: Optional[int] = 10,
+    ):
+        """Act on the same or near-same message posted by several members.
+
+        Parameters
+        ----------
+        members : int
+            The number of different members posting the message (between 2 and 50).
+        seconds : int
+            The window in which the members post it (between 1 and 300).
+        action : app_commands.Choice[str]
+            What to do with the matching messages.
+        timeout_minutes : Optional[int]
+            How long to timeout the authors for, if the action is a timeout.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not 2 <= members <= 50:
+            return await ctx.edit_original_response(
+                content="The number of members can be between 2 and 50 only."
+            )
+
+        if not 1 <= seconds <= RAID_TEXT_MAX_WINDOW:
+            return await ctx.edit_original_response(
+                content=f"The window can be between 1 and {RAID_TEXT_MAX_WINDOW} seconds only."
+            )
+
+        if not 1 <= timeout_minutes <= 40320:
+            return await ctx.edit_original_response(
+                content="The timeout can be between 1 minute and 28 days only."
+            )
+
+        await automod_update_rule(
+            self.bot.pool,
+            ctx.guild.id,
+            "raid_text",
+            limit=members,
+            window=seconds,
+            action=action.value,
+            timeout=timeout_minutes,
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"Messages posted by **{members}** or more members within "
+            f"**{seconds}** seconds will now be "
+            f"{'deleted and the authors timed out' if action.value == 'timeout' else 'deleted'}."
+        )
+
+    @app_commands.command(name="disable_raid_text")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_disable_raid_text(self, ctx: discord.Interaction):
+        """Stop acting on messages posted by several members."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        config = await self._get_config(ctx.guild.id)
+
+        if not config["raid_text"]:
+            return await ctx.edit_original_response(
+                content="Copy-paste raid detection is not enabled in the server."
+            )
+
+        await automod_update_rule(self.bot.pool, ctx.guild.id, "raid_text")
+        self._invalidate_config(ctx.guild.id)
+        self._raid_text.pop(ctx.guild.id, None)
+
+        await ctx.edit_original_response(
+            content="Copy-paste raid detection has been disabled."
+        )
+
+    @domains.command(name="allow")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_allow_domain(self, ctx: discord.Interaction, domain: str):
+        """Allow everyone to send links to a domain and its subdomains.
+
+        Parameters
+        ----------
+        domain : str
+            The domain to allow, for example youtube.com.
+
+        """
+        await self._set_domain(ctx, domain, allowed=True)
+
+    @domains.command(name="deny")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_deny_domain(self, ctx: discord.Interaction, domain: str):
+        """Block links to a domain and its subdomains for everyone.
+
+        Parameters
+        ----------
+        domain : str
+            The domain to block, for example example.com.
+
+        """
+        await self._set_domain(ctx, domain, allowed=False)
+
+    async def _set_domain(
+        self, ctx: discord.Interaction, domain: str, allowed: bool
+    ) -> None:
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        _domain = normalize_domain(domain)
+
+        if not _domain:
+            return await ctx.edit_original_response(
+                content=f"`{domain}` is not a valid domain."
+            )
+
+        await automod_set_domain(self.bot.pool, ctx.guild.id, _domain, allowed)
+        self._domains.set(ctx.guild.id, _domain, allowed)
+
+        await ctx.edit_original_response(
+            content=f"Links to `{_domain}` are now "
+            f"{'allowed' if allowed else 'blocked'} in the server."
+        )
+
+    @domains.command(name="remove")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_remove_domain(self, ctx: discord.Interaction, domain: str):
+        """Remove a domain from the allowed or blocked domains.
+
+        Parameters
+        ----------
+        domain : str
+            The domain to remove.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        _domain = normalize_domain(domain)
+
+        if _domain not in dict(self._domains.entries(ctx.guild.id)):
+            return await ctx.edit_original_response(
+                content=f"`{domain}` is neither allowed nor blocked in the server."
+            )
+
+        await automod_remove_domain(self.bot.pool, ctx.guild.id, _domain)
+        self._domains.remove(ctx.guild.id, _domain)
+
+        await ctx.edit_original_response(
+            content=f"`{_domain}` has been removed from the domain lists."
+        )
+
+    @domains.command(name="show")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_show_domains(self, ctx: discord.Interaction):
+        """Show the allowed and blocked domains in the server."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        entries = self._domains.entries(ctx.guild.id)
+
+        if not entries:
+            return await ctx.edit_original_response(
+                content="No domains are allowed or blocked in the server."
+            )
+
+        allowed = [f"`{domain}`" for domain, _allowed in entries if _allowed]
+        denied = [f"`{domain}`" for domain, _allowed in entries if not _allowed]
+
+        await ctx.edit_original_response(
+            content=(
+                f"**Allowed:** {', '.join(allowed) or 'None.'}\n"
+                f"**Blocked:** {', '.join(denied) or 'None.'}"
+            )[:2000]
+        )
+
+    @app_commands.command(name="block_word")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_block_word(self, ctx: discord.Interaction, word: str):
+        """Block a word or phrase in the server.
+
+        Parameters
+        ----------
+        word : str
+            The word or phrase to block. Lookalike letters, accents and extra spaces are matched too.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        entries = await self._get_filter_entries(ctx.guild.id)
+        word = word.strip()
+
+        if (word, False) in entries:
+            return await ctx.edit_original_response(
+                content=f"`{word}` is already blocked in the server."
+            )
+
+        if sum(1 for _, is_regex in entries if not is_regex) >= MAX_WORDS:
+            return await ctx.edit_original_response(
+                content=f"A server can block at most {MAX_WORDS} words."
+            )
+
+        await automod_add_filter(self.bot.pool, ctx.guild.id, word)
+        self._invalidate_word_filter(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"`{word}` is now blocked in the server."
+        )
+
+    @app_commands.command(name="block_pattern")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_block_pattern(self, ctx: discord.Interaction, pattern: str):
+        """Block messages matching a regular expression in the server.
+
+        Parameters
+        ----------
+        pattern : str
+            The regular expression to block.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        entries = await self._get_filter_entries(ctx.guild.id)
+
+        if (pattern, True) in entries:
+            return await ctx.edit_original_response(
+                content=f"`{pattern}` is already blocked in the server."
+            )
+
+        if sum(1 for _, is_regex in entries if is_regex) >= MAX_PATTERNS:
+            return await ctx.edit_original_response(
+                content=f"A server can block at most {MAX_PATTERNS} patterns."
+            )
+
+        if error := validate_pattern(pattern):
+            return await ctx.edit_original_response(content=error)
+
+        await automod_add_filter(self.bot.pool, ctx.guild.id, pattern, is_regex=True)
+        self._invalidate_word_filter(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"Messages matching `{pattern}` are now blocked in the server."
+        )
+
+    @app_commands.command(name="unblock")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_unblock(self, ctx: discord.Interaction, value: str):
+        """Remove a blocked word or pattern.
+
+        Parameters
+        ----------
+        value : str
+            The word or pattern to remove.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        entries = await self._get_filter_entries(ctx.guild.id)
+
+        if not any(pattern == value for pattern, _ in entries):
+            return await ctx.edit_original_response(
+                content=f"`{value}` is not blocked in the server."
+            )
+
+        await automod_remove_filter(self.bot.pool, ctx.guild.id, value)
+        self._invalidate_word_filter(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"`{value}` is no longer blocked in the server."
+        )
+
+    @app_commands.command(name="show_blocked")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_show_blocked(self, ctx: discord.Interaction):
+        """Show the blocked words and patterns in the server."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        entries = await self._get_filter_entries(ctx.guild.id)
+
+        if not entries:
+            return await ctx.edit_original_response(
+                content="No words or patterns are blocked in the server."
+            )
+
+        words = [f"||{pattern}||" for pattern, is_regex in entries if not is_regex]
+        patterns = [f"`{pattern}`" for pattern, is_regex in entries if is_regex]
+
+        await ctx.edit_original_response(
+            content=(
+                f"**Words:** {', '.join(words) or 'None.'}\n"
+                f"**Patterns:** {', '.join(patterns) or 'None.'}"
+            )[:2000]
+        )
+
+    @app_commands.command(name="spam")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        rule=[
+            app_commands.Choice(name="Mentions (per message)", value="mentions"),
+            app_commands.Choice(name="Capitals (percent of letters)", value="caps"),
+            app_commands.Choice(name="Emoji (per message)", value="emoji"),
+        ],
+        action=[
+            app_commands.Choice(name="Delete", value="delete"),
+            app_commands.Choice(name="Timeout", value="timeout"),
+        ],
+    )
+    async def _automod_spam(
+        self,
+        ctx: discord.Interaction,
+        rule: app_commands.Choice[str],
+        limit: int,
+        action: app_commands.Choice[str],
+        timeout_minutes: Optional[int] = 5,
+    ):
+        """Act on messages with too many mentions, capitals or emoji.
+
+        Parameters
+        ----------
+        rule : app_commands.Choice[str]
+            What to limit in each message.
+        limit : int
+            The number of mentions or emoji, or the percentage of capitals, to act at.
+        action : app_commands.Choice[str]
+            What to do with messages at the limit.
+        timeout_minutes : Optional[int]
+            How long to timeout the author for, if the action is a timeout.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if rule.value == "caps" and not 50 <= limit <= 100:
+            return await ctx.edit_original_response(
+                content="The percentage of capitals can be between 50 and 100 only."
+            )
+
+        if rule.value != "caps" and not 2 <= limit <= 100:
+            return await ctx.edit_original_response(
+                content="The limit can be between 2 and 100 only."
+            )
+
+        if not 1 <= timeout_minutes <= 40320:
+            return await ctx.edit_original_response(
+                content="The timeout can be between 1 minute and 28 days only."
+            )
+
+        await automod_update_rule(
+            self.bot.pool,
+            ctx.guild.id,
+            rule.value,
+            limit=limit,
+            window=0,
+            action=action.value,
+            timeout=timeout_minutes,
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"The **{rule.name}** limit has been set to **{limit}**."
+        )
+
+    @app_commands.command(name="disable_spam")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        rule=[
+            app_commands.Choice(name="Mentions", value="mentions"),
+            app_commands.Choice(name="Capitals", value="caps"),
+            app_commands.Choice(name="Emoji", value="emoji"),
+        ]
+    )
+    async def _automod_disable_spam(
+        self, ctx: discord.Interaction, rule: app_commands.Choice[str]
+    ):
+        """Remove a mention, capitals or emoji limit.
+
+        Parameters
+        ----------
+        rule : app_commands.Choice[str]
+            The limit to remove.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        config = await self._get_config(ctx.guild.id)
+
+        if not config[rule.value]:
+            return await ctx.edit_original_response(
+                content=f"No **{rule.name}** limit is set in the server."
+            )
+
+        await automod_update_rule(self.bot.pool, ctx.guild.id, rule.value)
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"The **{rule.name}** limit has been removed."
+        )
+
+    @attachments.command(name="block")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_block_extension(
+        self, ctx: discord.Interaction, extension: str
+    ):
+        """Delete attachments with a file extension.
+
+        Parameters
+        ----------
+        extension : str
+            The file extension to block, such as exe.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        extension = extension.strip().lstrip(".").lower()
+
+        if not extension.isalnum() or len(extension) > 10:
+            return await ctx.edit_original_response(
+                content="Please provide a valid file extension."
+            )
+
+        config = await self._get_config(ctx.guild.id)
+        extensions = config["blocked_extensions"]
+
+        if extension in extensions:
+            return await ctx.edit_original_response(
+                content=f"`.{extension}` files are already blocked in the server."
+            )
+
+        if len(extensions) >= MAX_BLOCKED_EXTENSIONS:
+            return await ctx.edit_original_response(
+                content=f"The server can block at most {MAX_BLOCKED_EXTENSIONS} "
+                f"file extensions."
+            )
+
+        await automod_update_blocked_extensions(
+            self.bot.pool, ctx.guild.id, extensions + [extension]
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"`.{extension}` files will now be deleted."
+        )
+
+    @attachments.command(name="unblock")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_unblock_extension(
+        self, ctx: discord.Interaction, extension: str
+    ):
+        """Allow attachments with a blocked file extension again.
+
+        Parameters
+        ----------
+        extension : str
+            The file extension to unblock.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        extension = extension.strip().lstrip(".").lower()
+        config = await self._get_config(ctx.guild.id)
+        extensions = config["blocked_extensions"]
+
+        if extension not in extensions:
+            return await ctx.edit_original_response(
+                content=f"`.{extension}` files are not blocked in the server."
+            )
+
+        await automod_update_blocked_extensions(
+            self.bot.pool,
+            ctx.guild.id,
+            [_extension for _extension in extensions if _extension != extension],
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"`.{extension}` files are no longer blocked."
+        )
+
+    @attachments.command(name="size")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_attachment_size(
+        self, ctx: discord.Interaction, megabytes: int
+    ):
+        """Delete attachments larger than a size.
+
+        Parameters
+        ----------
+        megabytes : int
+            The largest allowed attachment in megabytes (0 to remove the limit).
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not 0 <= megabytes <= 500:
+            return await ctx.edit_original_response(
+                content="The size can be between 0 and 500 megabytes only."
+            )
+
+        await automod_update_max_attachment_size(
+            self.bot.pool, ctx.guild.id, megabytes or None
+        )
+        self._invalidate_config(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"Attachments larger than **{megabytes} MB** will now be deleted."
+            if megabytes
+            else "The attachment size limit has been removed."
+        )
+
+    @attachments.command(name="show")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_show_attachments(self, ctx: discord.Interaction):
+        """Show the attachment rules set in the server."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        config = await self._get_config(ctx.guild.id)
+        extensions = config["blocked_extensions"]
+        max_size = config["max_attachment_size"]
+
+        await ctx.edit_original_response(
+            content=f"**Blocked extensions:** "
+            f"{', '.join(f'`.{extension}`' for extension in extensions) or 'None'}\n"
+            f"**Size limit:** {f'{max_size} MB' if max_size else 'None'}\n"
+            f"**Known malicious files:** always deleted "
+            f"({len(self._bad_hashes)} known)."
+        )
+
+    @channel.command(name="set")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        rule=OVERRIDE_CHOICES,
+        state=[
+            app_commands.Choice(name="Off", value=0),
+            app_commands.Choice(name="On", value=1),
+        ],
+    )
+    async def _automod_channel_rule(
+        self,
+        ctx: discord.Interaction,
+        target: discord.abc.GuildChannel,
+        rule: app_commands.Choice[str],
+        state: app_commands.Choice[int],
+    ):
+        """Turn a rule off or back on in a channel or category.
+
+        Parameters
+        ----------
+        target : discord.abc.GuildChannel
+            The channel or category to override the rule in.
+        rule : app_commands.Choice[str]
+            The rule to override.
+        state : app_commands.Choice[int]
+            Whether the rule applies there; a channel setting wins over its
+            category's.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if isinstance(target, discord.Thread):
+            return await ctx.edit_original_response(
+                content="Threads follow the rules of the channel they are in."
+            )
+
+        await automod_set_override(
+            self.bot.pool, ctx.guild.id, target.id, rule.value, bool(state.value)
+        )
+        self._invalidate_overrides(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"The **{rule.name}** rule is now **{state.name.lower()}** "
+            f"in {target.mention}."
+        )
+
+    @channel.command(name="reset")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(rule=OVERRIDE_CHOICES)
+    async def _automod_reset_channel_rule(
+        self,
+        ctx: discord.Interaction,
+        target: discord.abc.GuildChannel,
+        rule: Optional[app_commands.Choice[str]] = None,
+    ):
+        """Remove rule overrides from a channel or category.
+
+        Parameters
+        ----------
+        target : discord.abc.GuildChannel
+            The channel or category to remove overrides from.
+        rule : Optional[app_commands.Choice[str]]
+            The rule to remove the override of; all of them if not given.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        overrides = await self._get_overrides(ctx.guild.id)
+
+        if not any(
+            target_id == target.id and (not rule or _rule == rule.value)
+            for target_id, _rule, _ in overrides
+        ):
+            return await ctx.edit_original_response(
+                content=f"There are no such overrides in {target.mention}."
+            )
+
+        await automod_remove_overrides(
+            self.bot.pool, ctx.guild.id, target.id, rule.value if rule else None
+        )
+        self._invalidate_overrides(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"The {f'**{rule.name}** override has' if rule else 'overrides have'} "
+            f"been removed from {target.mention}."
+        )
+
+    @channel.command(name="show")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _automod_show_channel_rules(self, ctx: discord.Interaction):
+        """Show the channels and categories that override automod rules."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        overrides = await self._get_overrides(ctx.guild.id)
+
+        if not overrides:
+            return await ctx.edit_original_response(
+                content="No channel or category overrides any rule in the server."
+            )
+
+        names = {choice.value: choice.name for choice in OVERRIDE_CHOICES}
+        targets: dict[int, list[str]] = {}
+
+        for target_id, rule, enabled in sorted(overrides):
+            targets.setdefault(target_id, []).append(
+                f"{names.get(rule, rule)} {'on' if enabled else 'off'}"
+            )
+
+        await ctx.edit_original_response(
+            content="\n".join(
+                f"<#{target_id}>: {', '.join(rules)}."
+                for target_id, rules in targets.items()
+            )[:2000]
+        )
+
+    @app_commands.command(name="simulate")
+    @app_commands.check(automod_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_1)
+    async def _automod_simulate(
+        self, ctx: discord.Interaction, minutes: Optional[int] = 60
+    ):
+        """Replay recent messages through the automod rules without acting on them.
+
+        Parameters
+        ----------
+        minutes : Optional[int]
+            How many minutes of messages to replay.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not 1 <= minutes <= SIMULATE_MAX_MINUTES:
+            return await ctx.edit_original_response(
+                content=f"Minutes can be between 1 and {SIMULATE_MAX_MINUTES} only."
+            )
+
+        after = discord.utils.utcnow() - datetime.timedelta(minutes=minutes)
+        channels = []
+
+        for channel in ctx.guild.text_channels:
+            # Channels that have been quiet since the cutoff need no request.
+            if (
+                not channel.last_message_id
+                or discord.utils.snowflake_time(channel.last_message_id) < after
+            ):
+                continue
+
+            permissions = channel.permissions_for(ctx.guild.me)
+
+            if permissions.read_messages and permissions.read_message_history:
+                channels.append(channel)
+
+        messages = []
+
+        # The message budget is shared out between channels, newest messages
+        # first; what a quiet channel leaves over goes to the ones after it.
+        for i, channel in enumerate(channels):
+            limit = (SIMULATE_MAX_MESSAGES - len(messages)) // (len(channels) - i)
+
+            if limit < 1:
+                continue
+
+            try:
+                async for message in channel.history(
+                    limit=limit, after=after, oldest_first=False
+                ):
+                    if (
+                        not isinstance(message.author, discord.User)
+                        and not message.author.bot
+                    ):
+                        messages.append(message)
+
+            except (discord.Forbidden, discord.NotFound):
+                pass
+
+        messages.sort(key=lambda m: m.id)
+
+        report = await replay(
+            self.dry_run(),
+            ((message, message.created_at.timestamp()) for message in messages),
+        )
+
+        lines = [
+            f"Replayed **{report.messages}** messages from the last "
+            f"{minutes} minutes against the current rules."
+        ]
+
+        if not report.hits:
+            lines.append("No rule would have acted on any of them.")
+
+        else:
+            for stage, name in STAGE_NAMES.items():
+                if report.hits[stage]:
+                    lines.append(f"**{name}:** {report.hits[stage]} messages.")
+
+            lines.append(
+                f"**Actions:** {report.actions['delete']} deleted, "
+                f"{report.actions['timeout']} timed out, "
+                f"{report.actions['suppress']} embeds suppressed."
+            )
+
+        await ctx.edit_original_response(content="\n".join(lines))
+
 
 async def setup(bot: FumeGuard):
     await bot.add_cog(AutoMod(bot))
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Optional
+
+import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.cd import cooldown_level_0
+from utils.checks import warn_perms_check
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+
+HISTORY_PAGE_SIZE = 10
+
+
+def _timestamp(case: dict) -> str:
+    created_at = case["created_at"].replace(tzinfo=datetime.timezone.utc)
+    return discord.utils.format_dt(created_at, "f")
+
+
+def _case_line(case: dict) -> str:
+    line = f"**#{case['case_id']}** {case['action']} | {_timestamp(case)}"
+
+    if case["target_id"]:
+        line += f" | <@{case['target_id']}>"
+
+    line += f" by <@{case['moderator_id']}>"
+
+    if case["reason"]:
+        line += f"\n> {discord.utils.escape_markdown(case['reason'][:100])}"
+
+    return line
+
+
+class HistoryView(discord.ui.View):
+    """Pages through a member's or moderator's cases, carrying the keyset
+    cursor of the last case shown rather than a page number."""
+
+    def __init__(
+        self,
+        bot: FumeGuard,
+        user: discord.abc.User,
+        title: str,
+        target_id: Optional[int],
+        moderator_id: Optional[int],
+    ):
+        super().__init__(timeout=300)
+
+        self.bot = bot
+        self.user = user
+        self.title = title
+        self.target_id = target_id
+        self.moderator_id = moderator_id
+
+        self.page = 0
+        self.cursor: Optional[tuple] = None
+
+    async def interaction_check(self, ctx: discord.Interaction) -> bool:
+        return ctx.user.id == self.user.id
+
+    async def build(self, guild: discord.Guild) -> discord.Embed:
+        cases = await self.bot.cases.history(
+            guild.id,
+            target_id=self.target_id,
+            moderator_id=self.moderator_id,
+            before=self.cursor,
+            limit=HISTORY_PAGE_SIZE + 1,
+        )
+
+        more = len(cases) > HISTORY_PAGE_SIZE
+        cases = cases[:HISTORY_PAGE_SIZE]
+
+        self.page += 1
+        self._next.disabled = not more
+
+        if cases:
+            self.cursor = (cases[-1]["created_at"], cases[-1]["case_id"])
+
+        embed = discord.Embed(
+            title=self.title,
+            description="\n\n".join(_case_line(case) for case in cases)
+            or "No cases found.",
+            color=self.bot.embed_color,
+        )
+        embed.set_footer(text=f"Page {self.page}")
+
+        return embed
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.blurple)
+    async def _next(self, ctx: discord.Interaction, _button: discord.ui.Button):
+        embed = await self.build(ctx.guild)
+        # noinspection PyUnresolvedReferences
+        await ctx.response.edit_message(embed=embed, view=self)
+
+
+class Cases(commands.Cog):
+    case = app_commands.Group(
+        name="case",
+        description="Commands to view and edit moderation cases.",
+        guild_only=True,
+    )
+
+    def __init__(self, bot: FumeGuard):
+        self.bot: FumeGuard = bot
+
+    @case.command(name="view")
+    @app_commands.check(warn_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _case_view(
+        self, ctx: discord.Interaction, case_id: app_commands.Range[int, 1]
+    ):
+        """Shows a moderation case.
+
+        Parameters
+        ----------
+        case_id : app_commands.Range[int, 1]
+            The number of the case.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        case = await self.bot.cases.get(ctx.guild.id, case_id)
+
+        if not case:
+            return await ctx.edit_original_response(
+                content=f"Case **#{case_id}** does not exist."
+            )
+
+        embed = discord.Embed(
+            title=f"{case['action']} | Case {case['case_id']}",
+            color=self.bot.embed_color,
+        )
+
+        if case["target_id"]:
+            embed.add_field(
+                name="Target",
+                value=f"<@{case['target_id']}> ({case['target_id']})",
+                inline=False,
+            )
+
+        embed.add_field(
+            name="Moderator",
+            value=f"<@{case['moderator_id']}> ({case['moderator_id']})",
+            inline=False,
+        )
+        embed.add_field(
+            name="Reason", value=case["reason"] or "Unspecified.", inline=False
+        )
+        embed.add_field(name="Created", value=_timestamp(case), inline=False)
+
+        await ctx.edit_original_response(embed=embed)
+
+    @case.command(name="edit_reason")
+    @app_commands.check(warn_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _case_edit_reason(
+        self,
+        ctx: discord.Interaction,
+        case_id: app_commands.Range[int, 1],
+        reason: app_commands.Range[str, 1, 1024],
+    ):
+        """Changes the reason of a moderation case.
+
+        Parameters
+        ----------
+        case_id : app_commands.Range[int, 1]
+            The number of the case.
+        reason : app_commands.Range[str, 1, 1024]
+            The new reason.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not await self.bot.cases.edit_reason(ctx.guild.id, case_id, reason):
+            return await ctx.edit_original_response(
+                content=f"Case **#{case_id}** does not exist."
+            )
+
+        await ctx.edit_original_response(
+            content=f"The reason of case **#{case_id}** has been updated."
+        )
+
+    @app_commands.command(name="history")
+    @app_commands.guild_only()
+    @app_commands.check(warn_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _history(
+        self,
+        ctx: discord.Interaction,
+        member: Optional[Union[discord.Member, discord.User]] = None,
+        moderator: Optional[discord.Member] = None,
+    ):
+        """Shows the moderation cases of a member, or those opened by a moderator.
+
+        Parameters
+        ----------
+        member : Optional[Union[discord.Member, discord.User]]
+            The member whose cases to show.
+        moderator : Optional[discord.Member]
+            The moderator whose cases to show.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not member and not moderator:
+            return await ctx.edit_original_response(
+                content="Specify a member, a moderator or both."
+            )
+
+        if member and moderator:
+            title = f"Cases of {member} by {moderator}"
+
+        elif member:
+            title = f"Cases of {member}"
+
+        else:
+            title = f"Cases by {moderator}"
+
+        view = HistoryView(
+            self.bot,
+            ctx.user,
+            title,
+            target_id=member.id if member else None,
+            moderator_id=moderator.id if moderator else None,
+        )
+        embed = await view.build(ctx.guild)
+
+        await ctx.edit_original_response(embed=embed, view=view)
+
+
+async def setup(bot: FumeGuard):
+    await bot.add_cog(Cases(bot))
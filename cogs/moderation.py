@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Union, Callable, Optional, Awaitable
 
+import io
+import re
 import datetime
 
 import discord
@@ -9,25 +11,58 @@ from discord import app_commands
 from discord.ext import commands
 
 from utils.cd import cooldown_level_0
+from utils.bans import BanIndex
+from utils.mass import MassActionResult, mass_ban, mass_kick
+from utils.purge import Purge, PurgeResult, build_check
 from utils.checks import (
     ban_perms_check,
     kick_perms_check,
     mute_perms_check,
     warn_perms_check,
     clear_perms_check,
+    lockdown_perms_check,
     channel_mute_perms_check,
 )
 from utils.logger import log_mod_action
 from utils.modals import AnnouncementModal
+from utils.lockdown import lock, unlock, mute_member, unmute_member
+from utils.wordfilter import compile_pattern, validate_pattern
 
 if TYPE_CHECKING:
     from bot import FumeGuard
 
 
+MAX_CLEAR_AMOUNT = 5000
+MAX_TEMP_DAYS = 365
+
+# Discord caps a single timeout at 28 days; longer mutes are renewed by timer,
+# this long before the current timeout would run out.
+MAX_TIMEOUT = datetime.timedelta(days=28)
+RENEW_MARGIN = datetime.timedelta(hours=1)
+MAX_MASS_TARGETS = 1000
+
+SNOWFLAKE_REGEX = re.compile(r"\d{15,20}")
+
+
+def _mass_description(user_ids: list[int]) -> str:
+    description = f"{len(user_ids)} users: " + ", ".join(
+        f"<@{user_id}>" for user_id in user_ids
+    )
+
+    # Embed descriptions are capped at 4096 characters.
+    if len(description) > 4000:
+        description = description[:4000].rsplit(",", 1)[0] + ", ..."
+
+    return description
+
+
 class Moderation(commands.Cog):
     def __init__(self, bot: FumeGuard):
         self.bot: FumeGuard = bot
 
+        self._bans = BanIndex()
+        self._purging: set[int] = set()
+
     @app_commands.command(name="kick")
     @app_commands.check(kick_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
@@ -135,6 +170,458 @@ class Moderation(commands.Cog):
             color="red",
         )
 
+    @app_commands.command(name="tempban")
+    @app_commands.check(ban_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.guild_only()
+    async def _tempban(
+        self,
+        ctx: discord.Interaction,
+        member: discord.Member,
+        minutes: Optional[int] = None,
+        hours: Optional[int] = None,
+        days: Optional[int] = None,
+        delete_message_days: Optional[int] = None,
+        reason: Optional[str] = None,
+    ):
+        """Ban a member from the server for some time.
+
+        Parameters
+        ----------
+        member: discord.Member
+            The member to ban from the server.
+        minutes: Optional[int]
+            The number of minutes for which the member should be banned.
+        hours: Optional[int]
+            The number of hours for which the member should be banned.
+        days: Optional[int]
+            The number of days for which the member should be banned.
+        delete_message_days: Optional[int]
+            The number of days of messages to delete sent by the member.
+        reason: Optional[str]
+            The reason for banning the member.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        duration = datetime.timedelta(
+            minutes=minutes or 0, hours=hours or 0, days=days or 0
+        )
+
+        if duration < datetime.timedelta(minutes=1) or duration.days > MAX_TEMP_DAYS:
+            return await ctx.edit_original_response(
+                content=f"The ban can last between 1 minute and {MAX_TEMP_DAYS} days only."
+            )
+
+        if not ctx.user == ctx.guild.owner and member.top_role > ctx.user.top_role:
+            return await ctx.edit_original_response(
+                content=f"You cannot ban **{member}**. "
+                f"Make sure you have a role higher than the member "
+                f"you are trying to ban."
+            )
+
+        try:
+            await member.ban(reason=reason, delete_message_days=delete_message_days)
+
+        except (discord.Forbidden, discord.errors.Forbidden):
+            return await ctx.edit_original_response(
+                content="I do not have permission to ban that user. "
+                "Please make sure I have a role higher than the member "
+                "you are trying to ban."
+            )
+
+        until = discord.utils.utcnow() + duration
+
+        # A new temporary ban replaces the one the member may already have.
+        await self.bot.timers.cancel(ctx.guild.id, "tempban", member.id)
+        await self.bot.timers.schedule(ctx.guild.id, "tempban", member.id, until)
+
+        await ctx.edit_original_response(
+            content=f"**{member}** has been banned from the server until "
+            f"{discord.utils.format_dt(until, 'f')}!"
+        )
+        await log_mod_action(
+            ctx=ctx,
+            member=member,
+            moderator=ctx.user,
+            action="Member Temporarily Banned",
+            description=f"Banned until {discord.utils.format_dt(until, 'f')}.",
+            reason=reason,
+            color="red",
+        )
+
+    @commands.Cog.listener()
+    async def on_tempban_timer_complete(self, timer: dict):
+        guild = self.bot.get_guild(timer["guild_id"])
+
+        if not guild:
+            return
+
+        try:
+            await guild.unban(
+                discord.Object(id=timer["target_id"]),
+                reason="Temporary ban expired.",
+            )
+
+        except (discord.Forbidden, discord.NotFound):
+            pass
+
+    def _mass_targets(
+        self,
+        ctx: discord.Interaction,
+        members: Optional[str],
+        joined_minutes: Optional[int],
+    ) -> tuple[list[int], dict[int, str]]:
+        user_ids = dict.fromkeys(
+            int(i) for i in SNOWFLAKE_REGEX.findall(members or "")
+        )
+
+        if joined_minutes:
+            cutoff = discord.utils.utcnow() - datetime.timedelta(
+                minutes=joined_minutes
+            )
+
+            for member in ctx.guild.members:
+                if member.joined_at and member.joined_at > cutoff:
+                    user_ids[member.id] = None
+
+        targets, skipped = [], {}
+
+        for user_id in user_ids:
+            member = ctx.guild.get_member(user_id)
+
+            if user_id in (ctx.user.id, self.bot.user.id, ctx.guild.owner_id):
+                skipped[user_id] = "cannot be targeted"
+
+            elif (
+                member
+                and not ctx.user == ctx.guild.owner
+                and member.top_role > ctx.user.top_role
+            ):
+                skipped[user_id] = "has a role higher than yours"
+
+            elif member and member.top_role >= ctx.guild.me.top_role:
+                skipped[user_id] = "has a role higher than mine"
+
+            else:
+                targets.append(user_id)
+
+        return targets, skipped
+
+    async def _mass_action(
+        self,
+        ctx: discord.Interaction,
+        members: Optional[str],
+        joined_minutes: Optional[int],
+        verb: str,
+        run: Callable[..., Awaitable[MassActionResult]],
+    ) -> Optional[MassActionResult]:
+        if not members and not joined_minutes:
+            await ctx.edit_original_response(
+                content="Please provide member IDs, a number of minutes, or both."
+            )
+            return None
+
+        if joined_minutes is not None and not 1 <= joined_minutes <= 1440:
+            await ctx.edit_original_response(
+                content="The number of minutes can be between 1 and 1440 only."
+            )
+            return None
+
+        targets, skipped = self._mass_targets(ctx, members, joined_minutes)
+
+        if len(targets) > MAX_MASS_TARGETS:
+            await ctx.edit_original_response(
+                content=f"At most {MAX_MASS_TARGETS} members can be {verb} at once; "
+                f"{len(targets)} were selected."
+            )
+            return None
+
+        async def progress(result: MassActionResult):
+            await ctx.edit_original_response(
+                content=f"**{len(result.done)}**/{result.total} members {verb}, "
+                f"{len(result.failed)} failed..."
+            )
+
+        result = await run(targets, progress=progress)
+        failed = skipped | result.failed
+
+        content = f"**{len(result.done)}** members have been {verb}."
+        attachments = []
+
+        if failed:
+            content += f"\n{len(failed)} could not be {verb}; see the attached list."
+            attachments.append(
+                discord.File(
+                    io.BytesIO(
+                        "\n".join(
+                            f"{user_id}: {why}" for user_id, why in failed.items()
+                        ).encode()
+                    ),
+                    filename="failed.txt",
+                )
+            )
+
+        await ctx.edit_original_response(content=content, attachments=attachments)
+
+        return result
+
+    async def _escalate(
+        self, ctx: discord.Interaction, member: discord.Member, rule: dict
+    ):
+        reason = f"Reached {rule['threshold']} warnings in {rule['days']} days."
+
+        try:
+            if rule["action"] == "timeout":
+                await member.timeout(
+                    datetime.timedelta(minutes=rule["duration"]), reason=reason
+                )
+                action, done = (
+                    "Member Muted",
+                    f"timed out for {rule['duration']} minutes",
+                )
+
+            elif rule["action"] == "kick":
+                await member.kick(reason=reason)
+                action, done = "Member Kicked", "kicked"
+
+            else:
+                await member.ban(reason=reason)
+                action, done = "Member Banned", "banned"
+
+        except (discord.Forbidden, discord.NotFound):
+            return await ctx.edit_original_response(
+                content=f"**{member}** has been warned! {reason} I could not "
+                f"{rule['action']} them, make sure my role is higher than theirs."
+            )
+
+        await ctx.edit_original_response(
+            content=f"**{member}** has been warned! {reason} They have been {done}."
+        )
+        await log_mod_action(
+            ctx=ctx,
+            member=member,
+            moderator=ctx.guild.me,
+            action=f"{action} (Escalation)",
+            reason=reason,
+            color="red",
+        )
+
+    @app_commands.command(name="massban")
+    @app_commands.check(ban_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.guild_only()
+    async def _massban(
+        self,
+        ctx: discord.Interaction,
+        members: Optional[str] = None,
+        joined_minutes: Optional[int] = None,
+        delete_message_days: Optional[int] = 0,
+        reason: Optional[str] = None,
+    ):
+        """Ban many members or users from the server at once.
+
+        Parameters
+        ----------
+        members: Optional[str]
+            The IDs of the users to ban, separated by spaces or commas.
+        joined_minutes: Optional[int]
+            Also ban every member who joined within this many minutes.
+        delete_message_days: Optional[int]
+            The number of days of messages to delete sent by the users (up to 7).
+        reason: Optional[str]
+            The reason for banning the users.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not 0 <= delete_message_days <= 7:
+            return await ctx.edit_original_response(
+                content="The number of days can be between 0 and 7 only."
+            )
+
+        async def run(targets: list[int], progress):
+            return await mass_ban(
+                ctx.guild,
+                targets,
+                reason=reason,
+                delete_message_seconds=delete_message_days * 86400,
+                progress=progress,
+            )
+
+        result = await self._mass_action(ctx, members, joined_minutes, "banned", run)
+
+        if result and result.done:
+            await log_mod_action(
+                ctx=ctx,
+                moderator=ctx.user,
+                action="Members Banned",
+                description=_mass_description(result.done),
+                reason=reason,
+                color="red",
+            )
+
+    @app_commands.command(name="masskick")
+    @app_commands.check(kick_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.guild_only()
+    async def _masskick(
+        self,
+        ctx: discord.Interaction,
+        members: Optional[str] = None,
+        joined_minutes: Optional[int] = None,
+        reason: Optional[str] = None,
+    ):
+        """Kick many members from the server at once.
+
+        Parameters
+        ----------
+        members: Optional[str]
+            The IDs of the members to kick, separated by spaces or commas.
+        joined_minutes: Optional[int]
+            Also kick every member who joined within this many minutes.
+        reason: Optional[str]
+            The reason for kicking the members.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        async def run(targets: list[int], progress):
+            return await mass_kick(
+                ctx.guild, targets, reason=reason, progress=progress
+            )
+
+        result = await self._mass_action(ctx, members, joined_minutes, "kicked", run)
+
+        if result and result.done:
+            await log_mod_action(
+                ctx=ctx,
+                moderator=ctx.user,
+                action="Members Kicked",
+                description=_mass_description(result.done),
+                reason=reason,
+                color="red",
+            )
+
+    @app_commands.command(name="lockdown")
+    @app_commands.check(lockdown_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.guild_only()
+    async def _lockdown(
+        self,
+        ctx: discord.Interaction,
+        category: Optional[discord.CategoryChannel] = None,
+        reason: Optional[str] = None,
+    ):
+        """Stop everyone from sending messages in every text channel.
+
+        Parameters
+        ----------
+        category: Optional[discord.CategoryChannel]
+            Lock only the text channels in this category.
+        reason: Optional[str]
+            The reason for the lockdown.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        channels = category.text_channels if category else ctx.guild.text_channels
+
+        async def progress(result: MassActionResult):
+            await ctx.edit_original_response(
+                content=f"**{len(result.done)}**/{result.total} channels locked, "
+                f"{len(result.failed)} failed..."
+            )
+
+        result = await lock(
+            self.bot.pool, ctx.guild, channels, reason=reason, progress=progress
+        )
+
+        if not result.total:
+            return await ctx.edit_original_response(
+                content="Every channel is already locked."
+            )
+
+        content = f"**{len(result.done)}** channels have been locked."
+
+        if result.failed:
+            content += f"\n{len(result.failed)} could not be locked: " + ", ".join(
+                f"<#{channel_id}>" for channel_id in list(result.failed)[:20]
+            )
+
+        await ctx.edit_original_response(content=content)
+        await log_mod_action(
+            ctx=ctx,
+            moderator=ctx.user,
+            action="Server Locked",
+            description=f"{len(result.done)} channels"
+            + (f" in {category.mention}" if category else "")
+            + " locked.",
+            reason=reason,
+            color="red",
+        )
+
+    @app_commands.command(name="unlock")
+    @app_commands.check(lockdown_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.guild_only()
+    async def _unlock(
+        self,
+        ctx: discord.Interaction,
+        category: Optional[discord.CategoryChannel] = None,
+        reason: Optional[str] = None,
+    ):
+        """Restore the permissions of the channels locked by the lockdown.
+
+        Parameters
+        ----------
+        category: Optional[discord.CategoryChannel]
+            Unlock only the channels in this category.
+        reason: Optional[str]
+            The reason for lifting the lockdown.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        async def progress(result: MassActionResult):
+            await ctx.edit_original_response(
+                content=f"**{len(result.done)}**/{result.total} channels unlocked, "
+                f"{len(result.failed)} failed..."
+            )
+
+        result = await unlock(
+            self.bot.pool, ctx.guild, category, reason=reason, progress=progress
+        )
+
+        if not result.total:
+            return await ctx.edit_original_response(
+                content="There are no locked channels."
+            )
+
+        content = f"**{len(result.done)}** channels have been unlocked."
+
+        if result.failed:
+            content += f"\n{len(result.failed)} could not be unlocked: " + ", ".join(
+                f"<#{channel_id}>" for channel_id in list(result.failed)[:20]
+            )
+
+        await ctx.edit_original_response(content=content)
+        await log_mod_action(
+            ctx=ctx,
+            moderator=ctx.user,
+            action="Server Unlocked",
+            description=f"{len(result.done)} channels"
+            + (f" in {category.mention}" if category else "")
+            + " unlocked.",
+            reason=reason,
+            color="green",
+        )
+
     @app_commands.command(name="unban")
     @app_commands.check(ban_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
@@ -147,7 +634,7 @@ class Moderation(commands.Cog):
         Parameters
         ----------
         member: str
-            The name of the member to unban.
+            The name or ID of the member to unban.
         reason: Optional[str]
             The reason for unbanning the member.
 
@@ -156,58 +643,83 @@ class Moderation(commands.Cog):
         # noinspection PyUnresolvedReferences
         await ctx.response.defer(thinking=True)
 
-        try:
-            member = int(member)
+        member = member.strip()
 
-        except ValueError:
-            pass
+        if member.isdigit():
+            try:
+                ban_entry = await ctx.guild.fetch_ban(discord.Object(id=int(member)))
+
+            except discord.NotFound:
+                return await ctx.edit_original_response(
+                    content="No such banned user found."
+                )
 
-        async for ban_entry in ctx.guild.bans():
             user = ban_entry.user
 
-            if isinstance(member, str):
-                if user.name == member:
-                    await ctx.guild.unban(user, reason=reason)
-
-                    await ctx.edit_original_response(
-                        content=f"**{member}** has been unbanned!"
-                    )
-
-                    return await log_mod_action(
-                        ctx=ctx,
-                        member=user,
-                        moderator=ctx.user,
-                        action="Member Unbanned",
-                        reason=reason,
-                    )
-
-            elif isinstance(member, int):
-                try:
-                    member = await self.bot.fetch_user(member)
-
-                except discord.errors.NotFound:
-                    break
-
-                if user == member:
-                    await ctx.guild.unban(user, reason=reason)
-
-                    await ctx.edit_original_response(
-                        content=f"**{member}** has been unbanned!"
-                    )
-                    return await log_mod_action(
-                        ctx=ctx,
-                        member=user,
-                        moderator=ctx.user,
-                        action="Member Unbanned",
-                        reason=reason,
-                        color="green",
-                    )
+        else:
+            matches = await self._bans.find(ctx.guild, member)
 
-            else:
-                continue
+            if not matches:
+                return await ctx.edit_original_response(
+                    content="No such banned user found."
+                )
 
-        else:
-            await ctx.edit_original_response(content="No such banned user found.")
+            if len(matches) > 1:
+                return await ctx.edit_original_response(
+                    content=f"Several banned users are named **{member}**; "
+                    f"please use one of their IDs: "
+                    f"{', '.join(str(user_id) for user_id, _ in matches[:10])}."
+                )
+
+            user_id, name = matches[0]
+            user = discord.Object(id=user_id)
+
+        try:
+            await ctx.guild.unban(user, reason=reason)
+
+        except discord.NotFound:
+            return await ctx.edit_original_response(
+                content="No such banned user found."
+            )
+
+        self._bans.remove(ctx.guild.id, user.id)
+
+        if isinstance(user, discord.Object):
+            user = await self.bot.fetch_user(user.id)
+
+        await ctx.edit_original_response(content=f"**{user}** has been unbanned!")
+
+        await log_mod_action(
+            ctx=ctx,
+            member=user,
+            moderator=ctx.user,
+            action="Member Unbanned",
+            reason=reason,
+            color="green",
+        )
+
+    @_unban.autocomplete("member")
+    async def _unban_autocomplete(
+        self, ctx: discord.Interaction, current: str
+    ) -> list[app_commands.Choice[str]]:
+        # Choosing a suggestion submits the ID, which skips the name lookup.
+        return [
+            app_commands.Choice(name=f"{name} ({user_id})"[:100], value=str(user_id))
+            for user_id, name in self._bans.search(ctx.guild, current)
+        ]
+
+    @commands.Cog.listener()
+    async def on_member_ban(
+        self, guild: discord.Guild, user: Union[discord.User, discord.Member]
+    ):
+        self._bans.add(guild.id, user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild: discord.Guild, user: discord.User):
+        self._bans.remove(guild.id, user.id)
+
+        # However the ban was lifted, its timer has nothing left to do.
+        await self.bot.timers.cancel(guild.id, "tempban", user.id)
 
     @app_commands.command(name="mute")
     @app_commands.check(mute_perms_check)
@@ -247,11 +759,29 @@ class Moderation(commands.Cog):
                 f"higher than the person you are trying to timeout."
             )
 
-        await member.timeout(
-            datetime.timedelta(minutes=minutes, hours=hours, days=days),
-            reason=reason,
+        duration = datetime.timedelta(
+            minutes=minutes or 0, hours=hours or 0, days=days or 0
         )
 
+        if duration < datetime.timedelta(minutes=1) or duration.days > MAX_TEMP_DAYS:
+            return await ctx.edit_original_response(
+                content=f"The timeout can last between 1 minute and "
+                f"{MAX_TEMP_DAYS} days only."
+            )
+
+        await member.timeout(min(duration, MAX_TIMEOUT), reason=reason)
+        await self.bot.timers.cancel(ctx.guild.id, "mute", member.id)
+
+        if duration > MAX_TIMEOUT:
+            until = discord.utils.utcnow() + duration
+            await self.bot.timers.schedule(
+                ctx.guild.id,
+                "mute",
+                member.id,
+                discord.utils.utcnow() + MAX_TIMEOUT - RENEW_MARGIN,
+                data={"until": until.timestamp()},
+            )
+
         await ctx.edit_original_response(
             content=f"**{member}** has been timed out in the server!"
         )
@@ -264,6 +794,41 @@ class Moderation(commands.Cog):
             color="red",
         )
 
+    @commands.Cog.listener()
+    async def on_mute_timer_complete(self, timer: dict):
+        guild = self.bot.get_guild(timer["guild_id"])
+
+        if not guild:
+            return
+
+        until = datetime.datetime.fromtimestamp(
+            timer["data"]["until"], tz=datetime.timezone.utc
+        )
+        remaining = until - discord.utils.utcnow()
+
+        if remaining <= datetime.timedelta(0):
+            return
+
+        try:
+            member = guild.get_member(
+                timer["target_id"]
+            ) or await guild.fetch_member(timer["target_id"])
+            await member.timeout(
+                min(remaining, MAX_TIMEOUT), reason="Long timeout renewed."
+            )
+
+        except (discord.Forbidden, discord.NotFound):
+            return
+
+        if remaining > MAX_TIMEOUT:
+            await self.bot.timers.schedule(
+                guild.id,
+                "mute",
+                member.id,
+                discord.utils.utcnow() + MAX_TIMEOUT - RENEW_MARGIN,
+                data=timer["data"],
+            )
+
     @app_commands.command(name="unmute")
     @app_commands.check(mute_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
@@ -288,6 +853,7 @@ class Moderation(commands.Cog):
         await ctx.response.defer(thinking=True)
 
         await member.timeout(None, reason=reason)
+        await self.bot.timers.cancel(ctx.guild.id, "mute", member.id)
 
         await ctx.edit_original_response(
             content=f"**{member}** has been unmuted in the server!"
@@ -310,9 +876,11 @@ class Moderation(commands.Cog):
         ctx: discord.Interaction,
         member: discord.Member,
         channel: Optional[discord.TextChannel] = None,
+        category: Optional[discord.CategoryChannel] = None,
+        everywhere: Optional[bool] = False,
         reason: Optional[str] = None,
     ):
-        """Mute a member in a channel.
+        """Mute a member in a channel, a category or the whole server.
 
         Parameters
         ----------
@@ -320,6 +888,10 @@ class Moderation(commands.Cog):
             The member to mute in the channel.
         channel: Optional[discord.TextChannel]
             The channel to mute the member in. If not provided, the current channel is used.
+        category: Optional[discord.CategoryChannel]
+            Mute the member in every channel of this category instead.
+        everywhere: Optional[bool]
+            Mute the member in every channel of the server instead.
         reason: Optional[str]
             The reason for muting the member.
 
@@ -334,6 +906,9 @@ class Moderation(commands.Cog):
                 f"you are trying to mute."
             )
 
+        if category or everywhere:
+            return await self._channel_mute_many(ctx, member, category, reason)
+
         channel = channel or ctx.channel
 
         if not channel.permissions_for(member).send_messages:
@@ -365,6 +940,104 @@ class Moderation(commands.Cog):
             color="red",
         )
 
+    async def _channel_mute_many(
+        self,
+        ctx: discord.Interaction,
+        member: discord.Member,
+        category: Optional[discord.CategoryChannel],
+        reason: Optional[str],
+    ):
+        if member.guild_permissions.administrator:
+            return await ctx.edit_original_response(
+                content=f"**{member}** is an administrator and cannot be muted "
+                f"in channels."
+            )
+
+        channels = [
+            channel
+            for channel in (category.channels if category else ctx.guild.channels)
+            if not isinstance(channel, discord.CategoryChannel)
+        ]
+
+        async def progress(result: MassActionResult):
+            await ctx.edit_original_response(
+                content=f"Muted in **{len(result.done)}**/{result.total} channels, "
+                f"{len(result.failed)} failed..."
+            )
+
+        result = await mute_member(
+            self.bot.pool, member, channels, reason=reason, progress=progress
+        )
+
+        if not result.total:
+            return await ctx.edit_original_response(
+                content=f"**{member}** already cannot speak in any of those channels."
+            )
+
+        content = f"**{member}** has been muted in {len(result.done)} channels!"
+
+        if result.failed:
+            content += f"\n{len(result.failed)} could not be changed: " + ", ".join(
+                f"<#{channel_id}>" for channel_id in list(result.failed)[:20]
+            )
+
+        await ctx.edit_original_response(content=content)
+
+        if result.done:
+            await log_mod_action(
+                ctx=ctx,
+                member=member,
+                moderator=ctx.user,
+                action="Member Channel Muted",
+                description=f"Muted in {len(result.done)} channels"
+                + (f" in {category.mention}" if category else "")
+                + ".",
+                reason=reason,
+                color="red",
+            )
+
+    async def _channel_unmute_many(
+        self,
+        ctx: discord.Interaction,
+        member: discord.Member,
+        category: Optional[discord.CategoryChannel],
+        reason: Optional[str],
+    ):
+        async def progress(result: MassActionResult):
+            await ctx.edit_original_response(
+                content=f"Unmuted in **{len(result.done)}**/{result.total} channels, "
+                f"{len(result.failed)} failed..."
+            )
+
+        result = await unmute_member(
+            self.bot.pool, member, category, reason=reason, progress=progress
+        )
+
+        if not result.total:
+            return await ctx.edit_original_response(
+                content=f"**{member}** is not muted in any channel by a wider mute."
+            )
+
+        content = f"**{member}** has been unmuted in {len(result.done)} channels!"
+
+        if result.failed:
+            content += f"\n{len(result.failed)} could not be changed: " + ", ".join(
+                f"<#{channel_id}>" for channel_id in list(result.failed)[:20]
+            )
+
+        await ctx.edit_original_response(content=content)
+        await log_mod_action(
+            ctx=ctx,
+            member=member,
+            moderator=ctx.user,
+            action="Member Channel Unmuted",
+            description=f"Unmuted in {len(result.done)} channels"
+            + (f" in {category.mention}" if category else "")
+            + ".",
+            reason=reason,
+            color="green",
+        )
+
     @app_commands.command(name="channelunmute")
     @app_commands.check(channel_mute_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
@@ -374,9 +1047,11 @@ class Moderation(commands.Cog):
         ctx: discord.Interaction,
         member: discord.Member,
         channel: Optional[discord.TextChannel],
+        category: Optional[discord.CategoryChannel] = None,
+        everywhere: Optional[bool] = False,
         reason: Optional[str] = None,
     ):
-        """Unmute a member in a channel.
+        """Unmute a member in a channel, or undo a category or server-wide mute.
 
         Parameters
         ----------
@@ -384,6 +1059,10 @@ class Moderation(commands.Cog):
             The member to unmute in the channel.
         channel: Optional[discord.TextChannel]
             The channel to unmute the member in. If not provided, the current channel is used.
+        category: Optional[discord.CategoryChannel]
+            Undo the mute in the channels of this category instead.
+        everywhere: Optional[bool]
+            Undo the mute in every channel of the server instead.
         reason: Optional[str]
             The reason for unmuting the member.
 
@@ -391,6 +1070,9 @@ class Moderation(commands.Cog):
         # noinspection PyUnresolvedReferences
         await ctx.response.defer(thinking=True)
 
+        if category or everywhere:
+            return await self._channel_unmute_many(ctx, member, category, reason)
+
         channel = channel or ctx.channel
 
         if channel.permissions_for(member).send_messages:
@@ -457,6 +1139,9 @@ class Moderation(commands.Cog):
         except (discord.errors.Forbidden, discord.Forbidden):
             pass
 
+        await self.bot.warns.add(ctx.guild.id, member.id, ctx.user.id, reason)
+        rule = await self.bot.warns.escalation(ctx.guild.id, member.id)
+
         await ctx.edit_original_response(content=f"**{member}** has been warned!")
         await log_mod_action(
             ctx=ctx,
@@ -467,51 +1152,127 @@ class Moderation(commands.Cog):
             color="red",
         )
 
+        if rule:
+            await self._escalate(ctx, member, rule)
+
     @app_commands.command(name="clear")
     @app_commands.check(clear_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
     @app_commands.guild_only()
-    async def _clear(self, ctx: discord.Interaction, amount: int):
+    async def _clear(
+        self,
+        ctx: discord.Interaction,
+        amount: int,
+        user: Optional[discord.User] = None,
+        bots: Optional[bool] = False,
+        attachments: Optional[bool] = False,
+        contains: Optional[str] = None,
+        regex: Optional[str] = None,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+    ):
         """Clear messages from the channel.
 
         Parameters
         ----------
         amount: int
-            The number of messages to clear from the channel (between 1 and 100).
+            The number of messages to clear from the channel (between 1 and 5000).
+        user: Optional[discord.User]
+            Only clear messages sent by this user.
+        bots: Optional[bool]
+            Only clear messages sent by bots.
+        attachments: Optional[bool]
+            Only clear messages with attachments.
+        contains: Optional[str]
+            Only clear messages containing this text.
+        regex: Optional[str]
+            Only clear messages matching this regular expression.
+        before: Optional[str]
+            Only clear messages sent before the message with this ID.
+        after: Optional[str]
+            Only clear messages sent after the message with this ID.
 
         """
         # noinspection PyUnresolvedReferences
         await ctx.response.defer(thinking=True)
 
-        if 1 <= amount <= 100:
-            try:
-                await ctx.delete_original_response()
-                await ctx.channel.purge(
-                    limit=amount,
-                    reason=f"{amount} messages cleared by {ctx.user.name}",
-                )
+        if not 1 <= amount <= MAX_CLEAR_AMOUNT:
+            return await ctx.edit_original_response(
+                content=f"The number of messages can be between 1 and {MAX_CLEAR_AMOUNT} only."
+            )
 
-            except (discord.Forbidden, discord.errors.Forbidden):
+        for message_id in (before, after):
+            if message_id and not message_id.isdigit():
                 return await ctx.edit_original_response(
-                    content="I do not have permission to delete messages in this channel."
+                    content="Please provide valid message IDs."
                 )
 
-            await ctx.channel.send(content="\U00002705", delete_after=5)
+        pattern = None
+
+        if regex:
+            error = validate_pattern(regex)
+
+            if error:
+                return await ctx.edit_original_response(content=error)
+
+            pattern = compile_pattern(regex)
+
+        if ctx.channel.id in self._purging:
+            return await ctx.edit_original_response(
+                content="Messages are already being cleared in this channel."
+            )
+
+        async def progress(result: PurgeResult):
+            await ctx.edit_original_response(
+                content=f"Clearing messages... **{result.deleted}** cleared, "
+                f"{result.scanned} checked."
+            )
+
+        purge = Purge(
+            ctx.channel,
+            amount,
+            build_check(user, bots, attachments, contains, pattern),
+            # The response itself and anything sent after the command stay.
+            before=discord.Object(id=int(before) if before else ctx.id),
+            after=discord.Object(id=int(after)) if after else None,
+            reason=f"Messages cleared by {ctx.user.name}",
+            progress=progress,
+        )
+
+        self._purging.add(ctx.channel.id)
+
+        try:
+            result = await purge.run()
+
+        except discord.Forbidden:
+            return await ctx.edit_original_response(
+                content="I do not have permission to delete messages in this channel."
+            )
+
+        finally:
+            self._purging.discard(ctx.channel.id)
+
+        content = f"\U00002705 Cleared **{result.deleted}** messages."
+
+        if not result.complete and result.cursor:
+            content += (
+                f"\nStopped after checking {result.scanned} messages; run the "
+                f"command again with `before: {result.cursor}` to continue."
+            )
+
+        await ctx.edit_original_response(content=content)
+
+        if result.deleted:
             await log_mod_action(
                 ctx=ctx,
                 moderator=ctx.user,
                 channel=ctx.channel,
                 action="Messages Cleared",
-                message_count=amount,
+                message_count=result.deleted,
                 color="red",
             )
 
-        else:
-            return await ctx.edit_original_response(
-                content=f"The number of messages can be between 1 and 100 only."
-            )
-
-    @app_commands.command(name="announce")
+    @app_commands.command(name="announce", extras={"auto_defer": False})
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
     @app_commands.guild_only()
     @app_commands.choices(
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.cd import cooldown_level_0
+from utils.db import update_raid_config
+from utils.checks import settings_perms_check
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+
+@app_commands.guild_only()
+class RaidProtection(
+    commands.GroupCog,
+    group_name="raid",
+    group_description="Commands to configure raid detection on member joins.",
+):
+    def __init__(self, bot: FumeGuard):
+        self.bot: FumeGuard = bot
+
+    @app_commands.command(name="set")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="None", value="none"),
+            app_commands.Choice(name="Kick new accounts", value="kick"),
+            app_commands.Choice(name="Timeout new accounts", value="timeout"),
+        ]
+    )
+    async def _raid_set(
+        self,
+        ctx: discord.Interaction,
+        joins: int,
+        seconds: int,
+        action: app_commands.Choice[str],
+        account_age: Optional[int] = 7,
+    ):
+        """Set how many joins within some seconds count as a raid.
+
+        Parameters
+        ----------
+        joins : int
+            The number of joins that starts raid mode.
+        seconds : int
+            The number of seconds within which the joins are counted.
+        action : app_commands.Choice[str]
+            What to do with new accounts joining during a raid.
+        account_age : Optional[int]
+            Accounts younger than this many days count as new.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if joins < 2 or joins > 500:
+            return await ctx.edit_original_response(
+                content="The number of joins can be between 2 and 500 only."
+            )
+
+        if seconds < 1 or seconds > 600:
+            return await ctx.edit_original_response(
+                content="The number of seconds can be between 1 and 600 only."
+            )
+
+        if account_age < 1 or account_age > 365:
+            return await ctx.edit_original_response(
+                content="The account age can be between 1 and 365 days only."
+            )
+
+        await update_raid_config(
+            self.bot.pool, ctx.guild.id, joins, seconds, action.value, account_age
+        )
+        self.bot.raids.invalidate(ctx.guild.id)
+
+        await ctx.edit_original_response(
+            content=f"Raid mode will start at {joins} joins within {seconds} seconds."
+        )
+
+    @app_commands.command(name="disable")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _raid_disable(self, ctx: discord.Interaction):
+        """Turn raid detection off."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        await update_raid_config(self.bot.pool, ctx.guild.id, 0, 0, "none", 0)
+        self.bot.raids.invalidate(ctx.guild.id)
+
+        await ctx.edit_original_response(content="Raid detection has been disabled.")
+
+    @app_commands.command(name="show")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _raid_show(self, ctx: discord.Interaction):
+        """Show the raid detection settings and whether a raid is going on."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        config = await self.bot.raids.get_config(ctx.guild.id)
+
+        if not config["joins"]:
+            content = "Raid detection is disabled."
+
+        else:
+            content = (
+                f"Raid mode starts at **{config['joins']}** joins within "
+                f"**{config['seconds']}** seconds."
+            )
+
+            if config["action"] != "none":
+                verb = "kicked" if config["action"] == "kick" else "timed out"
+                content += (
+                    f"\nAccounts younger than **{config['account_age']}** days "
+                    f"joining during a raid are {verb}."
+                )
+
+        raid = self.bot.raids.active(ctx.guild.id)
+
+        if raid:
+            content += (
+                f"\n\nA raid is going on since "
+                f"{discord.utils.format_dt(raid.started_at, 'R')}, "
+                f"with {raid.joins} joins so far."
+            )
+
+        await ctx.edit_original_response(content=content)
+
+    @app_commands.command(name="end")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _raid_end(self, ctx: discord.Interaction):
+        """End raid mode now and post its summary."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not await self.bot.raids.end(ctx.guild):
+            return await ctx.edit_original_response(
+                content="There is no raid going on."
+            )
+
+        await ctx.edit_original_response(content="Raid mode has been ended.")
+
+
+async def setup(bot: FumeGuard):
+    await bot.add_cog(RaidProtection(bot))
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Optional
 
+import datetime
+
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -15,6 +17,9 @@ if TYPE_CHECKING:
     from bot import FumeGuard
 
 
+MAX_TEMP_DAYS = 365
+
+
 @app_commands.guild_only()
 class Roles(
     commands.GroupCog,
@@ -24,7 +29,7 @@ class Roles(
     def __init__(self, bot: FumeGuard):
         self.bot: FumeGuard = bot
 
-    @app_commands.command(name="create")
+    @app_commands.command(name="create", extras={"auto_defer": False})
     @app_commands.check(roles_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
     @app_commands.choices(
@@ -178,6 +183,98 @@ class Roles(
             reason=reason,
         )
 
+    @app_commands.command(name="temp")
+    @app_commands.check(roles_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _role_temp(
+        self,
+        ctx: discord.Interaction,
+        member: discord.Member,
+        role: discord.Role,
+        minutes: Optional[int] = None,
+        hours: Optional[int] = None,
+        days: Optional[int] = None,
+        reason: Optional[str] = None,
+    ):
+        """Add a role to a member for some time.
+
+        Parameters
+        ----------
+        member : discord.Member
+            The member to add the role to.
+        role : discord.Role
+            The role to add to the member.
+        minutes : Optional[int]
+            The number of minutes for which the member should have the role.
+        hours : Optional[int]
+            The number of hours for which the member should have the role.
+        days : Optional[int]
+            The number of days for which the member should have the role.
+        reason : Optional[str]
+            The reason for adding the role.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        duration = datetime.timedelta(
+            minutes=minutes or 0, hours=hours or 0, days=days or 0
+        )
+
+        if duration < datetime.timedelta(minutes=1) or duration.days > MAX_TEMP_DAYS:
+            return await ctx.edit_original_response(
+                content=f"The role can last between 1 minute and {MAX_TEMP_DAYS} days only."
+            )
+
+        if role not in member.roles:
+            try:
+                await member.add_roles(role, reason=reason)
+
+            except (discord.errors.Forbidden, discord.Forbidden):
+                return await ctx.edit_original_response(
+                    content=f"I do not have permission to add {role.mention} to {member.mention}.",
+                    allowed_mentions=discord.AllowedMentions.none(),
+                )
+
+        until = discord.utils.utcnow() + duration
+        data = {"role_id": role.id}
+
+        await self.bot.timers.cancel(ctx.guild.id, "temprole", member.id, data)
+        await self.bot.timers.schedule(
+            ctx.guild.id, "temprole", member.id, until, data=data
+        )
+
+        await ctx.edit_original_response(
+            content=f"{member.mention} has the role {role.mention} until "
+            f"{discord.utils.format_dt(until, 'f')}.",
+            allowed_mentions=discord.AllowedMentions.none(),
+        )
+        await log_role_action(
+            ctx=ctx,
+            role=role,
+            moderator=ctx.user,
+            action="Temporary Role Added",
+            member=member,
+            reason=reason,
+        )
+
+    @commands.Cog.listener()
+    async def on_temprole_timer_complete(self, timer: dict):
+        guild = self.bot.get_guild(timer["guild_id"])
+        role = guild and guild.get_role(timer["data"]["role_id"])
+
+        if not role:
+            return
+
+        try:
+            member = guild.get_member(
+                timer["target_id"]
+            ) or await guild.fetch_member(timer["target_id"])
+            await member.remove_roles(role, reason="Temporary role expired.")
+
+        except (discord.Forbidden, discord.NotFound):
+            pass
+
     @app_commands.command(name="remove")
     @app_commands.check(roles_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_0)
@@ -224,6 +321,10 @@ class Roles(
                 allowed_mentions=discord.AllowedMentions.none(),
             )
 
+        await self.bot.timers.cancel(
+            ctx.guild.id, "temprole", member.id, {"role_id": role.id}
+        )
+
         await ctx.edit_original_response(
             content=f"{role.mention} has been removed from {member.mention}."
         )
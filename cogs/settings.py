@@ -9,15 +9,19 @@ from discord.ext import commands
 from utils.cd import cooldown_level_1
 from utils.db import (
     get_mod_log_channel,
+    get_welcome_channel,
     get_welcome_message,
     get_member_log_channel,
     update_mod_log_channel,
-    update_welcome_message,
+    update_welcome_channel,
+    get_message_log_channel,
     update_member_log_channel,
+    update_message_log_channel,
 )
 from utils.checks import settings_perms_check
 from utils.logger import log_mod_action
 from utils.modals import WelcomeMessageModal
+from utils.welcome import TemplateError
 
 if TYPE_CHECKING:
     from bot import FumeGuard
@@ -69,9 +73,11 @@ class Settings(
                     action="Logging Channel Disabled",
                     description="Moderation logging channel has been disabled.",
                     color="red",
+                    open_case=False,
                 )
 
                 await update_mod_log_channel(self.bot.pool, guild_id=ctx.guild.id)
+                self.bot.log_queue.invalidate(ctx.guild.id)
 
                 return await ctx.edit_original_response(
                     content="The moderation log channel for this server has been disabled."
@@ -86,6 +92,7 @@ class Settings(
                 await update_mod_log_channel(
                     self.bot.pool, guild_id=ctx.guild.id, channel_id=channel.id
                 )
+                self.bot.log_queue.invalidate(ctx.guild.id)
 
                 await ctx.edit_original_response(
                     content=f"The moderation log channel for this server has been set to {channel.mention}."
@@ -96,6 +103,7 @@ class Settings(
                     action="Logging Channel Updated",
                     description=f"Moderation logging channel updated to {channel.mention}.",
                     color="green",
+                    open_case=False,
                 )
 
     @app_commands.command(name="member_log")
@@ -132,6 +140,7 @@ class Settings(
         else:
             if not channel:
                 await update_member_log_channel(self.bot.pool, guild_id=ctx.guild.id)
+                self.bot.member_log.invalidate(ctx.guild.id)
 
                 await ctx.edit_original_response(
                     content="The member logging channel for this server has been disabled."
@@ -142,6 +151,7 @@ class Settings(
                     action="Logging Channel Disabled",
                     description="Member logging channel has been disabled.",
                     color="red",
+                    open_case=False,
                 )
 
             else:
@@ -153,6 +163,7 @@ class Settings(
                 await update_member_log_channel(
                     self.bot.pool, guild_id=ctx.guild.id, channel_id=channel.id
                 )
+                self.bot.member_log.invalidate(ctx.guild.id)
 
                 await ctx.edit_original_response(
                     content=f"The member logging channel for this server has been set to {channel.mention}."
@@ -163,11 +174,86 @@ class Settings(
                     action="Logging Channel Updated",
                     description=f"Member logging channel updated to {channel.mention}.",
                     color="green",
+                    open_case=False,
+                )
+
+    @app_commands.command(name="message_log")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_1)
+    async def _set_message_log(
+        self, ctx: discord.Interaction, channel: Optional[discord.TextChannel] = None
+    ):
+        """Set the deleted/edited message logging channel for the server.
+
+        Parameters
+        ----------
+        channel : Optional[discord.TextChannel]
+            The channel to set as the message logging channel. Leave blank to disable.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        message_log_channel = await get_message_log_channel(
+            self.bot.pool, ctx.guild.id
+        )
+
+        if not channel and not message_log_channel:
+            return await ctx.edit_original_response(
+                content="No message log channel is set for this server."
+            )
+
+        elif channel and message_log_channel == channel.id:
+            return await ctx.edit_original_response(
+                content=f"The message logging channel for this server is already set to {channel.mention}."
+            )
+
+        else:
+            if not channel:
+                await update_message_log_channel(
+                    self.bot.pool, guild_id=ctx.guild.id
+                )
+                self.bot.message_log.invalidate(ctx.guild.id)
+
+                await ctx.edit_original_response(
+                    content="The message logging channel for this server has been disabled."
+                )
+                return await log_mod_action(
+                    ctx=ctx,
+                    moderator=ctx.user,
+                    action="Logging Channel Disabled",
+                    description="Message logging channel has been disabled.",
+                    color="red",
+                    open_case=False,
+                )
+
+            else:
+                if not channel.permissions_for(ctx.guild.me).send_messages:
+                    return await ctx.edit_original_response(
+                        content=f"I do not have permissions to send messages in {channel.mention}."
+                    )
+
+                await update_message_log_channel(
+                    self.bot.pool, guild_id=ctx.guild.id, channel_id=channel.id
+                )
+                self.bot.message_log.invalidate(ctx.guild.id)
+
+                await ctx.edit_original_response(
+                    content=f"The message logging channel for this server has been set to {channel.mention}."
+                )
+                return await log_mod_action(
+                    ctx=ctx,
+                    moderator=ctx.user,
+                    action="Logging Channel Updated",
+                    description=f"Message logging channel updated to {channel.mention}.",
+                    color="green",
+                    open_case=False,
                 )
 
     @app_commands.command(
         name="welcome_message",
         description="Set the welcome message which will bd DMed to a member joining the server.",
+        extras={"auto_defer": False},
     )
     @app_commands.check(settings_perms_check)
     @app_commands.checks.dynamic_cooldown(cooldown_level_1)
@@ -195,7 +281,7 @@ class Settings(
 
         else:
             if not modal.message.value:
-                await update_welcome_message(self.bot.pool, guild_id=ctx.guild.id)
+                await self.bot.greeter.set_message(ctx.guild.id, None)
 
                 await ctx.edit_original_response(
                     content="The welcome message for this server has been disabled."
@@ -206,12 +292,17 @@ class Settings(
                     action="Welcome Message Disabled",
                     description="Welcome message has been disabled.",
                     color="red",
+                    open_case=False,
                 )
 
             else:
-                await update_welcome_message(
-                    self.bot.pool, guild_id=ctx.guild.id, message=modal.message.value
-                )
+                try:
+                    await self.bot.greeter.set_message(
+                        ctx.guild.id, modal.message.value
+                    )
+
+                except TemplateError as e:
+                    return await ctx.edit_original_response(content=str(e))
 
                 await ctx.edit_original_response(
                     content="The welcome message for this server has been set."
@@ -222,6 +313,76 @@ class Settings(
                     action="Welcome Message Updated",
                     description="Welcome message has been updated.",
                     color="green",
+                    open_case=False,
+                )
+
+    @app_commands.command(name="welcome_channel")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_1)
+    async def _set_welcome_channel(
+        self, ctx: discord.Interaction, channel: Optional[discord.TextChannel] = None
+    ):
+        """Set the channel where the welcome message greets new members.
+
+        Parameters
+        ----------
+        channel : Optional[discord.TextChannel]
+            The channel to greet new members in. Leave blank to only send DMs.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        welcome_channel = await get_welcome_channel(self.bot.pool, ctx.guild.id)
+
+        if not channel and not welcome_channel:
+            return await ctx.edit_original_response(
+                content="No welcome channel is set for this server."
+            )
+
+        elif channel and welcome_channel == channel.id:
+            return await ctx.edit_original_response(
+                content=f"The welcome channel for this server is already set to {channel.mention}."
+            )
+
+        else:
+            if not channel:
+                await update_welcome_channel(self.bot.pool, guild_id=ctx.guild.id)
+                self.bot.greeter.invalidate(ctx.guild.id)
+
+                await ctx.edit_original_response(
+                    content="The welcome channel for this server has been disabled."
+                )
+                return await log_mod_action(
+                    ctx=ctx,
+                    moderator=ctx.user,
+                    action="Welcome Channel Disabled",
+                    description="Welcome channel has been disabled.",
+                    color="red",
+                    open_case=False,
+                )
+
+            else:
+                if not channel.permissions_for(ctx.guild.me).send_messages:
+                    return await ctx.edit_original_response(
+                        content=f"I do not have permissions to send messages in {channel.mention}."
+                    )
+
+                await update_welcome_channel(
+                    self.bot.pool, guild_id=ctx.guild.id, channel_id=channel.id
+                )
+                self.bot.greeter.invalidate(ctx.guild.id)
+
+                await ctx.edit_original_response(
+                    content=f"The welcome channel for this server has been set to {channel.mention}."
+                )
+                return await log_mod_action(
+                    ctx=ctx,
+                    moderator=ctx.user,
+                    action="Welcome Channel Updated",
+                    description=f"Welcome channel updated to {channel.mention}.",
+                    color="green",
+                    open_case=False,
                 )
 
 
@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import datetime
+
+import discord
+from discord import app_commands
+from discord.ext import tasks, commands
+
+from utils.cd import cooldown_level_0
+from utils.warns import WARNING_LIFETIME_DAYS
+from utils.checks import warn_perms_check, settings_perms_check
+from utils.logger import log_mod_action
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+
+MAX_WARN_RULES = 10
+
+# Discord caps timeouts at 28 days.
+MAX_TIMEOUT_MINUTES = 40320
+
+
+def _describe(action: str, minutes: Optional[int]) -> str:
+    if action == "timeout":
+        return f"timed out for {minutes} minutes"
+
+    return "kicked" if action == "kick" else "banned"
+
+
+@app_commands.guild_only()
+class Warnings(
+    commands.GroupCog,
+    group_name="warnings",
+    group_description="Commands to view warnings and manage their escalation.",
+):
+    rules = app_commands.Group(
+        name="rules", description="Punish members who collect too many warnings."
+    )
+
+    def __init__(self, bot: FumeGuard):
+        self.bot: FumeGuard = bot
+
+    async def cog_load(self):
+        self._compact.start()
+
+    async def cog_unload(self):
+        self._compact.cancel()
+
+    @tasks.loop(hours=1)
+    async def _compact(self):
+        try:
+            removed = await self.bot.warns.compact()
+
+        except Exception as e:
+            return self.bot.log.error("Failed to compact warnings.", exc_info=e)
+
+        if removed:
+            self.bot.log.info(f"Removed {removed} expired warnings.")
+
+    @app_commands.command(name="list")
+    @app_commands.check(warn_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _warnings_list(self, ctx: discord.Interaction, member: discord.User):
+        """Shows the active warnings of a member.
+
+        Parameters
+        ----------
+        member : discord.User
+            The member whose warnings to show.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        warnings = await self.bot.warns.active(ctx.guild.id, member.id)
+
+        if not warnings:
+            return await ctx.edit_original_response(
+                content=f"**{member}** has no active warnings."
+            )
+
+        lines = []
+
+        for warning in reversed(warnings[-25:]):
+            created_at = warning["created_at"].replace(tzinfo=datetime.timezone.utc)
+            lines.append(
+                f"{discord.utils.format_dt(created_at, 'f')} by "
+                f"<@{warning['moderator_id']}>\n"
+                f"> {discord.utils.escape_markdown(warning['reason'] or 'Unspecified.')}"
+            )
+
+        embed = discord.Embed(
+            title=f"Warnings of {member}",
+            description="\n\n".join(lines),
+            color=self.bot.embed_color,
+        )
+        embed.set_footer(
+            text=f"{len(warnings)} warnings in the last {WARNING_LIFETIME_DAYS} days"
+        )
+
+        await ctx.edit_original_response(embed=embed)
+
+    @app_commands.command(name="clear")
+    @app_commands.check(warn_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _warnings_clear(
+        self,
+        ctx: discord.Interaction,
+        member: discord.User,
+        reason: Optional[str] = None,
+    ):
+        """Removes all warnings of a member.
+
+        Parameters
+        ----------
+        member : discord.User
+            The member whose warnings to remove.
+        reason : Optional[str]
+            The reason for removing the warnings.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        removed = await self.bot.warns.clear(ctx.guild.id, member.id)
+
+        if not removed:
+            return await ctx.edit_original_response(
+                content=f"**{member}** has no warnings."
+            )
+
+        await ctx.edit_original_response(
+            content=f"Removed {removed} warnings of **{member}**."
+        )
+        await log_mod_action(
+            ctx=ctx,
+            member=member,
+            moderator=ctx.user,
+            action="Warnings Cleared",
+            reason=reason,
+            color="green",
+        )
+
+    @rules.command(name="add")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="Timeout", value="timeout"),
+            app_commands.Choice(name="Kick", value="kick"),
+            app_commands.Choice(name="Ban", value="ban"),
+        ]
+    )
+    async def _warnings_rules_add(
+        self,
+        ctx: discord.Interaction,
+        warnings: int,
+        days: int,
+        action: app_commands.Choice[str],
+        minutes: Optional[int] = None,
+    ):
+        """Punish members who reach a number of warnings within some days.
+
+        Parameters
+        ----------
+        warnings : int
+            The number of warnings that triggers the rule.
+        days : int
+            The number of days within which the warnings are counted.
+        action : app_commands.Choice[str]
+            The punishment.
+        minutes : Optional[int]
+            The length of the timeout, for the timeout punishment.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if warnings < 1 or warnings > 100:
+            return await ctx.edit_original_response(
+                content="The number of warnings can be between 1 and 100 only."
+            )
+
+        if days < 1 or days > WARNING_LIFETIME_DAYS:
+            return await ctx.edit_original_response(
+                content=f"The number of days can be between 1 and "
+                f"{WARNING_LIFETIME_DAYS} only."
+            )
+
+        if action.value == "timeout":
+            if not minutes or minutes < 1 or minutes > MAX_TIMEOUT_MINUTES:
+                return await ctx.edit_original_response(
+                    content=f"The timeout can be between 1 and "
+                    f"{MAX_TIMEOUT_MINUTES} minutes only."
+                )
+
+        else:
+            minutes = None
+
+        rules = await self.bot.warns.rules(ctx.guild.id)
+
+        if len(rules) >= MAX_WARN_RULES and all(
+            rule["threshold"] != warnings for rule in rules
+        ):
+            return await ctx.edit_original_response(
+                content=f"The server can have up to {MAX_WARN_RULES} warning rules only."
+            )
+
+        await self.bot.warns.set_rule(
+            ctx.guild.id, warnings, days, action.value, minutes
+        )
+
+        await ctx.edit_original_response(
+            content=f"Members reaching {warnings} warnings within {days} days will "
+            f"now be {_describe(action.value, minutes)}."
+        )
+
+    @rules.command(name="remove")
+    @app_commands.check(settings_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _warnings_rules_remove(self, ctx: discord.Interaction, warnings: int):
+        """Remove a warning rule.
+
+        Parameters
+        ----------
+        warnings : int
+            The number of warnings of the rule to remove.
+
+        """
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        if not await self.bot.warns.remove_rule(ctx.guild.id, warnings):
+            return await ctx.edit_original_response(
+                content=f"There is no rule for {warnings} warnings."
+            )
+
+        await ctx.edit_original_response(
+            content=f"The rule for {warnings} warnings has been removed."
+        )
+
+    @rules.command(name="show")
+    @app_commands.check(warn_perms_check)
+    @app_commands.checks.dynamic_cooldown(cooldown_level_0)
+    async def _warnings_rules_show(self, ctx: discord.Interaction):
+        """Show the warning rules of the server."""
+        # noinspection PyUnresolvedReferences
+        await ctx.response.defer(thinking=True)
+
+        rules = await self.bot.warns.rules(ctx.guild.id)
+
+        if not rules:
+            return await ctx.edit_original_response(
+                content="The server has no warning rules."
+            )
+
+        await ctx.edit_original_response(
+            content="\n".join(
+                f"**{rule['threshold']}** warnings in **{rule['days']}** days: "
+                f"{_describe(rule['action'], rule['duration'])}"
+                for rule in rules
+            )
+        )
+
+
+async def setup(bot: FumeGuard):
+    await bot.add_cog(Warnings(bot))
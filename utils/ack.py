@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import time
+import asyncio
+import logging
+import statistics
+from collections import deque, defaultdict
+
+import discord
+
+# Discord drops interactions that are not acknowledged within 3 seconds, so
+# commands still busy with pre-work after this long are deferred on their behalf.
+ACK_BUDGET = 1.5
+
+log = logging.getLogger(__name__)
+
+
+class AckResponse(discord.InteractionResponse):
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False):
+        # The tracker already deferred on the command's behalf.
+        if self._parent.extras.get("auto_deferred"):
+            return None
+
+        self._parent.client.ack_tracker.acknowledged(self._parent)
+        return await super().defer(ephemeral=ephemeral, thinking=thinking)
+
+    async def send_message(self, *args: Any, **kwargs: Any):
+        self._parent.client.ack_tracker.acknowledged(self._parent)
+        return await super().send_message(*args, **kwargs)
+
+    async def send_modal(self, modal: discord.ui.Modal, /):
+        self._parent.client.ack_tracker.acknowledged(self._parent)
+        return await super().send_modal(modal)
+
+    async def auto_defer(self) -> None:
+        self._parent.extras["auto_deferred"] = True
+        self._parent.client.ack_tracker.acknowledged(self._parent, auto=True)
+
+        await super().defer(thinking=True)
+
+
+class AckInteraction(discord.Interaction):
+    """An interaction whose response reports to the client's ``AckTracker``.
+
+    Adds no slots, so an interaction the library built can be switched to
+    it before its response is first used.
+    """
+
+    __slots__ = ()
+
+    @discord.utils.cached_slot_property("_cs_response")
+    def response(self) -> AckResponse:
+        return AckResponse(self)
+
+
+class AckTracker:
+    def __init__(self, budget: float = ACK_BUDGET, samples: int = 256):
+        self.budget = budget
+
+        self._samples: defaultdict[str, deque[float]] = defaultdict(
+            lambda: deque(maxlen=samples)
+        )
+        self._auto_deferred: defaultdict[str, int] = defaultdict(int)
+        self._tasks: set[asyncio.Task] = set()
+
+    def arm(self, interaction: discord.Interaction) -> None:
+        """Start the budget of an application command interaction; called as
+        soon as the gateway event is parsed."""
+        interaction.extras["received_at"] = time.perf_counter()
+        interaction.__class__ = AckInteraction
+
+        command = interaction.command
+
+        # Commands that answer with a modal or a direct message cannot be deferred.
+        if command is not None and not command.extras.get("auto_defer", True):
+            return
+
+        interaction.extras["ack_timer"] = asyncio.get_running_loop().call_later(
+            self.budget, self._expire, interaction
+        )
+
+    def acknowledged(
+        self, interaction: discord.Interaction, auto: bool = False
+    ) -> None:
+        received_at: Optional[float] = interaction.extras.pop("received_at", None)
+
+        if received_at is None:
+            return
+
+        timer = interaction.extras.pop("ack_timer", None)
+
+        if timer:
+            timer.cancel()
+
+        name = self._command_name(interaction)
+        elapsed = time.perf_counter() - received_at
+
+        self._samples[name].append(elapsed)
+
+        if auto:
+            self._auto_deferred[name] += 1
+
+        elif elapsed > self.budget:
+            log.warning(
+                f"Interaction for /{name} acknowledged after {elapsed * 1000:.0f} ms."
+            )
+
+    def _expire(self, interaction: discord.Interaction) -> None:
+        interaction.extras.pop("ack_timer", None)
+
+        if interaction.response.is_done():
+            return
+
+        task = asyncio.create_task(self._auto_defer(interaction))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _auto_defer(self, interaction: discord.Interaction) -> None:
+        try:
+            # noinspection PyUnresolvedReferences
+            await interaction.response.auto_defer()
+
+        except (discord.HTTPException, discord.InteractionResponded) as e:
+            log.warning(
+                f"Could not auto-defer /{self._command_name(interaction)}.",
+                exc_info=e,
+            )
+
+    def stats(self) -> list[tuple[str, int, float, float, float, int]]:
+        rows = []
+
+        for name, samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+            rows.append(
+                (
+                    name,
+                    len(ordered),
+                    statistics.median(ordered),
+                    p95,
+                    ordered[-1],
+                    self._auto_deferred[name],
+                )
+            )
+
+        return rows
+
+    @staticmethod
+    def _command_name(interaction: discord.Interaction) -> str:
+        command = interaction.command
+        return command.qualified_name if command else "unknown"
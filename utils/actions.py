@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import time
+import asyncio
+import logging
+import datetime
+from collections import Counter
+
+import discord
+
+BULK_DELETE_LIMIT = 100
+NOTICE_MENTION_LIMIT = 50
+
+log = logging.getLogger(__name__)
+
+
+class _ChannelQueue:
+    __slots__ = ("channel", "messages", "notices", "task")
+
+    def __init__(self, channel: Any):
+        self.channel = channel
+        self.messages: dict[int, None] = {}
+        # notice text -> ids of the members to mention in it
+        self.notices: dict[str, dict[int, None]] = {}
+        self.task: Optional[asyncio.Task] = None
+
+
+class ActionExecutor:
+    """Buffers automod deletions and notices per channel.
+
+    Deletions are held for ``delay`` seconds and then issued as bulk deletes
+    of up to 100 messages, followed by one notice per distinct text that
+    mentions every member it applies to. A member is noticed at most once
+    per ``notice_cooldown`` seconds in a channel. Each channel is drained by
+    a single task, so its delete and send routes never see concurrent
+    requests from automod, and anything queued while a batch is in flight
+    goes out in the next one.
+    """
+
+    def __init__(self, delay: float = 1.0, notice_cooldown: float = 30.0):
+        self.delay = delay
+        self.notice_cooldown = notice_cooldown
+
+        self._queues: dict[int, _ChannelQueue] = {}
+        self._noticed: dict[tuple[int, int], float] = {}
+
+    def delete(self, channel: Any, message_id: int) -> None:
+        queue = self._queue(channel)
+        queue.messages[message_id] = None
+
+    def notify(self, channel: Any, member: discord.abc.User, notice: str) -> None:
+        key = (channel.id, member.id)
+        now = time.monotonic()
+
+        if self._noticed.get(key, 0.0) > now - self.notice_cooldown:
+            return
+
+        self._noticed[key] = now
+        self._queue(channel).notices.setdefault(notice, {})[member.id] = None
+
+    async def timeout(
+        self, member: discord.Member, minutes: int, reason: str
+    ) -> None:
+        # A member already timed out by an earlier message needs no new request.
+        if member.is_timed_out():
+            return
+
+        try:
+            await member.timeout(
+                datetime.timedelta(minutes=minutes),
+                reason=f"Automatic moderation: {reason}.",
+            )
+
+        except (discord.Forbidden, discord.NotFound):
+            pass
+
+    async def suppress(self, message: discord.Message) -> None:
+        try:
+            await message.edit(suppress=True)
+
+        except (discord.Forbidden, discord.NotFound):
+            pass
+
+    def close(self) -> None:
+        for queue in self._queues.values():
+            if queue.task:
+                queue.task.cancel()
+
+        self._queues.clear()
+
+    def _queue(self, channel: Any) -> _ChannelQueue:
+        queue = self._queues.get(channel.id)
+
+        if queue is None:
+            queue = self._queues[channel.id] = _ChannelQueue(channel)
+            queue.task = asyncio.create_task(self._drain(queue))
+
+        return queue
+
+    async def _drain(self, queue: _ChannelQueue) -> None:
+        try:
+            await asyncio.sleep(self.delay)
+
+            while queue.messages or queue.notices:
+                await self._flush(queue)
+
+        finally:
+            self._queues.pop(queue.channel.id, None)
+            self._prune_notices()
+
+    async def _flush(self, queue: _ChannelQueue) -> None:
+        channel = queue.channel
+
+        if queue.messages:
+            ids = list(queue.messages)[:BULK_DELETE_LIMIT]
+
+            for message_id in ids:
+                del queue.messages[message_id]
+
+            try:
+                await channel.delete_messages(
+                    [discord.Object(id=message_id) for message_id in ids],
+                    reason="Automatic moderation.",
+                )
+
+            except (discord.Forbidden, discord.NotFound):
+                pass
+
+            except discord.HTTPException as e:
+                log.warning(f"Failed to delete {len(ids)} messages.", exc_info=e)
+
+        # Send notices only once every pending deletion has gone out.
+        if queue.messages:
+            return
+
+        notices, queue.notices = queue.notices, {}
+
+        for notice, member_ids in notices.items():
+            member_ids = list(member_ids)
+
+            for i in range(0, len(member_ids), NOTICE_MENTION_LIMIT):
+                mentions = ", ".join(
+                    f"<@{member_id}>"
+                    for member_id in member_ids[i : i + NOTICE_MENTION_LIMIT]
+                )
+
+                try:
+                    await channel.send(
+                        f"{mentions}, {notice}",
+                        delete_after=10,
+                        allowed_mentions=discord.AllowedMentions(users=True),
+                    )
+
+                except (discord.Forbidden, discord.NotFound):
+                    pass
+
+    def _prune_notices(self) -> None:
+        cutoff = time.monotonic() - self.notice_cooldown
+
+        self._noticed = {
+            key: noticed
+            for key, noticed in self._noticed.items()
+            if noticed > cutoff
+        }
+
+
+class DryRunExecutor:
+    """Stands in for :class:`ActionExecutor` and only counts what it is asked
+    to do, so automod can be replayed over messages without touching them.
+
+    It applies the same rules as the real executor: a member is noticed at
+    most once per ``notice_cooldown`` in a channel, and a member still timed
+    out is not timed out again. Nothing really happens, so both are tracked
+    here against ``now``, the time of the message being replayed.
+    """
+
+    def __init__(self, notice_cooldown: float = 30.0):
+        self.notice_cooldown = notice_cooldown
+        self.now = 0.0
+
+        self.actions: Counter[str] = Counter()
+        self._noticed: dict[tuple[int, int], float] = {}
+        # member id -> when their timeout would end
+        self._timed_out: dict[int, float] = {}
+
+    def delete(self, channel: Any, message_id: int) -> None:
+        self.actions["delete"] += 1
+
+    def notify(self, channel: Any, member: discord.abc.User, notice: str) -> None:
+        key = (channel.id, member.id)
+
+        if self._noticed.get(key, float("-inf")) > self.now - self.notice_cooldown:
+            return
+
+        self._noticed[key] = self.now
+        self.actions["notice"] += 1
+
+    async def timeout(
+        self, member: discord.Member, minutes: int, reason: str
+    ) -> None:
+        if self._timed_out.get(member.id, float("-inf")) > self.now:
+            return
+
+        self._timed_out[member.id] = self.now + minutes * 60
+        self.actions["timeout"] += 1
+
+    async def suppress(self, message: discord.Message) -> None:
+        self.actions["suppress"] += 1
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import time
+import asyncio
+
+import discord
+
+
+class _GuildBans:
+    __slots__ = ("users", "names", "loaded_at")
+
+    def __init__(self):
+        # user id -> display name, and casefolded name -> user ids
+        self.users: dict[int, str] = {}
+        self.names: dict[str, set[int]] = {}
+        self.loaded_at = time.monotonic()
+
+    def add(self, user: discord.abc.User) -> None:
+        self.users[user.id] = str(user)
+
+        for name in {user.name.casefold(), str(user).casefold()}:
+            self.names.setdefault(name, set()).add(user.id)
+
+    def remove(self, user_id: int) -> None:
+        display = self.users.pop(user_id, None)
+
+        if display is None:
+            return
+
+        for name in {display.split("#", 1)[0].casefold(), display.casefold()}:
+            ids = self.names.get(name)
+
+            if ids:
+                ids.discard(user_id)
+
+                if not ids:
+                    del self.names[name]
+
+
+class BanIndex:
+    """Banned users of each guild, indexed by name.
+
+    A guild's index is built from its ban list the first time it is needed,
+    by a single task that concurrent callers share, and rebuilt once it is
+    older than ``ttl`` seconds. Ban and unban events keep a built index
+    current in between.
+    """
+
+    def __init__(self, ttl: float = 600.0):
+        self.ttl = ttl
+
+        self._guilds: dict[int, _GuildBans] = {}
+        self._builds: dict[int, asyncio.Task[_GuildBans]] = {}
+
+    def add(self, guild_id: int, user: discord.abc.User) -> None:
+        bans = self._guilds.get(guild_id)
+
+        if bans:
+            bans.add(user)
+
+    def remove(self, guild_id: int, user_id: int) -> None:
+        bans = self._guilds.get(guild_id)
+
+        if bans:
+            bans.remove(user_id)
+
+    def peek(self, guild: discord.Guild) -> Optional[_GuildBans]:
+        """Return the guild's index if it is fresh, else start building it."""
+        bans = self._guilds.get(guild.id)
+
+        if bans and time.monotonic() - bans.loaded_at < self.ttl:
+            return bans
+
+        self._build(guild)
+        return None
+
+    async def get(self, guild: discord.Guild) -> _GuildBans:
+        return self.peek(guild) or await self._build(guild)
+
+    async def find(self, guild: discord.Guild, name: str) -> list[tuple[int, str]]:
+        bans = await self.get(guild)
+        return sorted(
+            (user_id, bans.users[user_id])
+            for user_id in bans.names.get(name.casefold(), ())
+        )
+
+    def search(self, guild: discord.Guild, query: str, limit: int = 25):
+        """Return up to ``limit`` (user id, name) pairs whose name starts with
+        or contains ``query``, or nothing while the index is not built."""
+        bans = self.peek(guild)
+
+        if not bans:
+            return []
+
+        query = query.casefold()
+        prefixed, contained = [], []
+
+        for user_id, display in bans.users.items():
+            folded = display.casefold()
+
+            if folded.startswith(query):
+                prefixed.append((user_id, display))
+
+                if len(prefixed) >= limit:
+                    break
+
+            elif query in folded and len(contained) < limit:
+                contained.append((user_id, display))
+
+        return (prefixed + contained)[:limit]
+
+    def _build(self, guild: discord.Guild) -> asyncio.Task[_GuildBans]:
+        task = self._builds.get(guild.id)
+
+        if task is None:
+            task = asyncio.create_task(self._load(guild))
+            # Builds started by autocomplete are never awaited; their errors
+            # surface on the next command that needs the index instead.
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._builds[guild.id] = task
+
+        return task
+
+    async def _load(self, guild: discord.Guild) -> _GuildBans:
+        try:
+            bans = _GuildBans()
+
+            async for entry in guild.bans(limit=None):
+                bans.add(entry.user)
+
+            self._guilds[guild.id] = bans
+            self._prune()
+
+            return bans
+
+        finally:
+            self._builds.pop(guild.id, None)
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+
+        for guild_id in [
+            guild_id
+            for guild_id, bans in self._guilds.items()
+            if bans.loaded_at < cutoff
+        ]:
+            del self._guilds[guild_id]
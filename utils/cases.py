@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import asyncio
+import logging
+
+import discord
+
+from utils.db import (
+    get_case,
+    get_cases,
+    insert_cases,
+    get_case_number,
+    update_case_reason,
+    update_case_numbers,
+)
+
+if TYPE_CHECKING:
+    import aiomysql
+
+# create table cases (
+#     GUILD_ID bigint not null,
+#     CASE_ID int not null,
+#     ACTION varchar(64) not null,
+#     TARGET_ID bigint,
+#     MODERATOR_ID bigint not null,
+#     REASON varchar(1024),
+#     CREATED_AT datetime not null,
+#     primary key (GUILD_ID, CASE_ID),
+#     index (GUILD_ID, TARGET_ID),
+#     index (GUILD_ID, MODERATOR_ID, CREATED_AT)
+# );
+
+FLUSH_INTERVAL = 2.0
+FLUSH_SIZE = 100
+
+log = logging.getLogger(__name__)
+
+
+class CaseStore:
+    """Moderation cases, numbered in memory and written in batches.
+
+    Case numbers come from a per-guild counter seeded from ``CASE_NUMBER``
+    once, so opening a case never waits on the database after a guild's
+    first. New cases sit in a buffer that is written in one statement every
+    ``FLUSH_INTERVAL`` seconds, or as soon as ``FLUSH_SIZE`` are waiting,
+    and reads look at the buffer before the table. A failed write is kept
+    and retried with the next batch.
+    """
+
+    def __init__(self, pool: aiomysql.Pool):
+        self.pool = pool
+
+        self._next: dict[int, int] = {}
+        # (guild id, case id) -> case waiting to be written
+        self._pending: dict[tuple[int, int], dict] = {}
+
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+        await self.flush()
+
+    async def open(
+        self,
+        guild_id: int,
+        action: str,
+        moderator_id: int,
+        target_id: Optional[int] = None,
+        reason: Optional[str] = None,
+    ) -> int:
+        if guild_id not in self._next:
+            number = await get_case_number(self.pool, guild_id)
+            # Another case may have been opened while this one waited.
+            self._next.setdefault(guild_id, number)
+
+        case_id = self._next[guild_id]
+        self._next[guild_id] = case_id + 1
+
+        self._pending[(guild_id, case_id)] = {
+            "case_id": case_id,
+            "action": action,
+            "target_id": target_id,
+            "moderator_id": moderator_id,
+            "reason": reason,
+            "created_at": discord.utils.utcnow().replace(tzinfo=None, microsecond=0),
+        }
+
+        if len(self._pending) >= FLUSH_SIZE:
+            self._wake.set()
+
+        return case_id
+
+    async def get(self, guild_id: int, case_id: int) -> Optional[dict]:
+        case = self._pending.get((guild_id, case_id))
+        return case or await get_case(self.pool, guild_id, case_id)
+
+    async def history(
+        self,
+        guild_id: int,
+        target_id: Optional[int] = None,
+        moderator_id: Optional[int] = None,
+        before: Optional[tuple] = None,
+        limit: int = 10,
+    ) -> list[dict]:
+        """Return up to ``limit`` cases, newest first, older than ``before``,
+        a ``(created at, case id)`` pair taken from the last case of the
+        previous page."""
+        cases = await get_cases(
+            self.pool, guild_id, target_id, moderator_id, before, limit
+        )
+        seen = {case["case_id"] for case in cases}
+
+        for (_guild_id, case_id), case in list(self._pending.items()):
+            if (
+                _guild_id == guild_id
+                and case_id not in seen
+                and (target_id is None or case["target_id"] == target_id)
+                and (moderator_id is None or case["moderator_id"] == moderator_id)
+                and (before is None or case_id < before[1])
+            ):
+                cases.append(case)
+
+        cases.sort(key=lambda case: case["case_id"], reverse=True)
+        return cases[:limit]
+
+    async def edit_reason(
+        self, guild_id: int, case_id: int, reason: Optional[str]
+    ) -> bool:
+        key = (guild_id, case_id)
+        case = self._pending.get(key)
+
+        if case:
+            # A new dict, so a batch already being written keeps it pending.
+            self._pending[key] = dict(case, reason=reason)
+            return True
+
+        if not await get_case(self.pool, guild_id, case_id):
+            return False
+
+        await update_case_reason(self.pool, guild_id, case_id, reason)
+        return True
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        batch = list(self._pending.items())
+        numbers: dict[int, int] = {}
+
+        for (guild_id, case_id), _ in batch:
+            numbers[guild_id] = max(numbers.get(guild_id, 0), case_id + 1)
+
+        try:
+            await insert_cases(
+                self.pool, [(guild_id, case) for (guild_id, _), case in batch]
+            )
+            await update_case_numbers(self.pool, numbers)
+
+        except Exception as e:
+            log.error(f"Failed to write {len(batch)} cases.", exc_info=e)
+            return
+
+        for key, case in batch:
+            if self._pending.get(key) is case:
+                del self._pending[key]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), FLUSH_INTERVAL)
+
+            except asyncio.TimeoutError:
+                pass
+
+            self._wake.clear()
+            await self.flush()
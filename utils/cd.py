@@ -5,8 +5,6 @@ from typing import Optional
 import discord
 from discord import app_commands
 
-from utils.db import is_premium_user
-
 
 async def cooldown_level_0(
     ctx: discord.Interaction,
@@ -14,7 +12,7 @@ async def cooldown_level_0(
     if ctx.client.owner == ctx.user:
         return
 
-    elif await is_premium_user(ctx.client.pool, ctx.user.id):
+    elif ctx.user.id in ctx.client.premium_users:
         return app_commands.Cooldown(1, 2.0)
 
     else:
@@ -27,7 +25,7 @@ async def cooldown_level_1(
     if ctx.client.owner == ctx.user:
         return
 
-    elif await is_premium_user(ctx.client.pool, ctx.user.id):
+    elif ctx.user.id in ctx.client.premium_users:
         return app_commands.Cooldown(1, 60.0)
 
     else:
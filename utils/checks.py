@@ -145,3 +145,19 @@ def settings_perms_check(ctx: discord.Interaction) -> bool:
         )
 
     return True
+
+
+def lockdown_perms_check(ctx: discord.Interaction) -> bool:
+    if not ctx.guild.me.guild_permissions.manage_roles:
+        raise app_commands.CheckFailure(
+            "I need the **Manage Roles** permission in this server "
+            "to perform this action."
+        )
+
+    if not ctx.user.guild_permissions.manage_channels:
+        raise app_commands.CheckFailure(
+            "You need the **Manage Channels** permission in this server "
+            "to perform this action."
+        )
+
+    return True
@@ -93,6 +93,14 @@ async def is_premium_user(pool: aiomysql.Pool, user_id: int):
     return True
 
 
+async def get_premium_users(pool: aiomysql.Pool) -> set[int]:
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute("select USER_ID from users where PREMIUM = 1;")
+
+            return {row[0] for row in await cur.fetchall()}
+
+
 async def is_premium_guild(pool: aiomysql.Pool, user_id: int):
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -156,6 +164,30 @@ async def update_member_log_channel(
             )
 
 
+async def get_message_log_channel(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select MESSAGE_LOG_CHANNEL from guilds where GUILD_ID = %s;",
+                (guild_id,),
+            )
+
+            res = await cur.fetchone()
+
+    return None if not res else res[0]
+
+
+async def update_message_log_channel(
+    pool: aiomysql.Pool, guild_id: int, channel_id: Optional[int] = None
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "update guilds set MESSAGE_LOG_CHANNEL = %s where GUILD_ID = %s;",
+                (channel_id, guild_id),
+            )
+
+
 async def get_welcome_message(pool: aiomysql.Pool, guild_id: int):
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
@@ -180,26 +212,41 @@ async def update_welcome_message(
             )
 
 
-async def get_case_number(pool: aiomysql.Pool, guild_id: int):
+async def get_welcome_channel(pool: aiomysql.Pool, guild_id: int):
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
-                "select CASE_NUMBER from guilds where GUILD_ID = %s;", (guild_id,)
+                "select WELCOME_CHANNEL from guilds where GUILD_ID = %s;",
+                (guild_id,),
             )
 
             res = await cur.fetchone()
 
-    return 1 if not res[0] else res[0]
+    return None if not res else res[0]
+
+
+async def update_welcome_channel(
+    pool: aiomysql.Pool, guild_id: int, channel_id: Optional[int] = None
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "update guilds set WELCOME_CHANNEL = %s where GUILD_ID = %s;",
+                (channel_id, guild_id),
+            )
 
 
-async def increment_case_number(pool: aiomysql.Pool, guild_id: int):
+async def get_case_number(pool: aiomysql.Pool, guild_id: int):
     async with pool.acquire() as conn:
         async with conn.cursor() as cur:
             await cur.execute(
-                "update guilds set CASE_NUMBER = CASE_NUMBER + 1 where GUILD_ID = %s;",
-                (guild_id,),
+                "select CASE_NUMBER from guilds where GUILD_ID = %s;", (guild_id,)
             )
 
+            res = await cur.fetchone()
+
+    return 1 if not res[0] else res[0]
+
 
 async def is_afk(pool: aiomysql.Pool, user_id: int, guild_id: int):
     async with pool.acquire() as conn:
@@ -350,3 +397,672 @@ async def automod_update_allowed_embed_roles(
                 "update guilds set AUTOMOD_LINK_EMBED_ROLES = %s where GUILD_ID = %s;",
                 (allowed_role_ids, guild_id),
             )
+
+
+async def automod_get_config(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select AUTOMOD, AUTOMOD_LINK_SEND_ROLES, AUTOMOD_LINK_EMBED_ROLES, "
+                "AUTOMOD_FLOOD_MEMBER, AUTOMOD_FLOOD_CHANNEL, AUTOMOD_RAID_TEXT, "
+                "AUTOMOD_MENTIONS, AUTOMOD_CAPS, AUTOMOD_EMOJI, "
+                "AUTOMOD_BLOCKED_EXTENSIONS, AUTOMOD_MAX_ATTACHMENT_SIZE "
+                "from guilds where GUILD_ID = %s;",
+                (guild_id,),
+            )
+            res = await cur.fetchone()
+
+    if not res:
+        res = (0,) + (None,) * 10
+
+    return {
+        "enabled": True if res[0] else False,
+        "link_send_roles": res[1].split("|") if res[1] else [],
+        "link_embed_roles": res[2].split("|") if res[2] else [],
+        "flood_member": _parse_rule(res[3]),
+        "flood_channel": _parse_rule(res[4]),
+        "raid_text": _parse_rule(res[5]),
+        "mentions": _parse_rule(res[6]),
+        "caps": _parse_rule(res[7]),
+        "emoji": _parse_rule(res[8]),
+        "blocked_extensions": res[9].split("|") if res[9] else [],
+        "max_attachment_size": res[10] or None,
+    }
+
+
+def _parse_rule(value: Optional[str]):
+    if not value:
+        return None
+
+    limit, window, action, timeout = value.split("|")
+
+    return {
+        "limit": int(limit),
+        "window": int(window),
+        "action": action,
+        "timeout": int(timeout),
+    }
+
+
+async def automod_update_rule(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    name: str,
+    limit: Optional[int] = None,
+    window: Optional[int] = None,
+    action: Optional[str] = None,
+    timeout: Optional[int] = None,
+):
+    column = {
+        "flood_member": "AUTOMOD_FLOOD_MEMBER",
+        "flood_channel": "AUTOMOD_FLOOD_CHANNEL",
+        "raid_text": "AUTOMOD_RAID_TEXT",
+        "mentions": "AUTOMOD_MENTIONS",
+        "caps": "AUTOMOD_CAPS",
+        "emoji": "AUTOMOD_EMOJI",
+    }[name]
+    rule = f"{limit}|{window}|{action}|{timeout}" if limit else None
+
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                f"update guilds set {column} = %s where GUILD_ID = %s;",
+                (rule, guild_id),
+            )
+
+
+async def automod_update_blocked_extensions(
+    pool: aiomysql.Pool, guild_id: int, extensions: list[str]
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "update guilds set AUTOMOD_BLOCKED_EXTENSIONS = %s where GUILD_ID = %s;",
+                ("|".join(extensions) or None, guild_id),
+            )
+
+
+async def automod_update_max_attachment_size(
+    pool: aiomysql.Pool, guild_id: int, size: Optional[int] = None
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "update guilds set AUTOMOD_MAX_ATTACHMENT_SIZE = %s where GUILD_ID = %s;",
+                (size, guild_id),
+            )
+
+
+async def automod_get_domains(pool: aiomysql.Pool):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select GUILD_ID, DOMAIN, ALLOWED from automod_domains;"
+            )
+            res = await cur.fetchall()
+
+    return [(row[0], row[1], True if row[2] else False) for row in res]
+
+
+async def automod_set_domain(
+    pool: aiomysql.Pool, guild_id: int, domain: str, allowed: bool
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into automod_domains (GUILD_ID, DOMAIN, ALLOWED) values (%s, %s, %s) "
+                "on duplicate key update ALLOWED = values(ALLOWED);",
+                (guild_id, domain, allowed),
+            )
+
+
+async def automod_remove_domain(pool: aiomysql.Pool, guild_id: int, domain: str):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from automod_domains where GUILD_ID = %s and DOMAIN = %s;",
+                (guild_id, domain),
+            )
+
+
+async def automod_get_filters(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select PATTERN, IS_REGEX from automod_filters where GUILD_ID = %s;",
+                (guild_id,),
+            )
+            res = await cur.fetchall()
+
+    return [(row[0], True if row[1] else False) for row in res]
+
+
+async def automod_add_filter(
+    pool: aiomysql.Pool, guild_id: int, pattern: str, is_regex: bool = False
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into automod_filters (GUILD_ID, PATTERN, IS_REGEX) values (%s, %s, %s);",
+                (guild_id, pattern, is_regex),
+            )
+
+
+async def automod_remove_filter(pool: aiomysql.Pool, guild_id: int, pattern: str):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from automod_filters where GUILD_ID = %s and PATTERN = %s;",
+                (guild_id, pattern),
+            )
+
+
+async def automod_get_overrides(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select TARGET_ID, RULE, ENABLED from automod_overrides where GUILD_ID = %s;",
+                (guild_id,),
+            )
+            res = await cur.fetchall()
+
+    return [(row[0], row[1], True if row[2] else False) for row in res]
+
+
+async def automod_set_override(
+    pool: aiomysql.Pool, guild_id: int, target_id: int, rule: str, enabled: bool
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into automod_overrides (GUILD_ID, TARGET_ID, RULE, ENABLED) "
+                "values (%s, %s, %s, %s) on duplicate key update ENABLED = values(ENABLED);",
+                (guild_id, target_id, rule, enabled),
+            )
+
+
+async def automod_remove_overrides(
+    pool: aiomysql.Pool, guild_id: int, target_id: int, rule: Optional[str] = None
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            if rule:
+                await cur.execute(
+                    "delete from automod_overrides where GUILD_ID = %s and TARGET_ID = %s and RULE = %s;",
+                    (guild_id, target_id, rule),
+                )
+
+            else:
+                await cur.execute(
+                    "delete from automod_overrides where GUILD_ID = %s and TARGET_ID = %s;",
+                    (guild_id, target_id),
+                )
+
+
+def _case_from_row(row: tuple):
+    return {
+        "case_id": row[0],
+        "action": row[1],
+        "target_id": row[2],
+        "moderator_id": row[3],
+        "reason": row[4],
+        "created_at": row[5],
+    }
+
+
+async def insert_cases(pool: aiomysql.Pool, cases: list[tuple[int, dict]]):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.executemany(
+                "insert into cases (GUILD_ID, CASE_ID, ACTION, TARGET_ID, MODERATOR_ID, REASON, CREATED_AT) "
+                "values (%s, %s, %s, %s, %s, %s, %s) "
+                "on duplicate key update REASON = values(REASON);",
+                [
+                    (
+                        guild_id,
+                        case["case_id"],
+                        case["action"],
+                        case["target_id"],
+                        case["moderator_id"],
+                        case["reason"],
+                        case["created_at"],
+                    )
+                    for guild_id, case in cases
+                ],
+            )
+
+
+async def update_case_numbers(pool: aiomysql.Pool, numbers: dict[int, int]):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.executemany(
+                "update guilds set CASE_NUMBER = greatest(coalesce(CASE_NUMBER, 1), %s) "
+                "where GUILD_ID = %s;",
+                [(number, guild_id) for guild_id, number in numbers.items()],
+            )
+
+
+async def get_case(pool: aiomysql.Pool, guild_id: int, case_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select CASE_ID, ACTION, TARGET_ID, MODERATOR_ID, REASON, CREATED_AT "
+                "from cases where GUILD_ID = %s and CASE_ID = %s;",
+                (guild_id, case_id),
+            )
+            res = await cur.fetchone()
+
+    return _case_from_row(res) if res else None
+
+
+async def get_cases(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    target_id: Optional[int] = None,
+    moderator_id: Optional[int] = None,
+    before: Optional[tuple[datetime, int]] = None,
+    limit: int = 10,
+):
+    # Keyset pagination: each page starts below the last case of the one
+    # before it, so a page costs the same however deep it is. Case ids rise
+    # with time within a guild, so both orders agree.
+    if moderator_id is not None:
+        query = (
+            "select CASE_ID, ACTION, TARGET_ID, MODERATOR_ID, REASON, CREATED_AT "
+            "from cases where GUILD_ID = %s and MODERATOR_ID = %s"
+        )
+        args = [guild_id, moderator_id]
+
+        if target_id is not None:
+            query += " and TARGET_ID = %s"
+            args.append(target_id)
+
+        if before:
+            query += " and CREATED_AT <= %s and CASE_ID < %s"
+            args.extend(before)
+
+        query += " order by CREATED_AT desc, CASE_ID desc limit %s;"
+
+    else:
+        query = (
+            "select CASE_ID, ACTION, TARGET_ID, MODERATOR_ID, REASON, CREATED_AT "
+            "from cases where GUILD_ID = %s and TARGET_ID = %s"
+        )
+        args = [guild_id, target_id]
+
+        if before:
+            query += " and CASE_ID < %s"
+            args.append(before[1])
+
+        query += " order by CASE_ID desc limit %s;"
+
+    args.append(limit)
+
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query, args)
+            res = await cur.fetchall()
+
+    return [_case_from_row(row) for row in res]
+
+
+async def update_case_reason(
+    pool: aiomysql.Pool, guild_id: int, case_id: int, reason: Optional[str]
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "update cases set REASON = %s where GUILD_ID = %s and CASE_ID = %s;",
+                (reason, guild_id, case_id),
+            )
+
+
+async def insert_warning(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    user_id: int,
+    moderator_id: int,
+    reason: Optional[str],
+    created_at: datetime,
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into warnings (GUILD_ID, USER_ID, MODERATOR_ID, REASON, CREATED_AT) "
+                "values (%s, %s, %s, %s, %s);",
+                (guild_id, user_id, moderator_id, reason, created_at),
+            )
+
+
+async def get_warnings(
+    pool: aiomysql.Pool, guild_id: int, user_id: int, after: datetime
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select MODERATOR_ID, REASON, CREATED_AT from warnings "
+                "where GUILD_ID = %s and USER_ID = %s and CREATED_AT > %s "
+                "order by CREATED_AT;",
+                (guild_id, user_id, after),
+            )
+            res = await cur.fetchall()
+
+    return [
+        {"moderator_id": row[0], "reason": row[1], "created_at": row[2]}
+        for row in res
+    ]
+
+
+async def delete_warnings(pool: aiomysql.Pool, guild_id: int, user_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from warnings where GUILD_ID = %s and USER_ID = %s;",
+                (guild_id, user_id),
+            )
+            res = cur.rowcount
+
+    return res
+
+
+async def delete_expired_warnings(
+    pool: aiomysql.Pool, before: datetime, limit: int = 10000
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from warnings where CREATED_AT <= %s limit %s;",
+                (before, limit),
+            )
+            res = cur.rowcount
+
+    return res
+
+
+async def get_warn_rules(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select THRESHOLD, WINDOW_DAYS, ACTION, DURATION from warn_rules "
+                "where GUILD_ID = %s order by THRESHOLD;",
+                (guild_id,),
+            )
+            res = await cur.fetchall()
+
+    return [
+        {"threshold": row[0], "days": row[1], "action": row[2], "duration": row[3]}
+        for row in res
+    ]
+
+
+async def set_warn_rule(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    threshold: int,
+    days: int,
+    action: str,
+    duration: Optional[int] = None,
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into warn_rules (GUILD_ID, THRESHOLD, WINDOW_DAYS, ACTION, DURATION) "
+                "values (%s, %s, %s, %s, %s) on duplicate key update "
+                "WINDOW_DAYS = values(WINDOW_DAYS), ACTION = values(ACTION), "
+                "DURATION = values(DURATION);",
+                (guild_id, threshold, days, action, duration),
+            )
+
+
+async def remove_warn_rule(pool: aiomysql.Pool, guild_id: int, threshold: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from warn_rules where GUILD_ID = %s and THRESHOLD = %s;",
+                (guild_id, threshold),
+            )
+            res = cur.rowcount
+
+    return res
+
+
+def _timer_from_row(row: tuple):
+    return {
+        "id": row[0],
+        "guild_id": row[1],
+        "action": row[2],
+        "target_id": row[3],
+        "data": row[4],
+        "due_at": row[5],
+    }
+
+
+async def insert_timer(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    action: str,
+    target_id: int,
+    data: Optional[str],
+    due_at: datetime,
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into timers (GUILD_ID, ACTION, TARGET_ID, DATA, DUE_AT) "
+                "values (%s, %s, %s, %s, %s);",
+                (guild_id, action, target_id, data, due_at),
+            )
+            res = cur.lastrowid
+
+    return res
+
+
+async def get_timers(
+    pool: aiomysql.Pool,
+    after: Optional[datetime],
+    until: datetime,
+    shard_count: Optional[int] = None,
+    shard_ids: Optional[list[int]] = None,
+):
+    query = (
+        "select TIMER_ID, GUILD_ID, ACTION, TARGET_ID, DATA, DUE_AT from timers "
+        "where DUE_AT <= %s"
+    )
+    args = [until]
+
+    if after:
+        query += " and DUE_AT > %s"
+        args.append(after)
+
+    if shard_ids is not None:
+        # The shard of a guild, as Discord assigns it.
+        query += " and mod(GUILD_ID >> 22, %s) in %s"
+        args.extend((shard_count, shard_ids))
+
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(query + ";", args)
+            res = await cur.fetchall()
+
+    return [_timer_from_row(row) for row in res]
+
+
+async def get_guild_timers(
+    pool: aiomysql.Pool, guild_id: int, action: str, target_id: int
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select TIMER_ID, GUILD_ID, ACTION, TARGET_ID, DATA, DUE_AT from timers "
+                "where GUILD_ID = %s and ACTION = %s and TARGET_ID = %s;",
+                (guild_id, action, target_id),
+            )
+            res = await cur.fetchall()
+
+    return [_timer_from_row(row) for row in res]
+
+
+async def delete_timers(pool: aiomysql.Pool, timer_ids: list[int]):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from timers where TIMER_ID in %s;", (timer_ids,)
+            )
+
+
+async def get_lockdown(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select CHANNEL_ID, ALLOW, DENY from lockdowns where GUILD_ID = %s;",
+                (guild_id,),
+            )
+            res = await cur.fetchall()
+
+    return {row[0]: (row[1], row[2]) for row in res}
+
+
+async def insert_lockdown(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    overwrites: dict[int, tuple[Optional[int], Optional[int]]],
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            # An existing snapshot is kept, as it holds the unlocked state.
+            await cur.executemany(
+                "insert ignore into lockdowns (GUILD_ID, CHANNEL_ID, ALLOW, DENY) "
+                "values (%s, %s, %s, %s);",
+                [
+                    (guild_id, channel_id, allow, deny)
+                    for channel_id, (allow, deny) in overwrites.items()
+                ],
+            )
+
+
+async def delete_lockdown(
+    pool: aiomysql.Pool, guild_id: int, channel_ids: list[int]
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from lockdowns where GUILD_ID = %s and CHANNEL_ID in %s;",
+                (guild_id, channel_ids),
+            )
+
+
+async def get_channel_mutes(pool: aiomysql.Pool, guild_id: int, user_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select CHANNEL_ID, ALLOW, DENY from channel_mutes "
+                "where GUILD_ID = %s and USER_ID = %s;",
+                (guild_id, user_id),
+            )
+            res = await cur.fetchall()
+
+    return {row[0]: (row[1], row[2]) for row in res}
+
+
+async def insert_channel_mutes(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    user_id: int,
+    overwrites: dict[int, tuple[Optional[int], Optional[int]]],
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.executemany(
+                "insert ignore into channel_mutes (GUILD_ID, USER_ID, CHANNEL_ID, ALLOW, DENY) "
+                "values (%s, %s, %s, %s, %s);",
+                [
+                    (guild_id, user_id, channel_id, allow, deny)
+                    for channel_id, (allow, deny) in overwrites.items()
+                ],
+            )
+
+
+async def delete_channel_mutes(
+    pool: aiomysql.Pool, guild_id: int, user_id: int, channel_ids: list[int]
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from channel_mutes where GUILD_ID = %s and USER_ID = %s "
+                "and CHANNEL_ID in %s;",
+                (guild_id, user_id, channel_ids),
+            )
+
+
+async def get_raid_config(pool: aiomysql.Pool, guild_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select RAID_DETECTION from guilds where GUILD_ID = %s;", (guild_id,)
+            )
+            res = await cur.fetchone()
+
+    if not res or not res[0]:
+        return None
+
+    joins, seconds, action, account_age = res[0].split("|")
+
+    return {
+        "joins": int(joins),
+        "seconds": int(seconds),
+        "action": action,
+        "account_age": int(account_age),
+    }
+
+
+async def update_raid_config(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    joins: int,
+    seconds: int,
+    action: str,
+    account_age: int,
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "update guilds set RAID_DETECTION = %s where GUILD_ID = %s;",
+                (f"{joins}|{seconds}|{action}|{account_age}", guild_id),
+            )
+
+
+async def get_log_webhook(pool: aiomysql.Pool, channel_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "select WEBHOOK_ID, WEBHOOK_TOKEN from log_webhooks where CHANNEL_ID = %s;",
+                (channel_id,),
+            )
+            res = await cur.fetchone()
+
+    return (res[0], res[1]) if res else None
+
+
+async def set_log_webhook(
+    pool: aiomysql.Pool,
+    guild_id: int,
+    channel_id: int,
+    webhook_id: int,
+    webhook_token: str,
+):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "insert into log_webhooks (CHANNEL_ID, GUILD_ID, WEBHOOK_ID, WEBHOOK_TOKEN) "
+                "values (%s, %s, %s, %s) on duplicate key update "
+                "WEBHOOK_ID = values(WEBHOOK_ID), WEBHOOK_TOKEN = values(WEBHOOK_TOKEN);",
+                (channel_id, guild_id, webhook_id, webhook_token),
+            )
+
+
+async def delete_log_webhook(pool: aiomysql.Pool, channel_id: int):
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cur:
+            await cur.execute(
+                "delete from log_webhooks where CHANNEL_ID = %s;", (channel_id,)
+            )
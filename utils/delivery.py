@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import time
+import asyncio
+import logging
+
+import discord
+
+from utils.db import get_log_webhook, set_log_webhook, delete_log_webhook
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+# create table log_webhooks (
+#     CHANNEL_ID bigint not null primary key,
+#     GUILD_ID bigint not null,
+#     WEBHOOK_ID bigint not null,
+#     WEBHOOK_TOKEN varchar(128) not null,
+#     index (GUILD_ID)
+# );
+
+WEBHOOK_NAME = "FumeGuard Logs"
+
+# Discord's limits for a single message.
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+# A channel where creating a webhook was refused, for missing permissions or
+# the channel's webhook limit, is written to directly, and creation is tried
+# again after this long.
+REFUSED_TTL = 3600.0
+
+log = logging.getLogger(__name__)
+
+
+def _chunks(embeds: list[discord.Embed]) -> list[list[discord.Embed]]:
+    chunks, chunk, size = [], [], 0
+
+    for embed in embeds:
+        length = len(embed)
+
+        if chunk and (len(chunk) >= MAX_EMBEDS or size + length > MAX_EMBED_CHARS):
+            chunks.append(chunk)
+            chunk, size = [], 0
+
+        chunk.append(embed)
+        size += length
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+class LogDelivery:
+    """Sends log embeds through one webhook per log channel.
+
+    Webhook executions are limited per webhook rather than against the bot's
+    own budget, so busy logs leave the bot's rate limits to interactive
+    traffic. The webhook of a channel is created the first time it is
+    written to, saved in ``log_webhooks`` and cached. Where the bot may not
+    manage webhooks, logs are sent as the bot, as before.
+    """
+
+    def __init__(self, bot: FumeGuard):
+        self.bot = bot
+
+        self._webhooks: dict[int, discord.Webhook] = {}
+        # channel id -> when creating its webhook was refused
+        self._refused: dict[int, float] = {}
+        # One lookup or creation per channel, however many sends wait on it.
+        self._pending: dict[int, asyncio.Task] = {}
+
+    async def send(
+        self, channel: discord.abc.Messageable, embeds: list[discord.Embed]
+    ) -> None:
+        for chunk in _chunks(embeds):
+            await self._send(channel, chunk)
+
+    def invalidate(self, channel_id: int) -> None:
+        self._webhooks.pop(channel_id, None)
+        self._refused.pop(channel_id, None)
+
+    async def _send(
+        self, channel: discord.abc.Messageable, embeds: list[discord.Embed]
+    ) -> None:
+        # Once more with a new webhook if the cached one was deleted.
+        for _ in range(2):
+            webhook = await self._get_webhook(channel)
+
+            if webhook is None:
+                break
+
+            try:
+                await webhook.send(
+                    embeds=embeds,
+                    username=self.bot.user.name,
+                    avatar_url=self.bot.user.display_avatar.url,
+                )
+                return
+
+            except discord.NotFound:
+                self._webhooks.pop(channel.id, None)
+                await delete_log_webhook(self.bot.pool, channel.id)
+
+            except discord.Forbidden:
+                break
+
+        try:
+            await channel.send(embeds=embeds)
+
+        except (discord.Forbidden, discord.NotFound):
+            pass
+
+    async def _get_webhook(
+        self, channel: discord.abc.Messageable
+    ) -> Optional[discord.Webhook]:
+        webhook = self._webhooks.get(channel.id)
+
+        if webhook is not None:
+            return webhook
+
+        if not isinstance(channel, discord.TextChannel):
+            return None
+
+        refused_at = self._refused.get(channel.id)
+
+        if refused_at is not None:
+            if time.monotonic() - refused_at < REFUSED_TTL:
+                return None
+
+            del self._refused[channel.id]
+
+        task = self._pending.get(channel.id)
+
+        if task is None:
+            task = self._pending[channel.id] = asyncio.create_task(
+                self._load_webhook(channel)
+            )
+            task.add_done_callback(lambda _: self._pending.pop(channel.id, None))
+
+        try:
+            return await asyncio.shield(task)
+
+        except Exception as e:
+            log.error(f"Failed to get the log webhook of {channel.id}.", exc_info=e)
+            return None
+
+    async def _load_webhook(
+        self, channel: discord.TextChannel
+    ) -> Optional[discord.Webhook]:
+        row = await get_log_webhook(self.bot.pool, channel.id)
+
+        if row:
+            webhook_id, token = row
+
+        else:
+            try:
+                created = await channel.create_webhook(
+                    name=WEBHOOK_NAME, reason="Log delivery"
+                )
+
+            except discord.HTTPException as e:
+                if not isinstance(e, discord.Forbidden):
+                    log.warning(
+                        f"Could not create the log webhook of {channel.id}: {e}"
+                    )
+
+                self._refused[channel.id] = time.monotonic()
+                return None
+
+            webhook_id, token = created.id, created.token
+            await set_log_webhook(
+                self.bot.pool, channel.guild.id, channel.id, webhook_id, token
+            )
+
+        webhook = self._webhooks[channel.id] = discord.Webhook.partial(
+            id=webhook_id, token=token, session=self.bot.session
+        )
+
+        return webhook
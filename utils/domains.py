@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import re
+from enum import Enum
+from pathlib import Path
+
+# create table automod_domains (
+#     GUILD_ID bigint not null,
+#     DOMAIN varchar(253) not null,
+#     ALLOWED boolean not null,
+#     primary key (GUILD_ID, DOMAIN)
+# );
+
+PHISHING_DOMAINS_PATH = Path(__file__).resolve().parents[1] / "data" / "phishing.txt"
+
+# The top-level label has to be letters (or punycode), so numbers such as
+# "3.50" or "1.20" are not taken for hosts.
+HOST_REGEX = re.compile(
+    r"(?:[a-z][a-z0-9+.-]*://)?(?:[^\s/@]+@)?"
+    r"((?:[\w-]+\.)+(?:[^\W\d_]{2,}|xn--[a-z0-9-]+))(?![\w-])",
+    re.IGNORECASE,
+)
+
+
+class Verdict(Enum):
+    ALLOW = "allow"
+    DENY = "deny"
+    PHISHING = "phishing"
+
+
+def normalize_domain(value: str) -> Optional[str]:
+    value = value.strip().lower()
+    value = value.split("://", 1)[-1].split("/", 1)[0].split(":", 1)[0]
+    value = value.removeprefix("*.").strip(".")
+
+    if "." not in value:
+        return None
+
+    try:
+        return value.encode("idna").decode("ascii")
+
+    except UnicodeError:
+        return None
+
+
+def extract_hosts(content: str) -> set[str]:
+    hosts = set()
+
+    for match in HOST_REGEX.finditer(content):
+        host = normalize_domain(match.group(1))
+
+        if host:
+            hosts.add(host)
+
+    return hosts
+
+
+class DomainMatcher:
+    """Guild allow/deny lists and the global phishing list in one structure.
+
+    Entries are keyed by domain, and a lookup walks the host's label suffixes
+    from the most to the least specific (``a.b.example.com``, ``b.example.com``,
+    ``example.com``), so listing a domain covers all of its subdomains and a
+    lookup costs one dict access per label, regardless of list sizes. The most
+    specific listed suffix decides; on the same suffix a guild's own entry
+    overrides the phishing list. Every domain string is stored once, however
+    many guilds list it.
+    """
+
+    def __init__(self):
+        self._guilds: dict[str, dict[int, bool]] = {}
+        self._phishing: frozenset[str] = frozenset()
+
+    def __len__(self) -> int:
+        return len(self._guilds) + len(self._phishing)
+
+    def set(self, guild_id: int, domain: str, allowed: bool) -> None:
+        self._guilds.setdefault(domain, {})[guild_id] = allowed
+
+    def remove(self, guild_id: int, domain: str) -> None:
+        entries = self._guilds.get(domain)
+
+        if entries is None:
+            return
+
+        entries.pop(guild_id, None)
+
+        if not entries:
+            del self._guilds[domain]
+
+    def replace_phishing(self, domains: Iterable[str]) -> None:
+        # Swapped in one assignment so lookups never see a half-loaded list.
+        self._phishing = frozenset(domains)
+
+    def entries(self, guild_id: int) -> list[tuple[str, bool]]:
+        return sorted(
+            (domain, entries[guild_id])
+            for domain, entries in self._guilds.items()
+            if guild_id in entries
+        )
+
+    def match(self, host: str, guild_id: int) -> Optional[Verdict]:
+        guilds = self._guilds
+        phishing = self._phishing
+        suffix = host
+
+        while True:
+            entries = guilds.get(suffix)
+
+            if entries is not None:
+                allowed = entries.get(guild_id)
+
+                if allowed is not None:
+                    return Verdict.ALLOW if allowed else Verdict.DENY
+
+            if suffix in phishing:
+                return Verdict.PHISHING
+
+            dot = suffix.find(".")
+
+            if dot == -1:
+                return None
+
+            suffix = suffix[dot + 1 :]
+
+
+def load_domain_file(path: Path = PHISHING_DOMAINS_PATH) -> list[str]:
+    domains = []
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+
+            if not line.strip():
+                continue
+
+            domain = normalize_domain(line)
+
+            if domain:
+                domains.append(domain)
+
+    return domains
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import re
+
+import discord
+
+from utils.domains import HOST_REGEX, normalize_domain
+
+# Stored as "limit|window|action|timeout" like the other automod rules, null
+# when off; the window of these is unused.
+# alter table guilds add AUTOMOD_MENTIONS varchar(64);
+# alter table guilds add AUTOMOD_CAPS varchar(64);
+# alter table guilds add AUTOMOD_EMOJI varchar(64);
+
+_TOKEN_REGEX = re.compile(
+    r"(?P<emoji><a?:\w+:\d+>)|(?P<role><@&\d+>)|(?P<user><@!?\d+>)|"
+    + HOST_REGEX.pattern,
+    re.IGNORECASE,
+)
+
+# Pictographs, dingbats and symbols that render as emoji; modifiers, joiners
+# and variation selectors are skipped so a composed emoji counts once.
+_EMOJI_RANGES = (
+    (0x1F300, 0x1FAFF),
+    (0x2600, 0x27BF),
+    (0x2B00, 0x2BFF),
+)
+_REGIONAL_INDICATORS = (0x1F1E6, 0x1F1FF)
+
+
+class MessageFeatures:
+    """Counts the automod rules need, computed once per message.
+
+    The content is walked once by a combined token regex (custom emoji,
+    mentions and hosts) and once character by character (case, lines and
+    unicode emoji), and every rule reads from the result. One regex for
+    both walks is slower: telling cases apart needs ``regex`` rather than
+    ``re``, which costs more than the character loop saves.
+    """
+
+    __slots__ = (
+        "length",
+        "lines",
+        "upper",
+        "lower",
+        "emoji",
+        "mentions",
+        "role_mentions",
+        "hosts",
+        "links",
+    )
+
+    def __init__(self, content: str):
+        self.length = len(content)
+
+        self.emoji = 0
+        self.mentions = 0
+        self.role_mentions = 0
+        self.links = 0
+        self.hosts: set[str] = set()
+
+        for match in _TOKEN_REGEX.finditer(content):
+            kind = match.lastgroup
+
+            if kind == "emoji":
+                self.emoji += 1
+
+            elif kind == "user":
+                self.mentions += 1
+
+            elif kind == "role":
+                self.role_mentions += 1
+
+            else:
+                self.links += 1
+                host = normalize_domain(match.group(match.lastindex))
+
+                if host:
+                    self.hosts.add(host)
+
+        upper = lower = 0
+        lines = 1
+        regional = 0
+
+        for ch in content:
+            if ch.isupper():
+                upper += 1
+
+            elif ch.islower():
+                lower += 1
+
+            elif ch == "\n":
+                lines += 1
+
+            elif ch > "\u25ff":
+                point = ord(ch)
+
+                if _REGIONAL_INDICATORS[0] <= point <= _REGIONAL_INDICATORS[1]:
+                    regional += 1
+
+                elif any(start <= point <= end for start, end in _EMOJI_RANGES):
+                    self.emoji += 1
+
+        # Flags are written as pairs of regional indicator letters.
+        self.emoji += regional // 2
+
+        self.upper = upper
+        self.lower = lower
+        self.lines = lines
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> MessageFeatures:
+        return cls(message.content)
+
+    @property
+    def caps_ratio(self) -> float:
+        letters = self.upper + self.lower
+        return self.upper / letters if letters else 0.0
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import re
+import random
+import hashlib
+import unicodedata
+from collections import deque
+
+# Stored as "limit|window|action|timeout" like the other automod rules, null
+# when off.
+# alter table guilds add AUTOMOD_RAID_TEXT varchar(64);
+
+MIN_LENGTH = 12
+MAX_SHINGLED = 512
+SHINGLE_SIZE = 4
+
+# 16 MinHash permutations split into 4 LSH bands of 4 rows: two messages with
+# a Jaccard similarity of ~0.8 share at least one band key ~93% of the time.
+BANDS = 4
+ROWS = 4
+
+_MASK = (1 << 64) - 1
+_rng = random.Random(0x46554D45)
+_PERMUTATIONS = [_rng.getrandbits(64) for _ in range(BANDS * ROWS)]
+
+_STRIP_REGEX = re.compile(r"[\W_]+")
+
+
+def normalize(content: str) -> str:
+    content = unicodedata.normalize("NFKC", content).casefold()
+    return _STRIP_REGEX.sub(" ", content).strip()
+
+
+def fingerprint(content: str) -> Optional[tuple[int, ...]]:
+    """Return the exact hash and LSH band keys of a message's content.
+
+    Returns ``None`` for content too short to say anything about a raid.
+    """
+    text = normalize(content)
+
+    if len(text) < MIN_LENGTH:
+        return None
+
+    exact = int.from_bytes(
+        hashlib.blake2b(text.encode(), digest_size=8).digest(), "big"
+    )
+
+    # Near-duplicates differ in a few characters, so the head of a long
+    # message says as much as all of it at a fraction of the cost.
+    head = text[:MAX_SHINGLED]
+    shingles = {
+        hash(head[i : i + SHINGLE_SIZE]) & _MASK
+        for i in range(len(head) - SHINGLE_SIZE + 1)
+    }
+    signature = [min(s ^ mask for s in shingles) for mask in _PERMUTATIONS]
+
+    return (exact,) + tuple(
+        hash((band, *signature[band * ROWS : (band + 1) * ROWS]))
+        for band in range(BANDS)
+    )
+
+
+class FingerprintIndex:
+    """Recent message fingerprints of one guild within a sliding time window.
+
+    Every key of a fingerprint maps to the distinct authors who posted it, so
+    a lookup is one dict access per key. Entries are evicted incrementally
+    from the head of an insertion-ordered log as they fall out of the window.
+    """
+
+    def __init__(self, max_events: int = 20_000):
+        self.max_events = max_events
+
+        # key -> author id -> (timestamp, channel id, message id)
+        self._buckets: dict[int, dict[int, tuple[float, int, int]]] = {}
+        self._events: deque[tuple[float, int, int]] = deque()
+        # message id -> number of buckets holding it; a message stays in
+        # _acted until no bucket does, so it is never returned twice.
+        self._refs: dict[int, int] = {}
+        self._acted: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def add(
+        self,
+        keys: tuple[int, ...],
+        author_id: int,
+        channel_id: int,
+        message_id: int,
+        now: float,
+        window: float,
+        threshold: int,
+    ) -> list[tuple[int, int, int]]:
+        """Record a message and return the messages to act on.
+
+        Once a key has ``threshold`` distinct authors, every message recorded
+        under it that has not been returned before is returned.
+        """
+        self.expire(now - window)
+
+        matches = {}
+
+        for key in keys:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = self._buckets[key] = {}
+
+            replaced = bucket.get(author_id)
+            bucket[author_id] = (now, channel_id, message_id)
+            self._refs[message_id] = self._refs.get(message_id, 0) + 1
+
+            # The author's earlier message under this key is no longer held.
+            if replaced:
+                self._release(replaced[2])
+
+            self._events.append((now, key, author_id))
+
+            if len(bucket) >= threshold:
+                for _author_id, (_, _channel_id, _message_id) in bucket.items():
+                    if _message_id not in self._acted:
+                        matches[_message_id] = (_author_id, _channel_id, _message_id)
+
+        self._acted.update(matches)
+
+        return list(matches.values())
+
+    def expire(self, cutoff: float) -> None:
+        events = self._events
+
+        while events and (events[0][0] < cutoff or len(events) > self.max_events):
+            timestamp, key, author_id = events.popleft()
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                continue
+
+            entry = bucket.get(author_id)
+
+            # Only drop the author if this event is their latest for the key.
+            if entry and entry[0] == timestamp:
+                del bucket[author_id]
+                self._release(entry[2])
+
+                if not bucket:
+                    del self._buckets[key]
+
+    def _release(self, message_id: int) -> None:
+        refs = self._refs[message_id] - 1
+
+        if refs:
+            self._refs[message_id] = refs
+
+        else:
+            del self._refs[message_id]
+            self._acted.discard(message_id)
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+from array import array
+from collections import OrderedDict
+
+# Rules are stored as "limit|window|action|timeout", null when off.
+# alter table guilds add AUTOMOD_FLOOD_MEMBER varchar(64);
+# alter table guilds add AUTOMOD_FLOOD_CHANNEL varchar(64);
+
+MAX_WINDOW = 60.0
+
+
+class _Window:
+    __slots__ = ("stamps", "index", "last")
+
+    def __init__(self, size: int):
+        self.stamps = array("d", [float("-inf")]) * size
+        self.index = 0
+        self.last = 0.0
+
+
+class FloodTracker:
+    """Sliding-window message counters keyed by member or channel.
+
+    Each key keeps a fixed ring of its last ``limit`` timestamps, so a hit is
+    O(1) and a key never holds more than ``limit`` floats. Keys are kept in
+    least-recently-used order and idle ones are dropped from the front on
+    every hit, which bounds memory to the members active within ``idle``
+    seconds (and at most ``max_keys``).
+    """
+
+    def __init__(self, idle: float = MAX_WINDOW, max_keys: int = 100_000):
+        self.idle = idle
+        self.max_keys = max_keys
+
+        self._windows: OrderedDict[Hashable, _Window] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def hit(self, key: Hashable, limit: int, window: float, now: float) -> bool:
+        ring = self._windows.get(key)
+
+        if ring is None or len(ring.stamps) != limit:
+            ring = self._windows[key] = _Window(limit)
+
+        # Replacing a window keeps the key's old place, so it is moved too.
+        self._windows.move_to_end(key)
+
+        # The slot about to be overwritten holds the timestamp from ``limit``
+        # messages ago; if that is still inside the window, this message is
+        # one too many.
+        oldest = ring.stamps[ring.index]
+        ring.stamps[ring.index] = now
+        ring.index = (ring.index + 1) % limit
+        ring.last = now
+
+        self._expire(now)
+
+        return now - oldest < window
+
+    def _expire(self, now: float) -> None:
+        windows = self._windows
+
+        while windows and (
+            len(windows) > self.max_keys
+            or next(iter(windows.values())).last < now - self.idle
+        ):
+            windows.popitem(last=False)
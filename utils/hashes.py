@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import os
+import sys
+import mmap
+import asyncio
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Blocked extensions are joined by "|"; the size limit is in megabytes.
+# alter table guilds add AUTOMOD_BLOCKED_EXTENSIONS varchar(1024);
+# alter table guilds add AUTOMOD_MAX_ATTACHMENT_SIZE int;
+
+BAD_HASHES_PATH = Path(__file__).resolve().parents[1] / "data" / "bad_hashes.bin"
+
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+# Attachments larger than this are judged by their extension and size only.
+MAX_HASHED_SIZE = 25 * 1024 * 1024
+
+# hashlib releases the GIL on large inputs, so a couple of threads hash in
+# parallel with the event loop without starving the default executor.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="hashes")
+
+
+async def sha256(data: bytes) -> bytes:
+    return await asyncio.get_running_loop().run_in_executor(
+        _executor, lambda: hashlib.sha256(data).digest()
+    )
+
+
+class HashSet:
+    """A sorted file of raw SHA-256 digests, searched in place.
+
+    The file is mapped rather than read, so millions of digests cost their
+    32 bytes each in the page cache and nothing on the Python heap, and a
+    lookup is a binary search over fixed-size records.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._count = 0
+
+        if path is None:
+            return
+
+        size = path.stat().st_size
+
+        if size % DIGEST_SIZE:
+            raise ValueError(f"{path} is not a file of {DIGEST_SIZE} byte digests.")
+
+        if not size:
+            return
+
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._count = size // DIGEST_SIZE
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, digest: bytes) -> bool:
+        data = self._map
+        low, high = 0, self._count
+
+        while low < high:
+            mid = (low + high) // 2
+            record = data[mid * DIGEST_SIZE : (mid + 1) * DIGEST_SIZE]
+
+            if record == digest:
+                return True
+
+            if record < digest:
+                low = mid + 1
+
+            else:
+                high = mid
+
+        return False
+
+    def close(self) -> None:
+        if self._map:
+            self._map.close()
+            self._file.close()
+
+        self._map = self._file = None
+        self._count = 0
+
+
+def build_hash_file(source: Path, path: Path = BAD_HASHES_PATH) -> int:
+    """Write the hex digests listed in ``source`` as a sorted hash file.
+
+    Blank lines and ``#`` comments are skipped. The file is replaced
+    atomically, so a running bot never maps a half-written one.
+    """
+    digests = set()
+
+    with open(source, encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+
+            if not line:
+                continue
+
+            digest = bytes.fromhex(line)
+
+            if len(digest) != DIGEST_SIZE:
+                raise ValueError(f"Not a SHA-256 digest: {line}")
+
+            digests.add(digest)
+
+    temp = path.with_suffix(".tmp")
+
+    with open(temp, "wb") as f:
+        f.write(b"".join(sorted(digests)))
+
+    os.replace(temp, path)
+
+    return len(digests)
+
+
+if __name__ == "__main__":
+    count = build_hash_file(Path(sys.argv[1]), *map(Path, sys.argv[2:3]))
+    print(f"Wrote {count} digests.")
@@ -1,18 +1,58 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import aiomysql
+import logging
 
 import discord
 
-from utils.db import (
-    get_case_number,
-    get_mod_log_channel,
-    get_welcome_message,
-    increment_case_number,
-    get_member_log_channel,
-)
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+log = logging.getLogger(__name__)
+
+# Logging never raises into the command or event it records: a case that
+# cannot be opened is logged without a number, and a mod log channel that
+# cannot be looked up is skipped.
+
+
+async def _open_case(
+    bot: FumeGuard,
+    guild_id: int,
+    action: str,
+    moderator_id: int,
+    target_id: Optional[int] = None,
+    reason: Optional[str] = None,
+) -> Optional[int]:
+    try:
+        return await bot.cases.open(
+            guild_id, action, moderator_id, target_id=target_id, reason=reason
+        )
+
+    except Exception as e:
+        log.error(f"Failed to open a case in {guild_id}.", exc_info=e)
+        return None
+
+
+async def _log_channel(bot: FumeGuard, guild: discord.Guild):
+    try:
+        return await bot.log_queue.get_channel(guild)
+
+    except Exception as e:
+        log.error(f"Failed to get the mod log channel of {guild.id}.", exc_info=e)
+        return None
+
+
+def _title(action: str, case_num: Optional[int]) -> str:
+    return action if case_num is None else f"{action} | Case {case_num}"
+
+
+def _name(user: Optional[discord.abc.Snowflake], user_id: int) -> str:
+    # Users that are not cached come as a bare ``discord.Object``.
+    if isinstance(user, (discord.User, discord.Member)):
+        return f"**{user}** (<@{user_id}>)"
+
+    return f"<@{user_id}>"
 
 
 async def log_mod_action(
@@ -30,20 +70,33 @@ async def log_mod_action(
     reason: Optional[str] = None,
     message_count: Optional[int] = None,
     color: Optional[str] = None,
+    open_case: bool = True,
 ) -> None:
-    channel_id = await get_mod_log_channel(ctx.client.pool, ctx.guild.id)
+    # Settings changes are logged, but are not cases.
+    case_num = (
+        await _open_case(
+            ctx.client,
+            ctx.guild.id,
+            action,
+            moderator.id,
+            target_id=member.id if member else None,
+            reason=reason,
+        )
+        if open_case
+        else None
+    )
 
-    if not channel_id:
-        return
+    log_channel = await _log_channel(ctx.client, ctx.guild)
 
-    case_num = await get_case_number(ctx.client.pool, ctx.guild.id)
+    if not log_channel:
+        return
 
     _color = getattr(discord.Color, color) if color else None
     embed = discord.Embed(
         color=_color() or discord.Colour.from_str(ctx.client.config.EMBED_COLOR)
     )
 
-    embed.title = f"{action} | Case {case_num}"
+    embed.title = _title(action, case_num)
 
     if description:
         embed.description = description
@@ -69,47 +122,88 @@ async def log_mod_action(
     if message_count:
         embed.add_field(name="Message Count", value=message_count, inline=False)
 
-    await increment_case_number(ctx.client.pool, ctx.guild.id)
+    ctx.client.log_queue.put(log_channel, embed)
 
-    channel = ctx.guild.get_channel(channel_id)
+
+async def log_bot_action(
+    bot: FumeGuard,
+    guild: discord.Guild,
+    action: str,
+    description: str,
+    reason: Optional[str] = None,
+    color: Optional[str] = None,
+) -> None:
+    """Log an action the bot took on its own, with no command behind it."""
+    case_num = await _open_case(bot, guild.id, action, bot.user.id, reason=reason)
+    channel = await _log_channel(bot, guild)
 
     if not channel:
         return
 
-    await channel.send(embed=embed)
+    embed = discord.Embed(
+        title=_title(action, case_num),
+        description=description,
+        color=getattr(discord.Color, color)()
+        if color
+        else discord.Colour.from_str(bot.config.EMBED_COLOR),
+    )
+
+    if reason:
+        embed.add_field(name="Reason", value=reason, inline=False)
+
+    bot.log_queue.put(channel, embed)
 
 
-async def log_member(
-    pool: aiomysql.Pool, member: discord.Member, join: Optional[bool] = True
+async def log_audit_action(
+    bot: FumeGuard,
+    entry: discord.AuditLogEntry,
+    action: str,
+    description: Optional[str] = None,
+    color: Optional[str] = None,
 ) -> None:
-    channel_id = await get_member_log_channel(pool, member.guild.id)
+    """Log an action taken outside the bot, as read from the audit log."""
+    guild = entry.guild
+    target_id = entry.target.id if entry.target else None
+
+    case_num = await _open_case(
+        bot,
+        guild.id,
+        action,
+        entry.user_id,
+        target_id=target_id,
+        reason=entry.reason,
+    )
+    channel = await _log_channel(bot, guild)
 
-    if not channel_id:
+    if not channel:
         return
 
-    else:
-        channel_id = int(channel_id)
-
     embed = discord.Embed(
-        colour=discord.Colour.green() if join else discord.Colour.red()
+        title=_title(action, case_num),
+        description=description,
+        color=getattr(discord.Color, color)()
+        if color
+        else discord.Colour.from_str(bot.config.EMBED_COLOR),
     )
 
-    embed.title = "Member Joined" if join else "Member Left"
+    if target_id:
+        embed.add_field(
+            name="Name", value=_name(entry.target, target_id), inline=False
+        )
+        embed.add_field(name="ID", value=target_id, inline=False)
 
     embed.add_field(
-        name="Name", value=f"**{member}** ({member.mention})", inline=False
-    )
-    embed.add_field(name="ID", value=member.id, inline=False)
-    embed.add_field(
-        name="Member Count", value=member.guild.member_count, inline=False
+        name="Moderator",
+        value=_name(entry.user, entry.user_id),
+        inline=False,
     )
 
-    channel = member.guild.get_channel(channel_id)
+    if entry.reason:
+        embed.add_field(name="Reason", value=entry.reason, inline=False)
 
-    if not channel:
-        return
+    embed.set_footer(text="From the audit log")
 
-    await channel.send(embed=embed)
+    bot.log_queue.put(channel, embed)
 
 
 async def log_role_action(
@@ -120,9 +214,9 @@ async def log_role_action(
     member: Optional[discord.Member] = None,
     reason: Optional[str] = None,
 ) -> None:
-    channel_id = await get_mod_log_channel(ctx.client.pool, ctx.guild.id)
+    log_channel = await _log_channel(ctx.client, ctx.guild)
 
-    if not channel_id:
+    if not log_channel:
         return
 
     embed = discord.Embed(color=role.color)
@@ -147,22 +241,4 @@ async def log_role_action(
     if reason:
         embed.add_field(name="Reason", value=reason, inline=False)
 
-    channel = ctx.guild.get_channel(channel_id)
-
-    if not channel:
-        return
-
-    await channel.send(embed=embed)
-
-
-async def welcome_member(pool: aiomysql.Pool, member: discord.Member) -> None:
-    welcome_message = await get_welcome_message(pool, member.guild.id)
-
-    if not welcome_message:
-        return
-
-    try:
-        await member.send(welcome_message)
-
-    except (discord.Forbidden, discord.errors.Forbidden):
-        pass
+    ctx.client.log_queue.put(log_channel, embed)
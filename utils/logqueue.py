@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import time
+import asyncio
+import logging
+import statistics
+from collections import deque
+
+import discord
+
+from utils.db import get_mod_log_channel
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+
+# A guild holds at most this many unsent logs; the oldest are dropped to make
+# room for new ones.
+MAX_QUEUE = 200
+
+# Guilds whose logs are being sent at the same time.
+WORKERS = 8
+
+# Embeds taken from a guild's queue for one send.
+BATCH_SIZE = 10
+
+# Rate limited or failed sends are retried after 1, 2 then 4 seconds.
+MAX_ATTEMPTS = 4
+BACKOFF = 1.0
+
+# On shutdown, logs still queued get this long to go out.
+CLOSE_TIMEOUT = 5.0
+
+log = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("channel", "embed", "queued_at")
+
+    def __init__(self, channel: discord.abc.Messageable, embed: discord.Embed):
+        self.channel = channel
+        self.embed = embed
+        self.queued_at = time.perf_counter()
+
+
+class _GuildQueue:
+    __slots__ = ("entries", "task")
+
+    def __init__(self):
+        self.entries: deque[_Entry] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+
+class LogQueue:
+    """Sends mod logs in the background, so commands never wait on them.
+
+    Each guild has a bounded queue, drained by its own task; at most
+    ``WORKERS`` guilds send at once. Consecutive logs for the same channel
+    go out together, up to ``BATCH_SIZE`` embeds. Sends that hit a rate
+    limit or a server error are retried with exponential backoff, anything
+    else is logged and dropped. A guild that logs faster than its channel
+    accepts loses its oldest logs first.
+
+    The mod log channel of each guild is cached here too, so logging an
+    action does not wait on the database.
+    """
+
+    def __init__(self, bot: FumeGuard, samples: int = 256):
+        self.bot = bot
+
+        self._queues: dict[int, _GuildQueue] = {}
+        self._channels: dict[int, Optional[int]] = {}
+        self._workers = asyncio.Semaphore(WORKERS)
+
+        # Seconds from being queued to being sent, per batch.
+        self._latency: deque[float] = deque(maxlen=samples)
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+        self.failed = 0
+
+    async def get_channel(self, guild: discord.Guild):
+        if guild.id not in self._channels:
+            channel_id = await get_mod_log_channel(self.bot.pool, guild.id)
+            self._channels[guild.id] = int(channel_id) if channel_id else None
+
+        channel_id = self._channels[guild.id]
+
+        return guild.get_channel(channel_id) if channel_id else None
+
+    def invalidate(self, guild_id: int) -> None:
+        self._channels.pop(guild_id, None)
+
+    def put(self, channel: discord.abc.GuildChannel, embed: discord.Embed) -> None:
+        queue = self._queues.get(channel.guild.id)
+
+        if queue is None:
+            queue = self._queues[channel.guild.id] = _GuildQueue()
+
+        if len(queue.entries) >= MAX_QUEUE:
+            queue.entries.popleft()
+            self.dropped += 1
+
+        queue.entries.append(_Entry(channel, embed))
+
+        if queue.task is None:
+            queue.task = asyncio.create_task(self._drain(channel.guild.id, queue))
+
+    def depth(self) -> int:
+        return sum(len(queue.entries) for queue in self._queues.values())
+
+    def stats(self) -> dict[str, float]:
+        latency = sorted(self._latency)
+
+        return {
+            "depth": self.depth(),
+            "guilds": len(self._queues),
+            "sent": self.sent,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "p50": statistics.median(latency) if latency else 0.0,
+            "p95": latency[min(len(latency) - 1, int(len(latency) * 0.95))]
+            if latency
+            else 0.0,
+            "max": latency[-1] if latency else 0.0,
+        }
+
+    async def close(self) -> None:
+        tasks = [queue.task for queue in self._queues.values() if queue.task]
+
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks, timeout=CLOSE_TIMEOUT)
+
+        for task in pending:
+            task.cancel()
+
+        if pending:
+            log.warning(f"Dropped {self.depth()} queued logs on shutdown.")
+
+    @staticmethod
+    def _batch(queue: _GuildQueue) -> list[_Entry]:
+        batch = [queue.entries.popleft()]
+        channel_id = batch[0].channel.id
+
+        while (
+            queue.entries
+            and len(batch) < BATCH_SIZE
+            and queue.entries[0].channel.id == channel_id
+        ):
+            batch.append(queue.entries.popleft())
+
+        return batch
+
+    async def _drain(self, guild_id: int, queue: _GuildQueue) -> None:
+        try:
+            async with self._workers:
+                while queue.entries:
+                    batch = self._batch(queue)
+
+                    try:
+                        await self._send(batch)
+
+                    except Exception as e:
+                        self.failed += len(batch)
+                        log.error(
+                            f"Failed to send {len(batch)} logs of {guild_id}.",
+                            exc_info=e,
+                        )
+
+        finally:
+            queue.task = None
+            self._queues.pop(guild_id, None)
+
+    async def _send(self, batch: list[_Entry]) -> None:
+        channel = batch[0].channel
+        embeds = [entry.embed for entry in batch]
+
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                await self.bot.log_delivery.send(channel, embeds)
+                break
+
+            except discord.HTTPException as e:
+                if attempt == MAX_ATTEMPTS - 1 or not (
+                    e.status == 429 or e.status >= 500
+                ):
+                    raise
+
+                self.retried += 1
+                await asyncio.sleep(BACKOFF * 2**attempt)
+
+        now = time.perf_counter()
+
+        self.sent += len(batch)
+        self._latency.append(now - batch[0].queued_at)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar, Callable, Iterable, Iterator, Optional, Awaitable
+
+import time
+import asyncio
+
+import discord
+
+BULK_BAN_LIMIT = 200
+
+# Single bans and kicks share per-guild rate limits, so a few requests in
+# flight keep the queue moving without piling up behind the limiter.
+WORKERS = 4
+
+PROGRESS_INTERVAL = 3.0
+
+T = TypeVar("T", bound=discord.abc.Snowflake)
+
+
+class MassActionResult:
+    __slots__ = ("total", "done", "failed", "_progress", "_reported")
+
+    def __init__(
+        self,
+        total: int,
+        progress: Optional[Callable[[MassActionResult], Awaitable[Any]]] = None,
+    ):
+        self.total = total
+        self.done: list[int] = []
+        self.failed: dict[int, str] = {}
+
+        self._progress = progress
+        self._reported = 0.0
+
+    async def report(self) -> None:
+        now = time.monotonic()
+
+        if not self._progress or now - self._reported < PROGRESS_INTERVAL:
+            return
+
+        self._reported = now
+
+        try:
+            await self._progress(self)
+
+        except discord.HTTPException:
+            pass
+
+
+async def run_pool(
+    targets: Iterable[T],
+    action: Callable[[T], Awaitable[Any]],
+    result: MassActionResult,
+    *,
+    not_found: str,
+    forbidden: str = "missing permissions or role too high",
+    workers: int = WORKERS,
+) -> None:
+    """Run ``action`` on every target through ``workers`` concurrent tasks,
+    recording each target's id in ``result`` as done or failed."""
+    pending = iter(targets)
+
+    async def worker():
+        # Workers share the iterator, so each target is taken exactly once.
+        for target in pending:
+            try:
+                await action(target)
+                result.done.append(target.id)
+
+            except discord.NotFound:
+                result.failed[target.id] = not_found
+
+            except discord.Forbidden:
+                result.failed[target.id] = forbidden
+
+            except discord.HTTPException as e:
+                result.failed[target.id] = e.text or f"HTTP {e.status}"
+
+            await result.report()
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+
+
+def _objects(user_ids: Iterable[int]) -> Iterator[discord.Object]:
+    return (discord.Object(id=user_id) for user_id in user_ids)
+
+
+async def mass_ban(
+    guild: discord.Guild,
+    user_ids: list[int],
+    *,
+    reason: Optional[str] = None,
+    delete_message_seconds: int = 0,
+    progress: Optional[Callable[[MassActionResult], Awaitable[Any]]] = None,
+) -> MassActionResult:
+    """Ban every user id, 200 per request through the bulk ban endpoint when
+    the bot may use it, or one by one through a small worker pool."""
+    result = MassActionResult(len(user_ids), progress)
+
+    if not guild.me.guild_permissions.manage_guild:
+
+        async def ban(user: discord.Object):
+            await guild.ban(
+                user, reason=reason, delete_message_seconds=delete_message_seconds
+            )
+
+        await run_pool(_objects(user_ids), ban, result, not_found="unknown user")
+        return result
+
+    for i in range(0, len(user_ids), BULK_BAN_LIMIT):
+        chunk = user_ids[i : i + BULK_BAN_LIMIT]
+
+        try:
+            bulk = await guild.bulk_ban(
+                [discord.Object(id=user_id) for user_id in chunk],
+                reason=reason,
+                delete_message_seconds=delete_message_seconds,
+            )
+
+        except discord.HTTPException as e:
+            # The endpoint fails outright when it could ban none of them.
+            for user_id in chunk:
+                result.failed[user_id] = e.text or "could not be banned"
+
+        else:
+            result.done.extend(user.id for user in bulk.banned)
+
+            for user in bulk.failed:
+                result.failed[user.id] = "could not be banned"
+
+        await result.report()
+
+    return result
+
+
+async def mass_kick(
+    guild: discord.Guild,
+    user_ids: list[int],
+    *,
+    reason: Optional[str] = None,
+    progress: Optional[Callable[[MassActionResult], Awaitable[Any]]] = None,
+) -> MassActionResult:
+    """Kick every user id through a small worker pool."""
+    result = MassActionResult(len(user_ids), progress)
+
+    async def kick(user: discord.Object):
+        await guild.kick(user, reason=reason)
+
+    await run_pool(_objects(user_ids), kick, result, not_found="not a member")
+    return result
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import time
+import asyncio
+import logging
+
+import discord
+
+from utils.db import get_member_log_channel
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+
+# A guild's log is written at most once per interval; an event arriving after
+# a quiet interval goes out at once.
+FLUSH_INTERVAL = 3.0
+
+# Reaching this many waiting events flushes early.
+FLUSH_SIZE = 50
+
+# Up to this many events are sent as one embed each, in a single message;
+# more are summarised as digest lines.
+MAX_EMBEDS = 10
+DIGEST_MAX_CHARS = 4000
+
+log = logging.getLogger(__name__)
+
+
+class _Event:
+    __slots__ = ("name", "id", "mention", "member_count", "join")
+
+    def __init__(self, member: discord.Member, join: bool):
+        self.name = str(member)
+        self.id = member.id
+        self.mention = member.mention
+        self.member_count = member.guild.member_count
+        self.join = join
+
+
+class _Buffer:
+    __slots__ = ("events", "sent_at", "full", "task")
+
+    def __init__(self):
+        self.events: list[_Event] = []
+        self.sent_at = 0.0
+        self.full = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+def _event_embed(event: _Event) -> discord.Embed:
+    embed = discord.Embed(
+        colour=discord.Colour.green() if event.join else discord.Colour.red()
+    )
+
+    embed.title = "Member Joined" if event.join else "Member Left"
+
+    embed.add_field(
+        name="Name", value=f"**{event.name}** ({event.mention})", inline=False
+    )
+    embed.add_field(name="ID", value=event.id, inline=False)
+    embed.add_field(name="Member Count", value=event.member_count, inline=False)
+
+    return embed
+
+
+def _digest_embeds(events: list[_Event]) -> list[discord.Embed]:
+    joined = sum(event.join for event in events)
+    title = f"{joined} Joined, {len(events) - joined} Left"
+
+    chunks, lines, size = [], [], 0
+
+    for event in events:
+        line = f"{'Joined' if event.join else 'Left'}: **{event.name}** ({event.id})"
+
+        if size + len(line) + 1 > DIGEST_MAX_CHARS:
+            chunks.append(lines)
+            lines, size = [], 0
+
+        lines.append(line)
+        size += len(line) + 1
+
+    chunks.append(lines)
+
+    return [
+        discord.Embed(
+            title=title,
+            description="\n".join(chunk),
+            colour=discord.Colour.blurple(),
+        ).set_footer(text=f"Member Count: {events[-1].member_count}")
+        for chunk in chunks
+    ]
+
+
+class MemberLogWriter:
+    """Buffers join and leave events and writes each guild's member log in
+    batches.
+
+    The first event after a quiet ``FLUSH_INTERVAL`` is sent on its own, as
+    before. Events arriving within the interval wait for it to pass, then go
+    out as one message of up to ``MAX_EMBEDS`` embeds, or as digest lines
+    when there are more. A member log channel is thus written about once per
+    interval however busy the guild is, well under its rate limit. Log
+    channel ids are cached.
+    """
+
+    def __init__(self, bot: FumeGuard):
+        self.bot = bot
+
+        self._buffers: dict[int, _Buffer] = {}
+        self._channels: dict[int, Optional[int]] = {}
+
+    def add(self, member: discord.Member, join: bool = True) -> None:
+        buffer = self._buffers.get(member.guild.id)
+
+        if buffer is None:
+            buffer = self._buffers[member.guild.id] = _Buffer()
+
+        buffer.events.append(_Event(member, join))
+
+        if len(buffer.events) >= FLUSH_SIZE:
+            buffer.full.set()
+
+        if buffer.task is None:
+            buffer.task = asyncio.create_task(self._drain(member.guild, buffer))
+
+    async def get_channel(self, guild: discord.Guild):
+        if guild.id not in self._channels:
+            channel_id = await get_member_log_channel(self.bot.pool, guild.id)
+            self._channels[guild.id] = int(channel_id) if channel_id else None
+
+        channel_id = self._channels[guild.id]
+
+        return guild.get_channel(channel_id) if channel_id else None
+
+    def invalidate(self, guild_id: int) -> None:
+        self._channels.pop(guild_id, None)
+
+    async def _drain(self, guild: discord.Guild, buffer: _Buffer) -> None:
+        try:
+            while True:
+                wait = buffer.sent_at + FLUSH_INTERVAL - time.monotonic()
+
+                if wait > 0 and len(buffer.events) < FLUSH_SIZE:
+                    try:
+                        await asyncio.wait_for(buffer.full.wait(), wait)
+
+                    except asyncio.TimeoutError:
+                        pass
+
+                # Nothing came in during the interval, so the guild is quiet.
+                if not buffer.events:
+                    break
+
+                events, buffer.events = buffer.events, []
+                buffer.full.clear()
+                buffer.sent_at = time.monotonic()
+
+                try:
+                    await self._send(guild, events)
+
+                except Exception as e:
+                    log.error(
+                        f"Failed to write the member log of {guild.id}.", exc_info=e
+                    )
+
+        finally:
+            buffer.task = None
+            self._buffers.pop(guild.id, None)
+
+    async def _send(self, guild: discord.Guild, events: list[_Event]) -> None:
+        channel = await self.get_channel(guild)
+
+        if not channel:
+            return
+
+        if len(events) <= MAX_EMBEDS:
+            embeds = [_event_embed(event) for event in events]
+
+        else:
+            embeds = _digest_embeds(events)
+
+        await self.bot.log_delivery.send(channel, embeds)
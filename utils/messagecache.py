@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import sys
+import time
+from collections import OrderedDict
+
+import discord
+
+# Content past this many characters is not kept; log embeds could not show
+# more anyway.
+MAX_CONTENT = 1024
+MAX_ATTACHMENTS = 10
+
+# Records untouched for this long are dropped.
+TTL = 6 * 3600.0
+
+# A guild may hold this many bytes of records, and all guilds together the
+# larger total; past the total, the least recently used records of any guild
+# go first.
+GUILD_MAX_BYTES = 2 * 1024 * 1024
+MAX_BYTES = 128 * 1024 * 1024
+
+# The record object with its slots, and the two ordered dict entries pointing
+# at it.
+RECORD_OVERHEAD = 300
+
+
+class MessageRecord:
+    __slots__ = (
+        "id",
+        "guild_id",
+        "author_id",
+        "channel_id",
+        "content",
+        "attachments",
+        "touched_at",
+        "size",
+    )
+
+    def __init__(self, message: discord.Message):
+        self.id = message.id
+        self.guild_id = message.guild.id
+        self.author_id = message.author.id
+        self.channel_id = message.channel.id
+        self.content = message.content[:MAX_CONTENT]
+        self.attachments = tuple(
+            attachment.filename
+            for attachment in message.attachments[:MAX_ATTACHMENTS]
+        )
+        self.touched_at = time.monotonic()
+        self.size = (
+            RECORD_OVERHEAD
+            + sys.getsizeof(self.content)
+            + sys.getsizeof(self.attachments)
+            + sum(sys.getsizeof(name) for name in self.attachments)
+        )
+
+
+class _GuildCache:
+    __slots__ = ("records", "size")
+
+    def __init__(self):
+        self.records: OrderedDict[int, MessageRecord] = OrderedDict()
+        self.size = 0
+
+
+class MessageCache:
+    """Compact records of recent guild messages, for logging what an edit or
+    delete replaced.
+
+    Records are bounded by their size in bytes rather than their number,
+    both per guild and in total, so a few busy guilds cannot grow the process
+    without limit. Each guild keeps its records in least recently used order
+    for its own budget, and one order across all guilds serves the total, so
+    either eviction is a single pop. Adding or reading a record counts as a
+    use. Records untouched for ``TTL`` are dropped as well.
+    """
+
+    def __init__(
+        self,
+        guild_max_bytes: int = GUILD_MAX_BYTES,
+        max_bytes: int = MAX_BYTES,
+        ttl: float = TTL,
+    ):
+        self.guild_max_bytes = guild_max_bytes
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._guilds: dict[int, _GuildCache] = {}
+        # Message ids are unique across guilds.
+        self._order: OrderedDict[int, MessageRecord] = OrderedDict()
+        self.size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, message: discord.Message) -> None:
+        # First, as it can drop the guild's last record and so the guild.
+        self._remove(message.id)
+
+        cache = self._guilds.get(message.guild.id)
+
+        if cache is None:
+            cache = self._guilds[message.guild.id] = _GuildCache()
+
+        record = MessageRecord(message)
+        cache.records[record.id] = record
+        cache.size += record.size
+        self._order[record.id] = record
+        self.size += record.size
+
+        while cache.size > self.guild_max_bytes:
+            self._remove(next(iter(cache.records)))
+            self.evicted += 1
+
+        while self.size > self.max_bytes:
+            self._remove(next(iter(self._order)))
+            self.evicted += 1
+
+    def get(self, guild_id: int, message_id: int) -> Optional[MessageRecord]:
+        record = self._order.get(message_id)
+
+        if (
+            record is None
+            or record.guild_id != guild_id
+            or time.monotonic() - record.touched_at > self.ttl
+        ):
+            self.misses += 1
+            return None
+
+        record.touched_at = time.monotonic()
+        self._order.move_to_end(message_id)
+        self._guilds[guild_id].records.move_to_end(message_id)
+
+        self.hits += 1
+        return record
+
+    def pop(self, guild_id: int, message_id: int) -> Optional[MessageRecord]:
+        record = self.get(guild_id, message_id)
+
+        if record:
+            self._remove(message_id)
+
+        return record
+
+    def clear(self, guild_id: int) -> None:
+        cache = self._guilds.pop(guild_id, None)
+
+        if cache:
+            for message_id in cache.records:
+                del self._order[message_id]
+
+            self.size -= cache.size
+
+    def expire(self) -> int:
+        """Drop the records untouched for longer than the TTL and return how
+        many there were."""
+        cutoff = time.monotonic() - self.ttl
+        count = 0
+
+        while self._order:
+            record = next(iter(self._order.values()))
+
+            if record.touched_at > cutoff:
+                break
+
+            self._remove(record.id)
+            count += 1
+
+        return count
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "guilds": len(self._guilds),
+            "records": len(self),
+            "bytes": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evicted": self.evicted,
+        }
+
+    def _remove(self, message_id: int) -> None:
+        record = self._order.pop(message_id, None)
+
+        if record is None:
+            return
+
+        self.size -= record.size
+        cache = self._guilds[record.guild_id]
+        del cache.records[message_id]
+        cache.size -= record.size
+
+        if not cache.records:
+            del self._guilds[record.guild_id]
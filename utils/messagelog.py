@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import asyncio
+import logging
+
+import discord
+
+from utils.db import get_message_log_channel
+from utils.messagecache import MAX_CONTENT, MessageCache, MessageRecord
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+# alter table guilds add MESSAGE_LOG_CHANNEL bigint;
+
+EXPIRE_INTERVAL = 600.0
+
+# A bulk delete is logged as one embed with a line per message, each cut to
+# this length.
+BULK_LINE_CHARS = 120
+BULK_MAX_CHARS = 4000
+
+log = logging.getLogger(__name__)
+
+
+def _content(record: Optional[MessageRecord]) -> str:
+    if record is None:
+        return "*Not cached*"
+
+    return record.content or "*No text*"
+
+
+class MessageLogWriter:
+    """Logs deleted and edited messages of guilds with a message log channel.
+
+    Only the raw gateway events are used, so nothing depends on the library's
+    own message cache. What a message said before is looked up in a
+    ``MessageCache``, filled only for guilds with a message log channel.
+    """
+
+    def __init__(self, bot: FumeGuard):
+        self.bot = bot
+        self.cache = MessageCache()
+
+        self._channels: dict[int, Optional[int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def get_channel(self, guild: discord.Guild):
+        if guild.id not in self._channels:
+            channel_id = await get_message_log_channel(self.bot.pool, guild.id)
+            self._channels[guild.id] = int(channel_id) if channel_id else None
+
+        channel_id = self._channels[guild.id]
+
+        return guild.get_channel(channel_id) if channel_id else None
+
+    def invalidate(self, guild_id: int) -> None:
+        self._channels.pop(guild_id, None)
+        self.cache.clear(guild_id)
+
+    async def add(self, message: discord.Message) -> None:
+        if not message.guild or message.author.bot or message.webhook_id:
+            return
+
+        if await self.get_channel(message.guild):
+            self.cache.add(message)
+
+    async def on_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        channel = await self.get_channel(guild) if guild else None
+
+        if not channel or payload.channel_id == channel.id:
+            return
+
+        record = self.cache.pop(guild.id, payload.message_id)
+
+        # Bots' messages are never cached, and are not worth logging.
+        if record is None:
+            return
+
+        embed = discord.Embed(
+            title="Message Deleted",
+            description=_content(record),
+            colour=discord.Colour.red(),
+        )
+
+        embed.add_field(name="Author", value=f"<@{record.author_id}>", inline=False)
+
+        embed.add_field(
+            name="Channel", value=f"<#{payload.channel_id}>", inline=False
+        )
+
+        if record.attachments:
+            embed.add_field(
+                name="Attachments",
+                value="\n".join(record.attachments)[:1024],
+                inline=False,
+            )
+
+        embed.set_footer(text=f"Message ID: {payload.message_id}")
+
+        self.bot.log_queue.put(channel, embed)
+
+    async def on_bulk_delete(
+        self, payload: discord.RawBulkMessageDeleteEvent
+    ) -> None:
+        guild = self.bot.get_guild(payload.guild_id) if payload.guild_id else None
+        channel = await self.get_channel(guild) if guild else None
+
+        if not channel or payload.channel_id == channel.id:
+            return
+
+        lines, size, uncached = [], 0, 0
+
+        for message_id in sorted(payload.message_ids):
+            record = self.cache.pop(guild.id, message_id)
+
+            if record is None:
+                uncached += 1
+                continue
+
+            line = f"<@{record.author_id}>: {_content(record)}"
+
+            if len(line) > BULK_LINE_CHARS:
+                line = line[: BULK_LINE_CHARS - 3] + "..."
+
+            if size + len(line) + 1 <= BULK_MAX_CHARS:
+                lines.append(line)
+                size += len(line) + 1
+
+        embed = discord.Embed(
+            title=f"{len(payload.message_ids)} Messages Deleted",
+            description="\n".join(lines) or None,
+            colour=discord.Colour.red(),
+        )
+
+        embed.add_field(
+            name="Channel", value=f"<#{payload.channel_id}>", inline=False
+        )
+
+        if uncached:
+            embed.add_field(name="Not Cached", value=uncached, inline=False)
+
+        self.bot.log_queue.put(channel, embed)
+
+    async def on_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        message = payload.message
+
+        if not message.guild or message.author.bot or message.webhook_id:
+            return
+
+        channel = await self.get_channel(message.guild)
+
+        if not channel:
+            return
+
+        record = self.cache.get(message.guild.id, message.id)
+        self.cache.add(message)
+
+        # Embeds unfurling and pins also arrive as updates, with no edit time.
+        if message.edited_at is None or (
+            record and record.content == message.content[:MAX_CONTENT]
+        ):
+            return
+
+        embed = discord.Embed(
+            title="Message Edited",
+            url=message.jump_url,
+            colour=discord.Colour.orange(),
+        )
+
+        embed.add_field(name="Before", value=_content(record)[:1024], inline=False)
+        embed.add_field(
+            name="After", value=(message.content or "*No text*")[:1024], inline=False
+        )
+        embed.add_field(
+            name="Author",
+            value=f"**{message.author}** ({message.author.mention})",
+            inline=False,
+        )
+        embed.add_field(name="Channel", value=message.channel.mention, inline=False)
+        embed.set_footer(text=f"Message ID: {message.id}")
+
+        self.bot.log_queue.put(channel, embed)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(EXPIRE_INTERVAL)
+
+            try:
+                self.cache.expire()
+
+            except Exception as e:
+                log.error("Failed to expire cached messages.", exc_info=e)
@@ -116,7 +116,7 @@ class WelcomeMessageModal(ui.Modal, title="Welcome Message"):
 
     message = ui.TextInput(
         label="Message",
-        placeholder="Enter the welcome message to set (max. 1800 characters)",
+        placeholder="Welcome {user} to {server}! You are member #{member_count}. (max. 1800 characters)",
         style=discord.TextStyle.paragraph,
         min_length=1,
         max_length=1800,
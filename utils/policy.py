@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+# create table automod_overrides (
+#     GUILD_ID bigint not null,
+#     TARGET_ID bigint not null,
+#     RULE varchar(32) not null,
+#     ENABLED boolean not null,
+#     primary key (GUILD_ID, TARGET_ID, RULE)
+# );
+#
+# TARGET_ID is a channel or a category.
+
+
+def _apply(policy: dict, default: dict, rule: str, enabled: bool) -> None:
+    if rule == "links":
+        policy["link_send_roles"] = default["link_send_roles"] if enabled else []
+        policy["link_embed_roles"] = default["link_embed_roles"] if enabled else []
+
+    elif rule == "attachments":
+        policy["blocked_extensions"] = (
+            default["blocked_extensions"] if enabled else []
+        )
+        policy["max_attachment_size"] = (
+            default["max_attachment_size"] if enabled else None
+        )
+
+    elif rule == "word_filter":
+        policy["word_filter"] = enabled
+
+    else:
+        policy[rule] = default[rule] if enabled else None
+
+
+class PolicyMap:
+    """The effective automod settings of every channel in a guild.
+
+    Category overrides are applied over the guild settings and channel
+    overrides over those once, when the map is built, so resolving a message's
+    policy is a single dict lookup. Channels without overrides of their own or
+    from their category share the guild policy.
+    """
+
+    __slots__ = ("default", "_channels")
+
+    def __init__(
+        self,
+        config: dict,
+        overrides: Iterable[tuple[int, str, bool]],
+        channels: Iterable[Any],
+    ):
+        self.default = dict(config, word_filter=True)
+        self._channels: dict[int, dict] = {}
+
+        targets: dict[int, dict[str, bool]] = {}
+
+        for target_id, rule, enabled in overrides:
+            targets.setdefault(target_id, {})[rule] = enabled
+
+        if not targets:
+            return
+
+        for channel in channels:
+            layers = [
+                targets.get(getattr(channel, "category_id", None)),
+                targets.get(channel.id),
+            ]
+
+            if not any(layers):
+                continue
+
+            policy = dict(self.default)
+
+            for layer in layers:
+                for rule, enabled in (layer or {}).items():
+                    _apply(policy, self.default, rule, enabled)
+
+            self._channels[channel.id] = policy
+
+    def get(self, channel: Any) -> dict:
+        # Threads follow the channel they were started in.
+        channel_id = getattr(channel, "parent_id", None) or channel.id
+        return self._channels.get(channel_id, self.default)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Optional, Awaitable
+
+import time
+import asyncio
+import datetime
+
+import discord
+
+from utils.wordfilter import search_pattern
+
+if TYPE_CHECKING:
+    import regex
+
+BULK_DELETE_LIMIT = 100
+
+# Bulk deletes only take messages younger than two weeks; the margin covers
+# the time spent between reading a message and deleting it.
+BULK_DELETE_MAX_AGE = datetime.timedelta(days=14) - datetime.timedelta(minutes=5)
+
+# Older messages are deleted one request at a time, spaced out so a large
+# purge stays clear of the per-channel delete limit.
+SINGLE_DELETE_INTERVAL = 1.0
+SINGLE_DELETE_BACKLOG = 100
+
+PROGRESS_INTERVAL = 3.0
+
+
+def build_check(
+    user: Optional[discord.abc.User] = None,
+    bots: bool = False,
+    attachments: bool = False,
+    contains: Optional[str] = None,
+    pattern: Optional[regex.Pattern] = None,
+) -> Callable[[discord.Message], bool]:
+    contains = contains.casefold() if contains else None
+
+    def check(message: discord.Message) -> bool:
+        if user and message.author.id != user.id:
+            return False
+
+        if bots and not message.author.bot:
+            return False
+
+        if attachments and not message.attachments:
+            return False
+
+        if contains and contains not in message.content.casefold():
+            return False
+
+        if pattern and not search_pattern(pattern, message.content):
+            return False
+
+        return True
+
+    return check
+
+
+class PurgeResult:
+    __slots__ = ("scanned", "deleted", "cursor", "complete")
+
+    def __init__(self):
+        self.scanned = 0
+        self.deleted = 0
+        # Every message newer than this id has been dealt with, so it
+        # is where a resumed purge picks up as ``before``.
+        self.cursor: Optional[int] = None
+        self.complete = False
+
+
+class Purge:
+    """Deletes up to ``amount`` messages matching ``check`` from a channel.
+
+    History is read newest first in pages of 100. Matches younger than two
+    weeks are bulk deleted 100 at a time; older ones go to a bounded queue
+    drained by a single task that deletes one message per
+    ``SINGLE_DELETE_INTERVAL``, which also paces the history reads once the
+    queue is full. ``progress`` is awaited at most once per
+    ``PROGRESS_INTERVAL`` seconds.
+
+    The purge stops after ``max_scanned`` messages or ``timeout`` seconds. The
+    result's cursor can then be passed back as ``before`` to carry on where it
+    left off.
+    """
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        amount: int,
+        check: Callable[[discord.Message], bool],
+        *,
+        before: Optional[discord.abc.Snowflake] = None,
+        after: Optional[discord.abc.Snowflake] = None,
+        reason: Optional[str] = None,
+        max_scanned: int = 20_000,
+        timeout: float = 600.0,
+        progress: Optional[Callable[[PurgeResult], Awaitable[Any]]] = None,
+    ):
+        self.channel = channel
+        self.amount = amount
+        self.check = check
+        self.before = before
+        self.after = after
+        self.reason = reason
+        self.max_scanned = max_scanned
+        self.progress = progress
+
+        self.result = PurgeResult()
+
+        self._deadline = time.monotonic() + timeout
+        self._reported = 0.0
+        self._bulk: list[discord.Message] = []
+        self._single: asyncio.Queue[Optional[discord.Message]] = asyncio.Queue(
+            SINGLE_DELETE_BACKLOG
+        )
+        # Id of the newest old message the single-delete task has not reached.
+        self._single_pending: Optional[int] = None
+        self._single_error: Optional[discord.HTTPException] = None
+
+    async def run(self) -> PurgeResult:
+        result = self.result
+        matched = 0
+        bulk_cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        worker = asyncio.create_task(self._drain_single())
+
+        try:
+            async for message in self.channel.history(
+                limit=self.max_scanned,
+                before=self.before,
+                after=self.after,
+                oldest_first=False,
+            ):
+                # Stop when out of time or when old messages can no longer go.
+                if time.monotonic() > self._deadline or self._single_pending:
+                    break
+
+                result.scanned += 1
+
+                if self.check(message):
+                    matched += 1
+
+                    if message.created_at > bulk_cutoff:
+                        self._bulk.append(message)
+
+                        if len(self._bulk) >= BULK_DELETE_LIMIT:
+                            await self._flush_bulk()
+
+                    else:
+                        await self._single.put(message)
+
+                if not self._bulk:
+                    result.cursor = message.id
+
+                await self._report()
+
+                if matched >= self.amount:
+                    result.complete = True
+                    break
+
+            else:
+                result.complete = result.scanned < self.max_scanned
+
+            await self._flush_bulk()
+
+        finally:
+            await self._single.put(None)
+            await worker
+
+        if self._single_error:
+            raise self._single_error
+
+        if self._single_pending:
+            # ``before`` is exclusive and the pending message is not gone yet.
+            result.cursor = self._single_pending + 1
+            result.complete = False
+
+        return result
+
+    async def _flush_bulk(self) -> None:
+        if not self._bulk:
+            return
+
+        messages, self._bulk = self._bulk, []
+
+        try:
+            await self.channel.delete_messages(messages, reason=self.reason)
+            self.result.deleted += len(messages)
+
+        except discord.NotFound:
+            # Someone else deleted one of them first; fall back to one by one.
+            for message in messages:
+                await self._single.put(message)
+
+        self.result.cursor = messages[-1].id
+
+    async def _drain_single(self) -> None:
+        while True:
+            message = await self._single.get()
+
+            if message is None:
+                return
+
+            if time.monotonic() > self._deadline:
+                return await self._stop_single(message)
+
+            try:
+                await message.delete()
+                self.result.deleted += 1
+
+            except discord.NotFound:
+                pass
+
+            except discord.HTTPException as e:
+                self._single_error = e
+                return await self._stop_single(message)
+
+            await self._report()
+            await asyncio.sleep(SINGLE_DELETE_INTERVAL)
+
+    async def _stop_single(self, message: discord.Message) -> None:
+        self._single_pending = message.id
+
+        # Keep taking from the queue so the scan is never left blocked on it.
+        while await self._single.get() is not None:
+            pass
+
+    async def _report(self) -> None:
+        now = time.monotonic()
+
+        if not self.progress or now - self._reported < PROGRESS_INTERVAL:
+            return
+
+        self._reported = now
+
+        try:
+            await self.progress(self.result)
+
+        except discord.HTTPException:
+            pass
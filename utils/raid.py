@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import time
+import asyncio
+import logging
+import datetime
+from collections import Counter, deque
+
+import discord
+
+from utils.db import get_raid_config
+from utils.logger import log_bot_action
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+# Stored as "joins|seconds|action|account_age"; 0 joins is disabled.
+# alter table guilds add RAID_DETECTION varchar(32);
+
+# Used until a guild sets its own: raid detection is opt in, through
+# /raid set.
+DEFAULT_CONFIG = {"joins": 0, "seconds": 10, "action": "none", "account_age": 7}
+
+# A raid ends once joins have stayed under the threshold this long.
+RAID_CALM = 120.0
+
+# Joins during a raid are posted to the member log as one embed this often.
+MEMBER_LOG_INTERVAL = 30.0
+MEMBER_LOG_NAMES = 40
+
+RAID_TIMEOUT = datetime.timedelta(days=1)
+SWEEP_INTERVAL = 10.0
+
+AGE_BUCKETS = (
+    (datetime.timedelta(hours=1), "Under an hour"),
+    (datetime.timedelta(days=1), "Under a day"),
+    (datetime.timedelta(days=7), "Under a week"),
+    (datetime.timedelta(days=30), "Under a month"),
+    (datetime.timedelta.max, "Older"),
+)
+
+log = logging.getLogger(__name__)
+
+
+def _age_bucket(age: datetime.timedelta) -> str:
+    for limit, label in AGE_BUCKETS:
+        if age < limit:
+            return label
+
+
+class Raid:
+    __slots__ = (
+        "started_at",
+        "joins",
+        "ages",
+        "actioned",
+        "failed",
+        "unlogged",
+        "logged_at",
+        "calm_since",
+    )
+
+    def __init__(self, now: float):
+        self.started_at = discord.utils.utcnow()
+        self.joins = 0
+        # account age bucket -> joins
+        self.ages: Counter[str] = Counter()
+        self.actioned = 0
+        self.failed = 0
+        # Joins not yet posted to the member log.
+        self.unlogged: list[discord.Member] = []
+        self.logged_at = now
+        self.calm_since: Optional[float] = None
+
+
+class _GuildJoins:
+    __slots__ = ("times", "raid")
+
+    def __init__(self):
+        self.times: deque[float] = deque()
+        self.raid: Optional[Raid] = None
+
+
+class RaidGuard:
+    """Watches the join rate of each guild and takes over joins during a raid.
+
+    Join times are kept in a sliding window per guild. When a window holds the
+    guild's threshold of joins, the guild is in raid mode until joins stay
+    under it for ``RAID_CALM`` seconds. In raid mode welcome messages are not
+    sent, the member log gets one embed per ``MEMBER_LOG_INTERVAL`` instead of
+    one per join, and new accounts can be kicked or timed out. When the raid
+    ends, it is logged as one case with the account ages of everyone who
+    joined.
+    """
+
+    def __init__(self, bot: FumeGuard):
+        self.bot = bot
+
+        self._guilds: dict[int, _GuildJoins] = {}
+        self._configs: dict[int, dict] = {}
+
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def get_config(self, guild_id: int) -> dict:
+        config = self._configs.get(guild_id)
+
+        if config is None:
+            config = await get_raid_config(self.bot.pool, guild_id) or DEFAULT_CONFIG
+            self._configs[guild_id] = config
+
+        return config
+
+    def invalidate(self, guild_id: int) -> None:
+        self._configs.pop(guild_id, None)
+
+    def active(self, guild_id: int) -> Optional[Raid]:
+        joins = self._guilds.get(guild_id)
+        return joins.raid if joins else None
+
+    async def on_join(self, member: discord.Member) -> bool:
+        """Count the join and return whether the guild is in raid mode, in
+        which case the join has been dealt with."""
+        config = await self.get_config(member.guild.id)
+
+        if not config["joins"]:
+            return False
+
+        now = time.monotonic()
+        joins = self._guilds.get(member.guild.id)
+
+        if joins is None:
+            joins = self._guilds[member.guild.id] = _GuildJoins()
+
+        joins.times.append(now)
+        cutoff = now - config["seconds"]
+
+        while joins.times[0] <= cutoff:
+            joins.times.popleft()
+
+        raid = joins.raid
+
+        if raid is None:
+            if len(joins.times) < config["joins"]:
+                return False
+
+            raid = joins.raid = Raid(now)
+            log.info(f"Raid detected in guild {member.guild.id}.")
+
+        raid.joins += 1
+        raid.unlogged.append(member)
+
+        age = discord.utils.utcnow() - member.created_at
+        raid.ages[_age_bucket(age)] += 1
+
+        if config["action"] != "none" and age < datetime.timedelta(
+            days=config["account_age"]
+        ):
+            await self._act(member, config["action"], raid)
+
+        if now - raid.logged_at >= MEMBER_LOG_INTERVAL:
+            await self._log_members(member.guild, raid, now)
+
+        return True
+
+    async def end(self, guild: discord.Guild) -> Optional[Raid]:
+        joins = self._guilds.pop(guild.id, None)
+        raid = joins.raid if joins else None
+
+        if raid:
+            await self._log_members(guild, raid, time.monotonic())
+            await self._log_raid(guild, raid)
+
+        return raid
+
+    async def _act(self, member: discord.Member, action: str, raid: Raid) -> None:
+        reason = "New account joined during a raid."
+
+        try:
+            if action == "kick":
+                await member.kick(reason=reason)
+
+            else:
+                await member.timeout(RAID_TIMEOUT, reason=reason)
+
+            raid.actioned += 1
+
+        except discord.HTTPException:
+            raid.failed += 1
+
+    async def _log_members(self, guild: discord.Guild, raid: Raid, now: float):
+        members, raid.unlogged = raid.unlogged, []
+        raid.logged_at = now
+
+        if not members:
+            return
+
+        channel = await self.bot.member_log.get_channel(guild)
+
+        if not channel:
+            return
+
+        description = "\n".join(
+            f"**{member}** ({member.id})" for member in members[:MEMBER_LOG_NAMES]
+        )
+
+        if len(members) > MEMBER_LOG_NAMES:
+            description += f"\n... and {len(members) - MEMBER_LOG_NAMES} more"
+
+        embed = discord.Embed(
+            title=f"{len(members)} Members Joined (Raid)",
+            description=description,
+            colour=discord.Colour.orange(),
+        )
+        embed.add_field(name="Member Count", value=guild.member_count, inline=False)
+
+        await self.bot.log_delivery.send(channel, [embed])
+
+    async def _log_raid(self, guild: discord.Guild, raid: Raid) -> None:
+        config = await self.get_config(guild.id)
+        ended_at = discord.utils.utcnow()
+
+        lines = [
+            f"**Started:** {discord.utils.format_dt(raid.started_at, 'f')}",
+            f"**Ended:** {discord.utils.format_dt(ended_at, 'f')}",
+            f"**Joins:** {raid.joins}",
+            "",
+            "**Account ages**",
+        ]
+        lines.extend(
+            f"{label}: {raid.ages[label]}"
+            for _, label in AGE_BUCKETS
+            if raid.ages[label]
+        )
+
+        if config["action"] != "none":
+            verb = "kicked" if config["action"] == "kick" else "timed out"
+            lines.append("")
+            lines.append(
+                f"**New accounts {verb}:** {raid.actioned}"
+                + (f" ({raid.failed} failed)" if raid.failed else "")
+            )
+
+        await log_bot_action(
+            self.bot,
+            guild,
+            "Raid Detected",
+            "\n".join(lines),
+            reason=f"{config['joins']} joins within {config['seconds']} seconds.",
+            color="orange",
+        )
+
+    async def _sweep(self) -> None:
+        now = time.monotonic()
+
+        for guild_id, joins in list(self._guilds.items()):
+            config = await self.get_config(guild_id)
+            cutoff = now - config["seconds"]
+
+            while joins.times and joins.times[0] <= cutoff:
+                joins.times.popleft()
+
+            raid = joins.raid
+
+            if raid is None:
+                if not joins.times:
+                    del self._guilds[guild_id]
+
+                continue
+
+            guild = self.bot.get_guild(guild_id)
+
+            if guild is None:
+                del self._guilds[guild_id]
+                continue
+
+            if len(joins.times) >= config["joins"] > 0:
+                raid.calm_since = None
+
+            elif raid.calm_since is None:
+                raid.calm_since = now
+
+            if raid.calm_since and now - raid.calm_since >= RAID_CALM:
+                await self.end(guild)
+
+            elif now - raid.logged_at >= MEMBER_LOG_INTERVAL:
+                await self._log_members(guild, raid, now)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+
+            try:
+                await self._sweep()
+
+            except Exception as e:
+                log.error("Failed to sweep raid state.", exc_info=e)
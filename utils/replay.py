@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Awaitable
+
+import time
+from collections import Counter
+
+if TYPE_CHECKING:
+    from cogs.automod import AutoMod
+
+
+STAGES = {
+    "flood": "_process_flood",
+    "spam": "_process_spam",
+    "raid_text": "_process_raid_text",
+    "word_filter": "_process_word_filter",
+    "attachments": "_process_attachments",
+    "links": "_process_message",
+}
+
+
+class ReplayReport:
+    __slots__ = ("messages", "elapsed", "latencies", "hits", "actions")
+
+    def __init__(self):
+        self.messages = 0
+        self.elapsed = 0.0
+        self.latencies: dict[str, list[float]] = {stage: [] for stage in STAGES}
+        self.hits: Counter[str] = Counter()
+        self.actions: Counter[str] = Counter()
+
+    @property
+    def throughput(self) -> float:
+        return self.messages / self.elapsed if self.elapsed else 0.0
+
+    def stage_stats(self) -> list[tuple[str, int, float, float, float]]:
+        """Return (stage, calls, mean, p95, max) with times in microseconds."""
+        stats = []
+
+        for stage, latencies in self.latencies.items():
+            if not latencies:
+                continue
+
+            ordered = sorted(latencies)
+            stats.append(
+                (
+                    stage,
+                    len(ordered),
+                    sum(ordered) / len(ordered) * 1e6,
+                    ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+                    ordered[-1] * 1e6,
+                )
+            )
+
+        return stats
+
+
+def _timed(
+    func: Callable[..., Awaitable[Any]], latencies: list[float]
+) -> Callable[..., Awaitable[Any]]:
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+
+        try:
+            return await func(*args, **kwargs)
+
+        finally:
+            latencies.append(time.perf_counter() - started)
+
+    return wrapper
+
+
+async def replay(
+    automod: AutoMod, messages: Iterable[tuple[Any, float]]
+) -> ReplayReport:
+    """Run ``(message, timestamp)`` pairs through a dry-run automod pipeline.
+
+    ``automod`` must come from :meth:`AutoMod.dry_run`; its stages are wrapped
+    to time them, so it should not be reused for anything else afterwards.
+    Messages are judged in the order given, at the timestamps given, against
+    the guild's rules whether or not automod is enabled there.
+    """
+    report = ReplayReport()
+
+    for stage, name in STAGES.items():
+        setattr(
+            automod, name, _timed(getattr(automod, name), report.latencies[stage])
+        )
+
+    started = time.perf_counter()
+
+    for message, timestamp in messages:
+        automod._actions.now = timestamp
+        policies = await automod._get_policies(message.guild)
+        stage = await automod.process(
+            message, policies.get(message.channel), timestamp
+        )
+
+        report.messages += 1
+
+        if stage:
+            report.hits[stage] += 1
+
+    report.elapsed = time.perf_counter() - started
+    report.actions = automod._actions.actions
+
+    return report
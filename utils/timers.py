@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Optional
+
+import json
+import heapq
+import asyncio
+import logging
+import datetime
+
+import discord
+
+from utils.db import get_timers, insert_timer, delete_timers, get_guild_timers
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+# create table timers (
+#     TIMER_ID bigint not null auto_increment primary key,
+#     GUILD_ID bigint not null,
+#     ACTION varchar(32) not null,
+#     TARGET_ID bigint not null,
+#     DATA varchar(1024),
+#     DUE_AT datetime not null,
+#     index (DUE_AT),
+#     index (GUILD_ID, ACTION, TARGET_ID)
+# );
+
+# Only timers due within this window are held in memory; the window is
+# moved forward once half of it has passed.
+WINDOW = datetime.timedelta(hours=1)
+
+# The loop also wakes this often, so clock drift is never left uncorrected.
+MAX_SLEEP = 300.0
+RETRY_DELAY = 10.0
+
+log = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime.datetime:
+    return discord.utils.utcnow().replace(tzinfo=None, microsecond=0)
+
+
+class TimerScheduler:
+    """Durable timers for actions that have to happen later, like lifting a
+    temporary ban.
+
+    Timers live in the ``timers`` table. Only the ones due within the next
+    ``WINDOW`` are loaded, into a min-heap keyed on their due time, so the
+    number of future timers has no bearing on memory. A process loads only
+    the timers of guilds on its own shards, and anything that fell due while
+    it was down is loaded, and fired, on start.
+
+    A due timer is deleted, then dispatched as a ``<action>_timer_complete``
+    event with the timer dict, whose ``data`` is decoded from JSON.
+    """
+
+    def __init__(self, bot: FumeGuard):
+        self.bot = bot
+
+        self._heap: list[tuple[datetime.datetime, int]] = []
+        # Timers in the heap by id; a cancelled timer is dropped from here
+        # only and skipped when it reaches the top of the heap.
+        self._timers: dict[int, dict] = {}
+        self._loaded_until: Optional[datetime.datetime] = None
+
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def schedule(
+        self,
+        guild_id: int,
+        action: str,
+        target_id: int,
+        due_at: datetime.datetime,
+        data: Any = None,
+    ) -> int:
+        due_at = due_at.replace(tzinfo=None, microsecond=0)
+        encoded = json.dumps(data, sort_keys=True) if data is not None else None
+
+        timer_id = await insert_timer(
+            self.bot.pool, guild_id, action, target_id, encoded, due_at
+        )
+
+        if self._loaded_until and due_at <= self._loaded_until:
+            self._push(
+                {
+                    "id": timer_id,
+                    "guild_id": guild_id,
+                    "action": action,
+                    "target_id": target_id,
+                    "data": encoded,
+                    "due_at": due_at,
+                }
+            )
+            self._wake.set()
+
+        return timer_id
+
+    async def cancel(
+        self, guild_id: int, action: str, target_id: int, data: Any = None
+    ) -> int:
+        """Cancel the timers for an action on a target, only those carrying
+        ``data`` if it is given, and return how many there were."""
+        encoded = json.dumps(data, sort_keys=True) if data is not None else None
+        timer_ids = [
+            timer["id"]
+            for timer in await get_guild_timers(
+                self.bot.pool, guild_id, action, target_id
+            )
+            if encoded is None or timer["data"] == encoded
+        ]
+
+        if timer_ids:
+            await delete_timers(self.bot.pool, timer_ids)
+
+            for timer_id in timer_ids:
+                self._timers.pop(timer_id, None)
+
+        return len(timer_ids)
+
+    def _push(self, timer: dict) -> None:
+        # A timer scheduled while its window was loading can arrive twice.
+        if timer["id"] in self._timers:
+            return
+
+        self._timers[timer["id"]] = timer
+        heapq.heappush(self._heap, (timer["due_at"], timer["id"]))
+
+    async def _load(self, now: datetime.datetime) -> None:
+        after, until = self._loaded_until, now + WINDOW
+        # Moved first, so timers scheduled during the query go to the heap.
+        self._loaded_until = until
+
+        shard_ids = self.bot.shard_ids
+
+        try:
+            timers = await get_timers(
+                self.bot.pool,
+                after,
+                until,
+                shard_count=self.bot.shard_count,
+                shard_ids=list(shard_ids) if shard_ids is not None else None,
+            )
+
+        except Exception:
+            self._loaded_until = after
+            raise
+
+        for timer in timers:
+            self._push(timer)
+
+    async def _fire_due(self, now: datetime.datetime) -> None:
+        due = []
+
+        while self._heap and self._heap[0][0] <= now:
+            _, timer_id = heapq.heappop(self._heap)
+            timer = self._timers.pop(timer_id, None)
+
+            if timer:
+                due.append(timer)
+
+        if not due:
+            return
+
+        # Deleted before dispatching, so a timer fires at most once even if
+        # the process stops right after.
+        try:
+            await delete_timers(self.bot.pool, [timer["id"] for timer in due])
+
+        except Exception:
+            for timer in due:
+                self._push(timer)
+
+            raise
+
+        for timer in due:
+            data = timer["data"]
+            self.bot.dispatch(
+                f"{timer['action']}_timer_complete",
+                dict(timer, data=json.loads(data) if data else None),
+            )
+
+    async def _run(self) -> None:
+        await self.bot.wait_until_ready()
+
+        while True:
+            now = _utcnow()
+
+            try:
+                if (
+                    self._loaded_until is None
+                    or now >= self._loaded_until - WINDOW / 2
+                ):
+                    await self._load(now)
+
+                await self._fire_due(now)
+
+            except Exception as e:
+                log.error("Failed to process timers.", exc_info=e)
+
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+
+            next_load = self._loaded_until - WINDOW / 2
+            wake_at = min(self._heap[0][0], next_load) if self._heap else next_load
+            delay = min(max((wake_at - _utcnow()).total_seconds(), 1.0), MAX_SLEEP)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+
+            except asyncio.TimeoutError:
+                pass
+
+            self._wake.clear()
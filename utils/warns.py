@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import bisect
+import datetime
+from collections import OrderedDict
+
+import discord
+
+from utils.db import (
+    get_warnings,
+    set_warn_rule,
+    get_warn_rules,
+    insert_warning,
+    delete_warnings,
+    remove_warn_rule,
+    delete_expired_warnings,
+)
+
+if TYPE_CHECKING:
+    import aiomysql
+
+# create table warnings (
+#     WARNING_ID bigint not null auto_increment primary key,
+#     GUILD_ID bigint not null,
+#     USER_ID bigint not null,
+#     MODERATOR_ID bigint not null,
+#     REASON varchar(1024),
+#     CREATED_AT datetime not null,
+#     index (GUILD_ID, USER_ID, CREATED_AT),
+#     index (CREATED_AT)
+# );
+#
+# create table warn_rules (
+#     GUILD_ID bigint not null,
+#     THRESHOLD int not null,
+#     WINDOW_DAYS int not null,
+#     ACTION varchar(16) not null,
+#     DURATION int,
+#     primary key (GUILD_ID, THRESHOLD)
+# );
+
+# Warnings older than this no longer count towards any rule and are removed;
+# the case they opened stays in the case history.
+WARNING_LIFETIME_DAYS = 90
+
+MAX_CACHED_MEMBERS = 50_000
+COMPACT_BATCH_SIZE = 10_000
+
+
+def _utcnow() -> datetime.datetime:
+    return discord.utils.utcnow().replace(tzinfo=None, microsecond=0)
+
+
+def _cutoff(days: int = WARNING_LIFETIME_DAYS) -> datetime.datetime:
+    return _utcnow() - datetime.timedelta(days=days)
+
+
+class WarningStore:
+    """Active warnings and the escalation rules they are counted against.
+
+    Each member's warning times are loaded once, with one indexed query, and
+    kept sorted in a bounded cache, so issuing a warning and counting it
+    against a rule window is a list append and a binary search. Warnings age
+    out after ``WARNING_LIFETIME_DAYS`` through ``compact``.
+    """
+
+    def __init__(self, pool: aiomysql.Pool):
+        self.pool = pool
+
+        # (guild id, user id) -> creation times of active warnings, oldest first
+        self._members: OrderedDict[tuple[int, int], list[datetime.datetime]] = (
+            OrderedDict()
+        )
+        self._rules: dict[int, list[dict]] = {}
+
+    async def _times(self, guild_id: int, user_id: int) -> list[datetime.datetime]:
+        key = (guild_id, user_id)
+        times = self._members.get(key)
+
+        if times is None:
+            warnings = await get_warnings(self.pool, guild_id, user_id, _cutoff())
+            # Another call may have loaded them while this one waited.
+            times = self._members.setdefault(
+                key, [warning["created_at"] for warning in warnings]
+            )
+
+            while len(self._members) > MAX_CACHED_MEMBERS:
+                self._members.popitem(last=False)
+
+        self._members.move_to_end(key)
+        return times
+
+    async def add(
+        self,
+        guild_id: int,
+        user_id: int,
+        moderator_id: int,
+        reason: Optional[str] = None,
+    ) -> None:
+        # Loaded first, so the new warning is never counted twice.
+        times = await self._times(guild_id, user_id)
+        created_at = _utcnow()
+
+        await insert_warning(
+            self.pool, guild_id, user_id, moderator_id, reason, created_at
+        )
+        bisect.insort(times, created_at)
+
+    async def count(
+        self, guild_id: int, user_id: int, days: int = WARNING_LIFETIME_DAYS
+    ) -> int:
+        times = await self._times(guild_id, user_id)
+        return len(times) - bisect.bisect_right(times, _cutoff(days))
+
+    async def active(self, guild_id: int, user_id: int) -> list[dict]:
+        return await get_warnings(self.pool, guild_id, user_id, _cutoff())
+
+    async def clear(self, guild_id: int, user_id: int) -> int:
+        self._members.pop((guild_id, user_id), None)
+        return await delete_warnings(self.pool, guild_id, user_id)
+
+    async def rules(self, guild_id: int) -> list[dict]:
+        rules = self._rules.get(guild_id)
+
+        if rules is None:
+            rules = self._rules[guild_id] = await get_warn_rules(self.pool, guild_id)
+
+        return rules
+
+    async def set_rule(
+        self,
+        guild_id: int,
+        threshold: int,
+        days: int,
+        action: str,
+        duration: Optional[int] = None,
+    ) -> None:
+        await set_warn_rule(self.pool, guild_id, threshold, days, action, duration)
+        self._rules.pop(guild_id, None)
+
+    async def remove_rule(self, guild_id: int, threshold: int) -> bool:
+        removed = await remove_warn_rule(self.pool, guild_id, threshold)
+        self._rules.pop(guild_id, None)
+
+        return bool(removed)
+
+    async def escalation(self, guild_id: int, user_id: int) -> Optional[dict]:
+        """Return the rule with the highest threshold the member has reached
+        within its window, if any."""
+        for rule in reversed(await self.rules(guild_id)):
+            if (
+                await self.count(guild_id, user_id, rule["days"])
+                >= rule["threshold"]
+            ):
+                return rule
+
+        return None
+
+    async def compact(self) -> int:
+        """Remove expired warnings from the table and the cache, in batches so
+        a large backlog never holds long locks."""
+        cutoff = _cutoff()
+        removed = 0
+
+        while True:
+            count = await delete_expired_warnings(
+                self.pool, cutoff, COMPACT_BATCH_SIZE
+            )
+            removed += count
+
+            if count < COMPACT_BATCH_SIZE:
+                break
+
+        for key, times in list(self._members.items()):
+            del times[: bisect.bisect_right(times, cutoff)]
+
+            if not times:
+                del self._members[key]
+
+        return removed
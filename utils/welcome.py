@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Union, Callable, Optional
+
+import re
+
+import discord
+
+from utils.db import (
+    get_welcome_channel,
+    get_welcome_message,
+    update_welcome_message,
+)
+
+if TYPE_CHECKING:
+    from bot import FumeGuard
+
+# alter table guilds add WELCOME_CHANNEL bigint;
+
+PLACEHOLDERS: dict[str, Callable[[discord.Member], str]] = {
+    "user": lambda member: member.mention,
+    "username": lambda member: member.name,
+    "user_id": lambda member: str(member.id),
+    "server": lambda member: member.guild.name,
+    "server_id": lambda member: str(member.guild.id),
+    "member_count": lambda member: str(member.guild.member_count),
+}
+
+# Doubled braces stand for literal ones.
+_TOKEN = re.compile(r"\{\{|\}\}|\{([^{}]*)\}|[{}]")
+
+MAX_LENGTH = 2000
+
+Segment = Union[str, Callable[[discord.Member], str]]
+
+
+class TemplateError(ValueError):
+    pass
+
+
+class WelcomeTemplate:
+    """A welcome message split once into literal text and placeholders, so
+    rendering it for a member only joins strings."""
+
+    __slots__ = ("source", "_segments")
+
+    def __init__(self, source: str):
+        self.source = source
+        self._segments: tuple[Segment, ...] = tuple(self._parse(source))
+
+    @staticmethod
+    def _parse(source: str) -> list[Segment]:
+        segments, literal, unknown = [], [], []
+        end = 0
+
+        for match in _TOKEN.finditer(source):
+            literal.append(source[end : match.start()])
+            end = match.end()
+            token = match.group()
+
+            if token in ("{{", "}}"):
+                literal.append(token[0])
+                continue
+
+            name = match.group(1)
+
+            if name is None:
+                raise TemplateError(
+                    "Use `{{` and `}}` for literal braces in the welcome message."
+                )
+
+            field = PLACEHOLDERS.get(name.strip())
+
+            if field is None:
+                unknown.append(name)
+                continue
+
+            text = "".join(literal)
+            literal = []
+
+            if text:
+                segments.append(text)
+
+            segments.append(field)
+
+        literal.append(source[end:])
+
+        if unknown:
+            raise TemplateError(
+                "Unknown placeholders: "
+                + ", ".join(f"`{{{name}}}`" for name in unknown)
+                + ". Available: "
+                + ", ".join(f"`{{{name}}}`" for name in PLACEHOLDERS)
+                + "."
+            )
+
+        text = "".join(literal)
+
+        if text:
+            segments.append(text)
+
+        return segments
+
+    def render(self, member: discord.Member) -> str:
+        return "".join(
+            segment if isinstance(segment, str) else segment(member)
+            for segment in self._segments
+        )[:MAX_LENGTH]
+
+
+class Greeter:
+    """Welcomes joining members by DM and in the welcome channel, if set.
+
+    Each guild's template is compiled when it is saved, or the first time it
+    is needed after a restart, and cached with the welcome channel id.
+    """
+
+    def __init__(self, bot: FumeGuard):
+        self.bot = bot
+
+        self._templates: dict[int, Optional[WelcomeTemplate]] = {}
+        self._channels: dict[int, Optional[int]] = {}
+
+    async def set_message(self, guild_id: int, message: Optional[str]) -> None:
+        """Save the guild's welcome message, raising ``TemplateError`` if it
+        does not parse."""
+        template = WelcomeTemplate(message) if message else None
+
+        await update_welcome_message(self.bot.pool, guild_id, message)
+        self._templates[guild_id] = template
+
+    async def get_template(self, guild_id: int) -> Optional[WelcomeTemplate]:
+        if guild_id not in self._templates:
+            message = await get_welcome_message(self.bot.pool, guild_id)
+
+            try:
+                template = WelcomeTemplate(message) if message else None
+
+            # Saved before placeholders existed; sent as it was written.
+            except TemplateError:
+                template = WelcomeTemplate(
+                    message.replace("{", "{{").replace("}", "}}")
+                )
+
+            self._templates[guild_id] = template
+
+        return self._templates[guild_id]
+
+    async def get_channel(self, guild: discord.Guild):
+        if guild.id not in self._channels:
+            channel_id = await get_welcome_channel(self.bot.pool, guild.id)
+            self._channels[guild.id] = int(channel_id) if channel_id else None
+
+        channel_id = self._channels[guild.id]
+
+        return guild.get_channel(channel_id) if channel_id else None
+
+    def invalidate(self, guild_id: int) -> None:
+        self._templates.pop(guild_id, None)
+        self._channels.pop(guild_id, None)
+
+    async def greet(self, member: discord.Member) -> None:
+        template = await self.get_template(member.guild.id)
+
+        if not template:
+            return
+
+        content = template.render(member)
+
+        try:
+            await member.send(content)
+
+        except discord.Forbidden:
+            pass
+
+        channel = await self.get_channel(member.guild)
+
+        if not channel:
+            return
+
+        try:
+            await channel.send(
+                content, allowed_mentions=discord.AllowedMentions(users=[member])
+            )
+
+        except (discord.Forbidden, discord.NotFound):
+            pass
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import asyncio
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+
+import regex
+
+# create table automod_filters (
+#     GUILD_ID bigint not null,
+#     PATTERN varchar(1024) not null,
+#     IS_REGEX boolean not null default false,
+#     index (GUILD_ID)
+# );
+
+MAX_CONTENT = 4000
+MAX_WORDS = 5000
+MAX_PATTERNS = 100
+MAX_PATTERN_LENGTH = 200
+
+# Matching gives up after this long; a pattern that backtracks badly then
+# counts as not matching.
+PATTERN_TIMEOUT = 0.05
+
+# Letters from other scripts and digits that are commonly used in place of
+# Latin letters to slip past word filters.
+_CONFUSABLES = str.maketrans(
+    {
+        "а": "a", "в": "b", "е": "e", "к": "k", "м": "m", "н": "h", "о": "o",
+        "р": "p", "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ј": "j",
+        "ѕ": "s", "ԁ": "d", "ɡ": "g", "α": "a", "β": "b", "ε": "e", "ι": "i",
+        "κ": "k", "ν": "v", "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x",
+        "0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "@": "a",
+        "$": "s",
+    }
+)  # fmt: skip
+_INVISIBLE = dict.fromkeys(map(ord, "\u200b\u200c\u200d\u2060\ufeff\u00ad"))
+
+# Patterns match with the GIL released, so they run on their own threads
+# without holding up the event loop.
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="wordfilter")
+
+
+def normalize(content: str) -> str:
+    content = unicodedata.normalize(
+        "NFKD", content[:MAX_CONTENT].translate(_INVISIBLE)
+    )
+    content = "".join(ch for ch in content if not unicodedata.combining(ch))
+
+    return " ".join(content.casefold().translate(_CONFUSABLES).split())
+
+
+def fold(content: str) -> str:
+    """Text as patterns see it: only compatibility forms and case are folded,
+    so digits and symbols keep their meaning."""
+    return unicodedata.normalize("NFKC", content[:MAX_CONTENT]).casefold()
+
+
+def validate_pattern(pattern: str) -> Optional[str]:
+    if len(pattern) > MAX_PATTERN_LENGTH:
+        return f"Patterns can be at most {MAX_PATTERN_LENGTH} characters long."
+
+    try:
+        regex.compile(pattern)
+
+    except regex.error as e:
+        return f"Invalid pattern: {e}."
+
+    return None
+
+
+def compile_pattern(pattern: str) -> regex.Pattern:
+    return regex.compile(pattern, regex.IGNORECASE)
+
+
+def search_pattern(pattern: regex.Pattern, text: str) -> Optional[regex.Match]:
+    """Search with the ``PATTERN_TIMEOUT`` limit, treating a timeout as no
+    match."""
+    try:
+        return pattern.search(text, timeout=PATTERN_TIMEOUT, concurrent=True)
+
+    except TimeoutError:
+        return None
+
+
+class WordFilter:
+    """One guild's blocked words and patterns, compiled for a single pass.
+
+    Words go into an Aho-Corasick automaton, so a message is scanned once no
+    matter how many words are blocked; patterns are joined into one regex,
+    matched against the text without the look-alike folding words get.
+    """
+
+    def __init__(self, words: Iterable[str], patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+
+        for word in words:
+            self._insert(normalize(word).strip())
+
+        self._link()
+
+        patterns = list(patterns)
+        self._regex = (
+            compile_pattern("|".join(f"(?:{p})" for p in patterns))
+            if patterns
+            else None
+        )
+
+    def _insert(self, word: str) -> None:
+        if not word:
+            return
+
+        node = 0
+
+        for ch in word:
+            child = self._goto[node].get(ch)
+
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][ch] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+
+            node = child
+
+        self._out[node] += (len(word),)
+
+    def _link(self) -> None:
+        queue = list(self._goto[0].values())
+
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                fail = self._fail[node]
+
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+
+                self._fail[child] = self._goto[fail].get(ch, 0)
+                self._out[child] += self._out[self._fail[child]]
+                queue.append(child)
+
+    def find_word(self, text: str) -> Optional[str]:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        size = len(text)
+
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+
+            node = goto[node].get(ch, 0)
+
+            for length in out[node]:
+                start = i - length + 1
+
+                # Whole words only, so blocking "ass" leaves "class" alone.
+                if (start == 0 or not text[start - 1].isalnum()) and (
+                    i + 1 == size or not text[i + 1].isalnum()
+                ):
+                    return text[start : i + 1]
+
+        return None
+
+    async def find(self, content: str) -> Optional[str]:
+        match = self.find_word(normalize(content))
+
+        if match or not self._regex:
+            return match
+
+        result = await asyncio.get_running_loop().run_in_executor(
+            _executor, search_pattern, self._regex, fold(content)
+        )
+
+        return result.group(0) if result else None